@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the cost of importing :mod:`language_tags` and of the first lookup.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between runs::
+
+    python benchmarks/import_time.py
+"""
+import os
+import subprocess
+import sys
+import timeit
+
+# The interpreters import the package of this checkout, wherever the script is run from.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = 10
+
+STATEMENTS = [
+    ('python only', 'pass'),
+    ('import', 'from language_tags import tags'),
+    ('import + preload', 'from language_tags import tags, data; data.preload()'),
+    ('import + first check', 'from language_tags import tags; tags.check("nl-BE")'),
+]
+
+
+def run(statement):
+    return min(timeit.repeat(
+        lambda: subprocess.check_call([sys.executable, '-c', statement], cwd=ROOT),
+        number=1,
+        repeat=RUNS
+    ))
+
+
+if __name__ == '__main__':
+    for name, statement in STATEMENTS:
+        print('%-25s %8.1f ms' % (name, run(statement) * 1000))
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the throughput of :func:`language_tags.parallel.validate_parallel` for an increasing number of processes.
+
+The tags are distinct combinations of registry subtags, so every tag is really validated::
+
+    python benchmarks/parallel.py [number of tags]
+"""
+import itertools
+import os
+import sys
+import time
+
+# Import the package of this checkout, wherever the script is run from.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from language_tags import data
+from language_tags.parallel import validate_parallel
+from language_tags.Tag import Tag
+
+
+def generate(count):
+    languages = [record['Subtag'] for record in data.get('registry') if record['Type'] == 'language']
+    regions = ['BE', 'NL', 'GB', 'US', 'DE', 'FR', '419', 'XX']
+    scripts = ['', 'Latn-', 'Cyrl-', 'Arab-']
+    combinations = itertools.cycle(itertools.product(regions, scripts, languages))
+    return ['%s-%s%s' % (language, script, region)
+            for region, script, language in itertools.islice(combinations, count)]
+
+
+def run(values, processes):
+    start = time.perf_counter()
+    if processes:
+        for _ in validate_parallel(values, processes=processes, chunksize=2000, cache_size=1):
+            pass
+    else:
+        for value in values:
+            Tag(value).errors
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    data.preload()
+    values = generate(count)
+    serial = run(values, 0)
+    print('%-12s %10.0f tags/s' % ('serial', count / serial))
+    for processes in sorted({1, 2, 4, os.cpu_count() or 1}):
+        seconds = run(values, processes)
+        print('%-12s %10.0f tags/s  %5.2fx' % ('%d process%s' % (processes, 'es' if processes > 1 else ''),
+                                             count / seconds, serial / seconds))
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the per-tag cost of the most used :class:`language_tags.Tag.Tag` properties::
+
+    python benchmarks/tag.py
+"""
+import os
+import sys
+import timeit
+
+# Import the package of this checkout, wherever the script is run from.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from language_tags import data
+from language_tags.Tag import Tag
+
+TAGS = ['nl', 'nl-BE', 'en-Latn-GB', 'zh-Hant-TW', 'sl-rozaj-biske', 'de-CH-1996', 'en-GB-oed', 'es-419',
+        'en-US-u-ca-gregory', 'en-x-private', 'xx-YY', 'en-GB-GB']
+NUMBER = 200
+
+
+def per_tag(statement):
+    seconds = min(timeit.repeat(statement, number=NUMBER, repeat=5))
+    return seconds / NUMBER / len(TAGS) * 1e6
+
+
+if __name__ == '__main__':
+    data.preload()
+    print('%-30s %8.1f us' % ('Tag(tag)', per_tag(lambda: [Tag(tag) for tag in TAGS])))
+    for name in ('valid', 'language', 'region', 'format'):
+        print('%-30s %8.1f us' % ('Tag(tag).%s' % name,
+                                  per_tag(lambda: [getattr(Tag(tag), name) for tag in TAGS])))
+    print('%-30s %8.1f us' % ('Tag(tag) all of the above',
+                              per_tag(lambda: [(t.valid, t.language, t.region, t.format)
+                                               for t in map(Tag, TAGS)])))
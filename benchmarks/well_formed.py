@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Measure the per-tag cost of rejecting malformed tags and of checking the syntax of tags, compared to the path
+without the syntax check, where every tag gets the full registry processing of ``Tag.errors``::
+
+    python benchmarks/well_formed.py
+"""
+import os
+import sys
+import timeit
+from unittest import mock
+
+# Import the package of this checkout, wherever the script is run from.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from language_tags import data, tags
+from language_tags.Tag import Tag
+
+MALFORMED = ['en--US', 'en_US', 'français', 'en-verylongsubtag', '???', 'en-US!', 'en-', '-nl', 'nl-', '12345678901',
+             'zh-Hant-TW-', 'en-GB-with-a-very-long-subtag']
+WELL_FORMED = ['nl', 'nl-BE', 'en-Latn-GB', 'zh-Hant-TW', 'sl-rozaj-biske', 'de-CH-1996', 'en-GB-oed', 'es-419',
+               'en-US-u-ca-gregory', 'en-x-private', 'xx-YY', 'i-klingon']
+NUMBER = 200
+
+
+def per_tag(statement, values):
+    seconds = min(timeit.repeat(statement, number=NUMBER, repeat=5))
+    return seconds / NUMBER / len(values) * 1e6
+
+
+def valid(values):
+    return per_tag(lambda: [Tag(tag).valid for tag in values], values)
+
+
+if __name__ == '__main__':
+    data.preload()
+    for name, values in (('malformed', MALFORMED), ('well-formed', WELL_FORMED)):
+        # Every tag passes the syntax check, so none is rejected before the registry lookups.
+        with mock.patch('language_tags.syntax.well_formed', lambda tag: True):
+            baseline = valid(values)
+        seconds = valid(values)
+        print('%-36s %8.2f us' % ('Tag(%s).valid without check' % name, baseline))
+        print('%-36s %8.2f us  %.1fx' % ('Tag(%s).valid' % name, seconds, baseline / seconds))
+    print('%-36s %8.2f us' % ('tags.well_formed(malformed)',
+                              per_tag(lambda: [tags.well_formed(tag) for tag in MALFORMED], MALFORMED)))
+    print('%-36s %8.2f us' % ('tags.well_formed(well-formed)',
+                              per_tag(lambda: [tags.well_formed(tag) for tag in WELL_FORMED], WELL_FORMED)))
@@ -1,61 +1,105 @@
 # -*- coding: utf-8 -*-
-import json
 from language_tags import data
 
 
-index = data.get('index')
-registry = data.get('registry')
+# The module level 'index' and 'registry', kept for backwards compatibility.
+__getattr__ = data.module_getattr(__name__)
+
+
+class Error(Exception):
+    def __init__(self, code, message):
+        self.code = code
+        self.message = message
+
+    def __str__(self):
+        return repr("%s: %s" % (self.code, self.message))
 
 
 class Subtag:
-    def __init__(self, subtag, type):
+    # Subtags are immutable flyweights: there is one shared instance per subtag and type in a registry.
+    __slots__ = ('_subtag', '_type', '_record', '_registry')
 
+    # Include errror codes
+    ERR_NONEXISTENT = 1
+    ERR_TAG = 2
+
+    Error = Error
+
+    def __new__(cls, subtag, type, registry=None):
         """
         A subtag is a part of the hyphen-separated :class:`language_tags.Tag.Tag`.
 
+        Subtags are immutable and shared: ``Subtag('nl', 'language') is Subtag('NL', 'language')``.
+
         :param str subtag: subtage.
         :param str type: can be 'language', 'extlang', 'script', 'region' or 'variant'.
+        :param registry: the :class:`language_tags.data.registry.Registry` of the subtag, defaults to the current
+            registry (see :func:`language_tags.data.current`).
         :return: :raise Error: Checks for ``Subtag.ERR_NONEXISTENT`` and ``Subtag.ERR_TAG``.
         """
+        if registry is None:
+            registry = data.current()
+        instances = registry.subtags
+        try:
+            return instances[(subtag, type)]
+        except (KeyError, TypeError):
+            pass
+
         # Lowercase for consistency (case is only a formatting convention, not a standard requirement).
         subtag = str(subtag).lower()
         type = str(type).lower()
+        key = (subtag, type)
+        if key in instances:
+            return instances[key]
 
-        # Include errror codes
-        self.ERR_NONEXISTENT = 1
-        self.ERR_TAG = 2
-
-        class Error(Exception):
-            def __init__(self, code, message):
-                self.code = code
-                self.message = message
-
-            def __str__(self):
-                return repr("%s: %s" % (self.code, self.message))
-
+        index = registry.get('index')
         if subtag not in index:
-            raise Error(self.ERR_NONEXISTENT, 'Non-existent subtag %s.' % subtag)
+            raise Error(cls.ERR_NONEXISTENT, 'Non-existent subtag %s.' % subtag)
         types = index[subtag]
 
         if type not in types:
-            raise Error(self.ERR_NONEXISTENT, 'Non-existent subtag %s of type %s.' % (subtag, type))
+            raise Error(cls.ERR_NONEXISTENT, 'Non-existent subtag %s of type %s.' % (subtag, type))
         i = types[type]
 
-        record = registry[i]
+        record = registry.get('registry')[i]
         if 'Subtag' not in record:
-            raise Error(self.ERR_TAG, '%s is a %s tag' % (subtag, type))
+            raise Error(cls.ERR_TAG, '%s is a %s tag' % (subtag, type))
+
+        self = super().__new__(cls)
+        object.__setattr__(self, '_subtag', subtag)
+        object.__setattr__(self, '_type', type)
+        object.__setattr__(self, '_record', record)
+        object.__setattr__(self, '_registry', registry)
+        return instances.setdefault(key, self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Subtag objects are immutable.')
+
+    def __delattr__(self, name):
+        raise AttributeError('Subtag objects are immutable.')
+
+    def __reduce__(self):
+        return Subtag, (self._subtag, self._type)
 
-        self.data = {
-            "subtag": subtag,
-            "record": record,
-            "type": type
+    @property
+    def data(self):
+        """
+        Get the data of the subtag.
+
+        :return: dict with the subtag, its type and its registry record.
+        """
+        return {
+            "subtag": self._subtag,
+            "record": self._record,
+            "type": self._type
         }
 
     def __str__(self):
         return self.format
 
     def __repr__(self):
-        return json.dumps(self.data, ensure_ascii=False)
+        import json
+        return json.dumps(self.data, ensure_ascii=False, default=dict)
 
     @property
     def type(self):
@@ -64,7 +108,7 @@ class Subtag:
 
         :return: string -- either 'language', 'extlang', 'script', 'region' or 'variant'.
         """
-        return self.data['type']
+        return self._type
 
     @property
     def description(self):
@@ -73,7 +117,7 @@ class Subtag:
 
         :return: list of description strings.
         """
-        return self.data['record']['Description']
+        return self._record['Description']
 
     @property
     def preferred(self):
@@ -82,12 +126,12 @@ class Subtag:
 
         :return: preferred :class:`language_tags.Subtag.Subtag` if exists, otherwise None.
         """
-        if 'Preferred-Value' in self.data['record']:
-            preferred = self.data['record']['Preferred-Value']
-            type = self.data['type']
+        if 'Preferred-Value' in self._record:
+            preferred = self._record['Preferred-Value']
+            type = self._type
             if type == 'extlang':
                 type = 'language'
-            return Subtag(preferred, type)
+            return Subtag(preferred, type, self._registry)
         return None
 
     @property
@@ -97,10 +141,10 @@ class Subtag:
 
         :return: string -- subtag code conventional format.
         """
-        subtag = self.data['subtag']
-        if self.data['type'] == 'region':
+        subtag = self._subtag
+        if self._type == 'region':
             return subtag.upper()
-        if self.data['type'] == 'script':
+        if self._type == 'script':
             return subtag.capitalize()
         return subtag
 
@@ -111,10 +155,34 @@ class Subtag:
 
         :return: string -- the language's default script.
         """
-        if 'Suppress-Script' in self.data['record']:
-            return Subtag(self.data['record']['Suppress-Script'], 'script')
+        if 'Suppress-Script' in self._record:
+            return Subtag(self._record['Suppress-Script'], 'script', self._registry)
         return None
 
+    @property
+    def macrolanguage(self):
+        """
+        Get the macrolanguage of the subtag (RFC 5646 section 3.1.11).
+
+        :return: macrolanguage :class:`language_tags.Subtag.Subtag` if the subtag is a member of one, otherwise None.
+        """
+        if 'Macrolanguage' in self._record:
+            return Subtag(self._record['Macrolanguage'], 'language', self._registry)
+        return None
+
+    @property
+    def members(self):
+        """
+        Get the member subtags of a macrolanguage subtag.
+
+        :return: tuple of :class:`language_tags.Subtag.Subtag` objects. The tuple is empty if the subtag is not a
+            macrolanguage.
+        """
+        if self._type != 'language':
+            return ()
+        from language_tags.indexes import macrolanguage_members
+        return macrolanguage_members(self._registry).get(self._subtag, ())
+
     @property
     def scope(self):
         """
@@ -122,7 +190,7 @@ class Subtag:
 
         :return: string subtag scope if exists, otherwise None.
         """
-        return self.data['record']['Scope'] if 'Scope' in self.data['record'] else None
+        return self._record['Scope'] if 'Scope' in self._record else None
 
     @property
     def deprecated(self):
@@ -131,7 +199,7 @@ class Subtag:
 
         :return: deprecation date as string if subtag is deprecated, otherwise None.
         """
-        return self.data['record']['Deprecated'] if 'Deprecated' in self.data['record'] else None
+        return self._record['Deprecated'] if 'Deprecated' in self._record else None
 
     @property
     def added(self):
@@ -140,7 +208,7 @@ class Subtag:
 
         :return: date (as string) when the subtag was added to the registry.
         """
-        return self.data['record']['Added']
+        return self._record['Added']
 
     @property
     def comments(self):
@@ -149,4 +217,4 @@ class Subtag:
 
         :return: list of comments. The return list can be empty.
         """
-        return self.data['record']['Comments'] if 'Comments' in self.data['record'] else []
+        return self._record['Comments'] if 'Comments' in self._record else []
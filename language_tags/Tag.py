@@ -1,53 +1,92 @@
 # -*- coding: utf-8 -*-
-import json
+from collections import namedtuple
+from functools import cached_property
 
 
 from language_tags.Subtag import Subtag
 from language_tags import data
 
 
-index = data.get('index')
-registry = data.get('registry')
+# The module level 'index' and 'registry', kept for backwards compatibility.
+__getattr__ = data.module_getattr(__name__)
+
+
+# The structured representation of a parsed tag: the codes of the tag, its subtags in order of appearance, the
+# language, extlang, script, region and variant subtags, the extensions as (singleton, codes) pairs and the private
+# use codes.
+ParsedTag = namedtuple('ParsedTag', ['codes', 'subtags', 'language', 'extlangs', 'script', 'region', 'variants',
+                                     'extensions', 'privateuse'])
+
+# An extension of a tag (RFC 5646 section 2.2.6): the singleton and its subtags, for example ('u', ('ca', 'gregory')).
+Extension = namedtuple('Extension', ['singleton', 'subtags'])
+
+
+class Error(Exception):
+    def __init__(self, code, message, tag, subtag):
+        self.code = code
+        self.message = message
+        self.tag = tag
+        self.subtag = subtag.format if isinstance(subtag, Subtag) else subtag
+
+    def __str__(self):
+        return repr("%s: %s (Tag %s; Subtag %s)" % (self.code, self.message, self.tag, str(self.subtag)))
 
 
 class Tag:
-    def __init__(self, tag):
+    # Include errror codes
+    ERR_DEPRECATED = 1
+    ERR_NO_LANGUAGE = 2
+    ERR_UNKNOWN = 3
+    ERR_TOO_LONG = 4
+    ERR_EXTRA_REGION = 5
+    ERR_EXTRA_EXTLANG = 6
+    ERR_EXTRA_SCRIPT = 7
+    ERR_DUPLICATE_VARIANT = 8
+    ERR_WRONG_ORDER = 9
+    ERR_SUPPRESS_SCRIPT = 10
+    ERR_SUBTAG_DEPRECATED = 11
+    ERR_EXTRA_LANGUAGE = 12
+    ERR_DUPLICATE_SINGLETON = 13
+    ERR_EMPTY_EXTENSION = 14
+    ERR_PREFIX = 15
+    ERR_MALFORMED = 16
+
+    Error = Error
+
+    def __init__(self, tag, registry=None):
         # Lowercase for consistency (case is only a formatting convention, not a standard requirement).
         """
         Tags for Identifying Languages based on BCP 47 (RFC 5646) and the latest IANA language subtag registry.
 
         :param str tag: (hyphen-separated) tag.
+        :param registry: the :class:`language_tags.data.registry.Registry` of the tag, defaults to the current
+            registry (see :func:`language_tags.data.current`). The tag keeps using it when the current registry is
+            reloaded.
         """
         tag = str(tag).strip().lower()
 
         self.data = {'tag': tag}
+        self._registry = registry = registry or data.current()
 
+        index = registry.get('index')
         if tag in index:
             types = index[tag]
             # Check if the input tag is grandfathered or redundant.
             if 'grandfathered' in types or 'redundant' in types:
-                self.data['record'] = registry[types['grandfathered']] if 'grandfathered' in types \
-                    else registry[types['redundant']]
-
-        # Include errror codes
-        self.ERR_DEPRECATED = 1
-        self.ERR_NO_LANGUAGE = 2
-        self.ERR_UNKNOWN = 3
-        self.ERR_TOO_LONG = 4
-        self.ERR_EXTRA_REGION = 5
-        self.ERR_EXTRA_EXTLANG = 6
-        self.ERR_EXTRA_SCRIPT = 7
-        self.ERR_DUPLICATE_VARIANT = 8
-        self.ERR_WRONG_ORDER = 9
-        self.ERR_SUPPRESS_SCRIPT = 10
-        self.ERR_SUBTAG_DEPRECATED = 11
-        self.ERR_EXTRA_LANGUAGE = 12
+                records = registry.get('registry')
+                self.data['record'] = records[types['grandfathered']] if 'grandfathered' in types \
+                    else records[types['redundant']]
+
+    def __reduce__(self):
+        # The registry is not pickled, an unpickled tag uses the current registry.
+        return Tag, (self.data['tag'],)
 
     def __str__(self):
         return self.format
 
     def __repr__(self):
-        return json.dumps(self.data, ensure_ascii=False)
+        import json
+        return json.dumps(self.data, ensure_ascii=False, default=dict)
 
     @property
     def preferred(self):
@@ -57,10 +96,41 @@ class Tag:
         :return: preferred :class:`language_tags.Tag.Tag` if the deprecated or redundant tag has one, otherwise None.
         """
         if 'record' in self.data:
-            return Tag(self.data['record']['Preferred-Value']) if 'Preferred-Value' in self.data['record'] else None
+            record = self.data['record']
+            return Tag(record['Preferred-Value'], self._registry) if 'Preferred-Value' in record else None
         else:
             return None
 
+    @property
+    def canonical(self):
+        """
+        Get the canonical :class:`language_tags.Tag.Tag` of the tag (see RFC 5646 section 4.5 and
+        :func:`language_tags.tags.tags.canonicalize`).
+
+        :return: canonical :class:`language_tags.Tag.Tag`.
+        """
+        from language_tags.canonical import canonical_map
+        return Tag(canonical_map(self._registry).canonicalize(self.data['tag']), self._registry)
+
+    def maximize(self):
+        """
+        Get the tag with its likely subtags added, for example 'zh-Hant-TW' for 'zh-Hant' (see
+        :mod:`language_tags.likely`).
+
+        :return: maximized :class:`language_tags.Tag.Tag`.
+        """
+        from language_tags.likely import likely_subtags
+        return Tag(likely_subtags(self._registry).maximize(self.data['tag']), self._registry)
+
+    def minimize(self):
+        """
+        Get the tag without the subtags that :func:`maximize` adds, for example 'zh-TW' for 'zh-Hant-TW'.
+
+        :return: minimized :class:`language_tags.Tag.Tag`.
+        """
+        from language_tags.likely import likely_subtags
+        return Tag(likely_subtags(self._registry).minimize(self.data['tag']), self._registry)
+
     @property
     def type(self):
         """
@@ -139,27 +209,34 @@ class Tag:
 
         return formatted_tag
 
-    @property
-    def subtags(self):
-        """
-        Get the :class:`language_tags.Subtag.Subtag` objects of the tag.
-
-        :return: list of :class:`language_tags.Subtag.Subtag` objects that are part of the tag.
-            The return list can be empty.
-        """
-        data = self.data
+    @cached_property
+    def _parsed(self):
+        # Parse the tag once, every accessor reads from the result.
+        registry = self._registry
+        index = registry.get('index')
+        codes = tuple(self.data['tag'].split('-'))
         subtags = []
+        extensions = []
+        privateuse = ()
 
         # if tag is grandfathered return no subtags
-        if 'record' in data and self.data['record']['Type'] == 'grandfathered':
-            return subtags
+        if 'record' in self.data and self.data['record']['Type'] == 'grandfathered':
+            return ParsedTag(codes, (), None, (), None, None, (), (), ())
 
-        codes = data['tag'].split('-')
         # Try and find the language tag.
         for i, code in enumerate(codes):
 
-            # Singletons and anything after are unhandled.
+            # Singletons and anything after are not subtags.
             if len(code) == 1:
+                # Group the extension subtags by singleton, the private use subtags follow the singleton 'x'.
+                for j, extension_code in enumerate(codes[i:], i):
+                    if extension_code == 'x':
+                        privateuse = codes[j + 1:]
+                        break
+                    elif len(extension_code) == 1:
+                        extensions.append((extension_code, []))
+                    else:
+                        extensions[-1][1].append(extension_code)
                 #Stop the loop (stop processing after a singleton).
                 break
 
@@ -170,40 +247,64 @@ class Tag:
 
             # Language subtags may only appear at the beginning of the tag, otherwise the subtag type is indeterminate.
             if 'language' in types and i == 0:
-                subtags.append(Subtag(code, 'language'))
+                subtags.append(Subtag(code, 'language', registry))
                 continue
 
             if len(code) == 2:
                 # Should be a region
                 if 'region' in types:
-                    subtags.append(Subtag(code, 'region'))
+                    subtags.append(Subtag(code, 'region', registry))
                 # Error case: language subtag in the wrong place.
                 elif 'language' in types:
-                    subtags.append(Subtag(code, 'language'))
+                    subtags.append(Subtag(code, 'language', registry))
 
             elif len(code) == 3:
                 # Could be a numeric region code e.g. '001' for 'World'.
                 if 'region' in types:
-                    subtags.append(Subtag(code, 'region'))
+                    subtags.append(Subtag(code, 'region', registry))
                 elif 'extlang' in types:
-                    subtags.append(Subtag(code, 'extlang'))
+                    subtags.append(Subtag(code, 'extlang', registry))
                 # Error case: language subtag in the wrong place.
                 elif 'language' in types:
-                    subtags.append(Subtag(code, 'language'))
+                    subtags.append(Subtag(code, 'language', registry))
 
             elif len(code) == 4:
                 # Could be a numeric variant
                 if 'variant' in types:
-                    subtags.append(Subtag(code, 'variant'))
+                    subtags.append(Subtag(code, 'variant', registry))
                 elif 'script' in types:
-                    subtags.append(Subtag(code, 'script'))
+                    subtags.append(Subtag(code, 'script', registry))
 
             else:
                 # Should be a variant
                 if 'variant' in types:
-                    subtags.append(Subtag(code, 'variant'))
+                    subtags.append(Subtag(code, 'variant', registry))
 
-        return subtags
+        found = dict(language=[], extlang=[], script=[], region=[], variant=[])
+        for subtag in subtags:
+            found[subtag.type].append(subtag)
+
+        return ParsedTag(
+            codes,
+            tuple(subtags),
+            found['language'][0] if found['language'] else None,
+            tuple(found['extlang']),
+            found['script'][0] if found['script'] else None,
+            found['region'][0] if found['region'] else None,
+            tuple(found['variant']),
+            tuple(Extension(singleton, tuple(extension_codes)) for singleton, extension_codes in extensions),
+            tuple(privateuse)
+        )
+
+    @property
+    def subtags(self):
+        """
+        Get the :class:`language_tags.Subtag.Subtag` objects of the tag.
+
+        :return: list of :class:`language_tags.Subtag.Subtag` objects that are part of the tag.
+            The return list can be empty.
+        """
+        return list(self._parsed.subtags)
 
     @property
     def language(self):
@@ -213,10 +314,7 @@ class Tag:
         :return: language :class:`language_tags.Subtag.Subtag` that is part of the tag.
             The return can be None.
         """
-
-        language_item = [subtag for subtag in self.subtags if subtag.type == 'language']
-
-        return language_item[0] if len(language_item) > 0 else None
+        return self._parsed.language
 
     @property
     def region(self):
@@ -226,11 +324,7 @@ class Tag:
         :return: region :class:`language_tags.Subtag.Subtag` that is part of the tag.
             The return can be None.
         """
-
-        region_item = [subtag for subtag in self.subtags if subtag.type == 'region']
-
-        return region_item[0] if len(region_item) > 0 else None
-
+        return self._parsed.region
 
     @property
     def script(self):
@@ -240,9 +334,27 @@ class Tag:
         :return: script :class:`language_tags.Subtag.Subtag` that is part of the tag.
             The return can be None.
         """
-        script_item = [subtag for subtag in self.subtags if subtag.type == 'script']
+        return self._parsed.script
+
+    @property
+    def extensions(self):
+        """
+        Get the extensions of the tag (RFC 5646 section 2.2.6), in order of appearance.
 
-        return script_item[0] if len(script_item) > 0 else None
+        :return: list of :class:`language_tags.Tag.Extension` named tuples of the singleton and a tuple of its
+            subtags, for example ``[Extension(singleton='u', subtags=('ca', 'gregory'))]``. The return list can be
+            empty.
+        """
+        return list(self._parsed.extensions)
+
+    @property
+    def privateuse(self):
+        """
+        Get the private use subtags of the tag, the subtags after the singleton 'x' (RFC 5646 section 2.2.7).
+
+        :return: list of string private use subtags. The return list can be empty.
+        """
+        return list(self._parsed.privateuse)
 
     @property
     def valid(self):
@@ -251,7 +363,7 @@ class Tag:
 
         :return: Bool -- True if valid otherwise False.
         """
-        return len(self.errors) < 1
+        return len(self._errors) < 1
 
     @property
     def errors(self):
@@ -262,26 +374,37 @@ class Tag:
 
         :return: list of errors of the tag. If the tag is valid, it returns an empty list.
         """
+        return list(self._errors)
+
+    @cached_property
+    def _errors(self):
         errors = []
-        data = self.data
+        tag_data = self.data
+        registry = self._registry
+        index = registry.get('index')
         error = self.error
 
         # Check if the tag is grandfathered and if the grandfathered tag is deprecated (e.g. no-nyn).
-        if 'record' in data:
-            if 'Deprecated' in data['record']:
+        if 'record' in tag_data:
+            if 'Deprecated' in tag_data['record']:
                 errors.append(error(self.ERR_DEPRECATED))
             # Only check every subtag if the tag is not explicitly listed as grandfathered or redundant.
             return errors
 
+        # Reject garbage (empty codes, codes of the wrong length, other characters than letters and digits) without
+        # looking up its subtags. Well-formed tags need one match, tags with misplaced subtags get the checks below.
+        from language_tags.syntax import SUBTAG_CODES, well_formed
+        tag = tag_data['tag']
+        if not well_formed(tag) and SUBTAG_CODES.fullmatch(tag) is None:
+            errors.append(error(self.ERR_MALFORMED))
+            return errors
+
         # Check that all subtag codes are meaningful.
-        codes = data['tag'].split('-')
-        for i, code in enumerate(codes):
+        parsed = self._parsed
+        codes = parsed.codes
+        for code in codes:
             # Ignore anything after a singleton (break)
             if len(code) < 2:
-                # Check that each private-use subtag is within the maximum allowed length.
-                for code in codes[i + 1:]:
-                    if len(code) > 8:
-                        errors.append(error(self.ERR_TOO_LONG, code))
                 break
 
             if code not in index:
@@ -289,8 +412,28 @@ class Tag:
                 # Continue to the next item.
                 continue
 
+        # Check the extensions and the private use subtags, each singleton may only appear once.
+        singletons = set()
+        for extension in parsed.extensions:
+            if extension.singleton in singletons:
+                errors.append(error(self.ERR_DUPLICATE_SINGLETON, extension.singleton))
+            singletons.add(extension.singleton)
+            if not extension.subtags:
+                errors.append(error(self.ERR_EMPTY_EXTENSION, extension.singleton))
+            # Check that each extension subtag is within the maximum allowed length.
+            for code in extension.subtags:
+                if len(code) > 8:
+                    errors.append(error(self.ERR_TOO_LONG, code))
+        if codes[-1] == 'x' and not parsed.privateuse:
+            errors.append(error(self.ERR_EMPTY_EXTENSION, 'x'))
+        # Check that each private-use subtag is within the maximum allowed length too, both are reported with the
+        # same error code.
+        for code in parsed.privateuse:
+            if len(code) > 8:
+                errors.append(error(self.ERR_TOO_LONG, code))
+
         # Check that first tag is a language tag.
-        subtags = self.subtags
+        subtags = self._parsed.subtags
         if not len(subtags):
             errors.append(error(self.ERR_NO_LANGUAGE))
             return errors
@@ -298,14 +441,24 @@ class Tag:
             errors.append(error(self.ERR_NO_LANGUAGE))
             return errors
 
-        # Check for more than one of some types and for deprecation.
+        # Check for more than one of some types, for deprecation and for the prefixes of extlangs and variants.
         found = dict(language=[], extlang=[], variant=[], script=[], region=[])
+        from language_tags.indexes import prefixes
+        subtag_prefixes = prefixes(registry)
+        preceding = set()
         for subtag in subtags:
             type = subtag.type
+            code = subtag.format.lower()
 
             if subtag.deprecated:
                 errors.append(error(self.ERR_SUBTAG_DEPRECATED, subtag))
 
+            # All codes of one of the prefixes must precede the subtag.
+            if (code, type) in subtag_prefixes:
+                if not any(prefix <= preceding for prefix in subtag_prefixes[(code, type)]):
+                    errors.append(error(self.ERR_PREFIX, subtag))
+            preceding.add(code)
+
             if type in found:
                 found[type].append(subtag)
 
@@ -329,7 +482,7 @@ class Tag:
                             errors.append(error(self.ERR_SUPPRESS_SCRIPT, subtag))
             elif 'variant' == type:
                 if len(found['variant']) > 1:
-                    for variant in found['variant']:
+                    for variant in found['variant'][:-1]:
                         if variant.format == subtag.format:
                             errors.append(error(self.ERR_DUPLICATE_VARIANT, subtag))
                             break
@@ -365,6 +518,10 @@ class Tag:
             * 10 = Tag.ERR_SUPPRESS_SCRIPT,
             * 11 = Tag.ERR_SUBTAG_DEPRECATED
             * 12 = Tag.ERR_EXTRA_LANGUAGE
+            * 13 = Tag.ERR_DUPLICATE_SINGLETON
+            * 14 = Tag.ERR_EMPTY_EXTENSION
+            * 15 = Tag.ERR_PREFIX
+            * 16 = Tag.ERR_MALFORMED
 
         :param subtag: string (sub)tag or list of string (sub)tags creating the error.
         :return: An exception class containing: a Tag error input code, the derived message with the given (sub)tag(s).
@@ -394,7 +551,13 @@ class Tag:
             message = 'Unknown code \'%s\'' % subtag
 
         elif code == self.ERR_TOO_LONG:
-            message = 'The private-use subtag \'%s\' is too long.' % subtag
+            message = 'The extension or private-use subtag \'%s\' is too long.' % subtag
+
+        elif code == self.ERR_DUPLICATE_SINGLETON:
+            message = 'Duplicate singleton \'%s\' found.' % subtag
+
+        elif code == self.ERR_EMPTY_EXTENSION:
+            message = 'The singleton \'%s\' is not followed by a subtag.' % subtag
 
         elif code in [self.ERR_EXTRA_LANGUAGE,
                     self.ERR_EXTRA_EXTLANG,
@@ -408,17 +571,14 @@ class Tag:
         elif code == self.ERR_WRONG_ORDER:
             message = 'The subtag \'%s\' should not appear before \'%s\'.' % (subtag[0].format, subtag[1].format)
 
-        elif code == self.ERR_SUPPRESS_SCRIPT:
-            message = 'The script subtag \'%s\' is the same as the language suppress-script.' % subtag.format
+        elif code == self.ERR_PREFIX:
+            message = 'The %s subtag \'%s\' requires one of the prefixes \'%s\'.' % (
+                subtag.type, subtag.format, '\', \''.join(subtag.data['record']['Prefix']))
 
-        class Error(Exception):
-            def __init__(self, code, message, tag, subtag):
-                self.code = code
-                self.message = message
-                self.tag = tag
-                self.subtag = subtag.format if isinstance(subtag, Subtag) else subtag
+        elif code == self.ERR_MALFORMED:
+            message = 'The tag \'%s\' is not well-formed.' % data['tag']
 
-            def __str__(self):
-                return repr("%s: %s (Tag %s; Subtag %s)" % (self.code, self.message, self.tag, str(self.subtag)))
+        elif code == self.ERR_SUPPRESS_SCRIPT:
+            message = 'The script subtag \'%s\' is the same as the language suppress-script.' % subtag.format
 
         return Error(code, message, data['tag'], subtag)
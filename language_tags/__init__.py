@@ -1 +1,2 @@
-from language_tags.tags import tags
\ No newline at end of file
+from language_tags.data import Registry
+from language_tags.tags import tags
@@ -0,0 +1,5 @@
+import sys
+
+from language_tags.cli import main
+
+sys.exit(main())
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Canonicalization of tags according to RFC 5646 section 4.5.
+
+The replacements of the registry are compiled once into dictionaries of lowercase codes, so canonicalizing a tag
+is a split, a few dictionary lookups and a join. No :class:`language_tags.Subtag.Subtag` objects are created.
+"""
+from language_tags import data
+from language_tags.syntax import format_codes, split_codes
+
+__all__ = ['CanonicalMap', 'canonical_map']
+
+
+class CanonicalMap:
+    def __init__(self, registry):
+        """
+        The replacements of the registry by type, as dicts of lowercase codes.
+
+        :param registry: the registry records.
+        """
+        # Grandfathered and redundant tags replaced as a whole. Grandfathered tags without a preferred value are
+        # irregular and kept as they are.
+        self.tags = {}
+        self.irregular = set()
+        self.preferred = dict(language={}, script={}, region={})
+        # Extlang to its prefix and preferred value.
+        self.extlangs = {}
+        # Variant to its preferred value and the variants of its prefix, which the preferred value replaces too
+        # (for example 'ja-Latn-hepburn-heploc' becomes 'ja-Latn-alalc97').
+        self.variants = {}
+        self.suppress_scripts = {}
+
+        for record in registry:
+            type = record['Type']
+            preferred = record['Preferred-Value'].lower() if 'Preferred-Value' in record else None
+            if 'Tag' in record:
+                tag = record['Tag'].lower()
+                if preferred:
+                    self.tags[tag] = preferred
+                elif type == 'grandfathered':
+                    self.irregular.add(tag)
+                continue
+
+            subtag = record['Subtag'].lower()
+            if type == 'extlang':
+                self.extlangs[subtag] = (record['Prefix'][0].lower(), preferred)
+            elif type == 'variant':
+                if preferred:
+                    prefixes = {code for prefix in record.get('Prefix', []) for code in prefix.lower().split('-')}
+                    self.variants[subtag] = (preferred, prefixes)
+            elif preferred and type in self.preferred:
+                self.preferred[type][subtag] = preferred
+            if 'Suppress-Script' in record:
+                self.suppress_scripts[subtag] = record['Suppress-Script'].lower()
+
+    def canonicalize(self, tag, extlang=False):
+        """
+        Get the canonical form of a tag (RFC 5646 section 4.5):
+
+        * grandfathered and redundant tags are replaced by their preferred value
+        * language, extlang, script, region and variant subtags are replaced by their preferred value, a language
+          with an extlang by the extlang
+        * a script that is the suppress-script of the language is removed
+        * extensions are ordered by singleton
+
+        Codes that are not in the registry are kept.
+
+        :param str tag: lowercase (hyphen-separated) tag without surrounding whitespace.
+        :param bool extlang: if True the tag is converted to extlang form, for example 'zh-yue' instead of 'yue'.
+        :return: formatted canonical tag string.
+        """
+        if tag in self.tags:
+            tag = self.tags[tag]
+        if tag in self.irregular or not tag:
+            return format_codes(tag.split('-'))
+
+        codes = tag.split('-')
+        if len(codes[0]) == 1:
+            # Private use tag
+            return format_codes(codes)
+        language, extlangs, script, region, variants, extensions, privateuse = split_codes(codes)
+
+        # Replace the subtags by their preferred value.
+        if extlangs and extlangs[0] in self.extlangs:
+            prefix, preferred = self.extlangs[extlangs[0]]
+            if preferred and prefix == language:
+                language = preferred
+                del extlangs[0]
+        language = self.preferred['language'].get(language, language)
+        if script is not None:
+            script = self.preferred['script'].get(script, script)
+            if script == self.suppress_scripts.get(language):
+                script = None
+        if region is not None:
+            region = self.preferred['region'].get(region, region)
+        if variants:
+            replaced = [self.variants[variant] for variant in variants if variant in self.variants]
+            if replaced:
+                prefixes = set().union(*(prefixes for _, prefixes in replaced))
+                variants = [self.variants[variant][0] if variant in self.variants else variant
+                            for variant in variants if variant not in prefixes]
+
+        if extlang and not extlangs and language in self.extlangs:
+            codes = [self.extlangs[language][0], language]
+        else:
+            codes = [language]
+        codes.extend(extlangs)
+        if script is not None:
+            codes.append(script)
+        if region is not None:
+            codes.append(region)
+        codes.extend(variants)
+        # The sort is stable, repeated singletons keep their order.
+        for extension in sorted(extensions, key=lambda extension: extension[0]):
+            codes.extend(extension)
+        codes.extend(privateuse)
+        return format_codes(codes)
+
+
+def canonical_map(registry=None):
+    """
+    Get the :class:`CanonicalMap` of a registry, building it on first use.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: :class:`CanonicalMap`.
+    """
+    registry = registry or data.current()
+    return registry.derived('canonical-map', lambda: CanonicalMap(registry.get('registry')))
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Command line interface of :mod:`language_tags`::
+
+    language-tags validate tags.txt
+    language-tags validate --format csv --column lang --report records.csv
+    cat tags.txt | python -m language_tags validate --report
+    language-tags diff /srv/language-tags/json
+    language-tags diff /srv/language-tags/json --recheck tags.txt
+
+Input is read and validated as a stream, so files of any size are processed in constant memory.
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import Counter
+from io import open
+
+from language_tags.Tag import Tag
+from language_tags.lru import LRUCache
+from language_tags.tags import tags
+
+__all__ = ['main']
+
+FORMATS = ('lines', 'csv', 'jsonl')
+
+# Names of the error codes, for example {3: 'ERR_UNKNOWN'}.
+ERROR_NAMES = {getattr(Tag, name): name for name in dir(Tag) if name.startswith('ERR_')}
+
+
+def read_lines(stream):
+    """
+    Read newline-delimited tags, skipping blank lines.
+
+    :param stream: text stream.
+    :return: generator of string tags.
+    """
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def read_csv(stream, column=None):
+    """
+    Read the tags of a column of a CSV stream with a header row.
+
+    :param stream: text stream.
+    :param str column: name or zero-based number of the column. Defaults to the first column.
+    :return: generator of string tags.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    if column is None:
+        position = 0
+    elif column.isdigit():
+        position = int(column)
+    elif column in header:
+        position = header.index(column)
+    else:
+        raise ValueError('Column \'%s\' not found in the CSV header.' % column)
+    for row in reader:
+        if len(row) > position:
+            yield row[position]
+
+
+def read_jsonl(stream, column):
+    """
+    Read the tags of a field of a JSON Lines stream, skipping records without the field.
+
+    :param stream: text stream.
+    :param str column: name of the field.
+    :return: generator of string tags.
+    :raise ValueError: if a line is not a JSON object.
+    """
+    if column is None:
+        raise ValueError('The JSON Lines format requires a column.')
+    for number, line in enumerate(stream, 1):
+        if line.strip():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                raise ValueError('Line %d is not valid JSON.' % number) from None
+            if not isinstance(record, dict):
+                raise ValueError('Line %d is not a JSON object.' % number)
+            value = record.get(column)
+            if value is not None:
+                yield value
+
+
+def read(stream, format='lines', column=None):
+    """
+    Read the tags of a stream.
+
+    :param stream: text stream.
+    :param str format: 'lines', 'csv' or 'jsonl'.
+    :param str column: column (CSV) or field (JSON Lines) containing the tags.
+    :return: generator of string tags.
+    """
+    if format == 'csv':
+        return read_csv(stream, column)
+    if format == 'jsonl':
+        return read_jsonl(stream, column)
+    return read_lines(stream)
+
+
+def validate(values, cache_size=4096):
+    """
+    Validate a stream of tags.
+
+    :param values: iterable of string tags.
+    :param int cache_size: number of distinct tags of which the errors are cached.
+    :return: generator of (tag, tuple of error codes) pairs.
+    """
+    cache = LRUCache(cache_size)
+
+    for value in values:
+        yield value, cache.get(str(value).strip().lower(), tags.error_codes)
+
+
+def report(results):
+    """
+    Count the results of a validation.
+
+    :param results: iterable of (tag, tuple of error codes) pairs.
+    :return: tuple of the number of tags, the number of valid tags and a :class:`collections.Counter` of the
+        error codes.
+    """
+    total = valid = 0
+    codes = Counter()
+    for _, errors in results:
+        total += 1
+        if errors:
+            codes.update(errors)
+        else:
+            valid += 1
+    return total, valid, codes
+
+
+def _values(paths, format, column):
+    # Chain the inputs lazily, so only one line at the time is in memory.
+    for path in paths or ['-']:
+        if path == '-':
+            yield from read(sys.stdin, format, column)
+        else:
+            with open(path, encoding='utf-8', newline='') as f:
+                yield from read(f, format, column)
+
+
+def _validate_command(args, output):
+    def values():
+        return _values(args.files, args.format, args.column)
+
+    if args.jobs > 1:
+        from language_tags.parallel import validate_parallel
+        # The order of the results does not matter for the report.
+        results = validate_parallel(values(), args.jobs, args.chunksize, not args.report, args.cache_size)
+    else:
+        results = validate(values(), args.cache_size)
+
+    if args.report:
+        total, valid, codes = report(results)
+        output.write('total\t%d\n' % total)
+        output.write('valid\t%d\n' % valid)
+        output.write('invalid\t%d\n' % (total - valid))
+        for code, count in sorted(codes.items()):
+            output.write('%s (%d)\t%d\n' % (ERROR_NAMES.get(code, 'ERR'), code, count))
+        return 0 if total == valid else 1
+
+    status = 0
+    for tag, errors in results:
+        if errors:
+            status = 1
+            output.write('%s\tinvalid\t%s\n' % (tag, ','.join(str(code) for code in errors)))
+        else:
+            output.write('%s\tvalid\t\n' % tag)
+    return status
+
+
+def _diff_command(args, output):
+    from language_tags import data
+    from language_tags.diff import diff
+    old = data.Registry(args.old) if args.old else data.current()
+    changes = diff(old, data.Registry(args.new, base=old))
+
+    if args.recheck is not None:
+        status = 0
+        for tag, old_errors, new_errors, old_canonical, new_canonical in changes.recheck(
+                _values(args.recheck, args.format, args.column), args.cache_size):
+            status = 1
+            old_codes = ','.join(str(code) for code in old_errors)
+            new_codes = ','.join(str(code) for code in new_errors)
+            output.write('%s\t%s\t%s\t%s\t%s\n' % (tag, old_codes, new_codes, old_canonical, new_canonical))
+        return status
+
+    if args.json:
+        json.dump(changes.to_dict(), output, ensure_ascii=False, indent=1)
+        output.write('\n')
+    else:
+        for change in changes.added:
+            output.write('added\t%s\t%s\n' % (change.type, change.code))
+        for change in changes.removed:
+            output.write('removed\t%s\t%s\n' % (change.type, change.code))
+        for change in changes.deprecated:
+            output.write('deprecated\t%s\t%s\t%s\n' % (change.type, change.code, change.new['Deprecated']))
+        for change in changes.preferred_value:
+            output.write('preferred-value\t%s\t%s\t%s\t%s\n' % (
+                change.type, change.code, change.old.get('Preferred-Value', ''),
+                change.new.get('Preferred-Value', '')))
+        for change in changes.modified:
+            fields = sorted(name for name in set(change.old) | set(change.new)
+                            if change.old.get(name) != change.new.get(name))
+            output.write('modified\t%s\t%s\t%s\n' % (change.type, change.code, ','.join(fields)))
+    return 1 if changes else 0
+
+
+def _add_input_arguments(parser):
+    parser.add_argument('--format', choices=FORMATS, default='lines',
+                        help='input format: one tag per line (default), CSV with a header row or JSON Lines')
+    parser.add_argument('--column',
+                        help='CSV column name or zero-based number (default: first column) or JSON Lines field '
+                             'containing the tags')
+    parser.add_argument('--cache-size', type=int, default=4096,
+                        help='number of distinct tags of which the result is cached (default: 4096)')
+
+
+def main(argv=None):
+    """
+    Run the command line interface.
+
+    :param list argv: the arguments, defaults to the arguments of the process.
+    :return: int -- exit status, 0 if all tags are valid (validate) or nothing changed (diff), 1 if some tags are
+        invalid or something changed and 2 on usage errors.
+    """
+    parser = argparse.ArgumentParser(prog='language-tags', description='Work with IANA language tags.')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    validate_parser = commands.add_parser(
+        'validate',
+        help='validate tags',
+        description='Validate the tags of files or stdin. Prints each tag with \'valid\' or \'invalid\' and the error '
+                    'codes separated by tabs, or a report with the counts by error code.'
+    )
+    validate_parser.add_argument('files', nargs='*', metavar='FILE', help='input files, \'-\' or none for stdin')
+    _add_input_arguments(validate_parser)
+    validate_parser.add_argument('--report', action='store_true',
+                                 help='only print the number of tags and the counts by error code')
+    validate_parser.add_argument('--jobs', type=int, default=1,
+                                 help='number of worker processes (default: 1, validate in this process)')
+    validate_parser.add_argument('--chunksize', type=int, default=1000,
+                                 help='number of tags sent to a worker process at once (default: 1000)')
+    validate_parser.set_defaults(run=_validate_command)
+
+    diff_parser = commands.add_parser(
+        'diff',
+        help='compare two versions of the registry',
+        description='Compare a new version of the registry with the bundled one. Prints the added, removed, '
+                    'deprecated and modified subtags and tags and the changes of preferred values separated by tabs. '
+                    'With --recheck, prints the tags of the input of which the error codes or the canonical form '
+                    'change instead, only tags containing a changed subtag are validated.'
+    )
+    diff_parser.add_argument('new', metavar='NEW', help='directory of the JSON data files of the new registry')
+    diff_parser.add_argument('--old', metavar='OLD',
+                             help='directory of the JSON data files of the old registry (default: bundled data)')
+    diff_parser.add_argument('--json', action='store_true', help='print the changes as JSON')
+    diff_parser.add_argument('--recheck', nargs='*', metavar='FILE',
+                             help='input files of tags to re-check, \'-\' or none for stdin')
+    _add_input_arguments(diff_parser)
+    diff_parser.set_defaults(run=_diff_command)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.run(args, sys.stdout)
+    except (OSError, ValueError) as e:
+        sys.stderr.write('language-tags: error: %s\n' % e)
+        return 2
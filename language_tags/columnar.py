@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+A column-oriented view of the registry for analytics, built with NumPy from the data the library uses.
+
+NumPy is required for this module, pandas and pyarrow only for :meth:`RegistryColumns.to_pandas` and
+:meth:`RegistryColumns.to_arrow`::
+
+    pip install language-tags[columnar]
+"""
+from language_tags import data
+
+__all__ = ['RegistryColumns', 'registry_columns', 'lookup']
+
+# Columns of strings that are stored as integer codes into a sorted tuple of categories, -1 if the record has no
+# value. Maps the column name to the field of the registry records.
+CATEGORICAL = {
+    'type': 'Type',
+    'scope': 'Scope',
+    'suppress_script': 'Suppress-Script',
+    'macrolanguage': 'Macrolanguage',
+    'preferred_value': 'Preferred-Value',
+}
+
+# Columns of dates, NaT if the record has no value.
+DATES = {
+    'added': 'Added',
+    'deprecated': 'Deprecated',
+}
+
+
+def _import(name):
+    try:
+        return __import__(name)
+    except ImportError as e:
+        raise ImportError('%s is required for the columnar registry view, install it with '
+                          '\'pip install language-tags[columnar]\'.' % name) from e
+
+
+class RegistryColumns:
+    def __init__(self, registry, index):
+        """
+        The registry as NumPy arrays with one row per registry record, in registry order:
+
+        * ``code``: the subtag or tag as a string array
+        * ``type``, ``scope``, ``suppress_script``, ``macrolanguage`` and ``preferred_value``: int16 arrays of codes
+          into :attr:`categories`, -1 if the record has no value
+        * ``added`` and ``deprecated``: datetime64[D] arrays, NaT if the record has no value
+        * ``description``: object array of the descriptions joined with ', '
+
+        :param registry: the registry records.
+        :param dict index: the registry index.
+        """
+        numpy = _import('numpy')
+        self.columns = {
+            'code': numpy.array([record['Subtag'] if 'Subtag' in record else record['Tag'] for record in registry],
+                                dtype=str)
+        }
+        self.categories = {}
+        for column, field in CATEGORICAL.items():
+            categories = tuple(sorted({record[field] for record in registry if field in record}))
+            codes = {category: code for code, category in enumerate(categories)}
+            self.categories[column] = categories
+            self.columns[column] = numpy.array([codes[record[field]] if field in record else -1
+                                                for record in registry], dtype=numpy.int16)
+        for column, field in DATES.items():
+            self.columns[column] = numpy.array([record.get(field, 'NaT') for record in registry],
+                                               dtype='datetime64[D]')
+        self.columns['description'] = numpy.array([', '.join(record['Description']) for record in registry],
+                                                  dtype=object)
+
+        # Sorted index keys with the row of each type, to look up arrays of codes with a binary search.
+        keys = sorted(index)
+        self._keys = numpy.array(keys, dtype=str)
+        self._first_rows = numpy.array([next(iter(index[key].values())) for key in keys], dtype=numpy.int64)
+        self._rows = {}
+        for type in self.categories['type']:
+            self._rows[type] = numpy.array([index[key].get(type, -1) for key in keys], dtype=numpy.int64)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def __len__(self):
+        return len(self.columns['code'])
+
+    def lookup(self, values, type=None):
+        """
+        Get the registry rows of an array of (sub)tag strings in one vectorized call.
+
+        :param values: array-like of strings (or bytes), case-insensitive.
+        :param str type: type of the rows, for example 'region'. Defaults to the first type of the code in the
+            registry (for example 'language' for 'mt').
+        :return: int64 array with the registry row of each value, -1 if the value is not in the registry.
+        :raise ValueError: if the type does not exist.
+        """
+        numpy = _import('numpy')
+        if type is None:
+            rows = self._first_rows
+        elif type in self._rows:
+            rows = self._rows[type]
+        else:
+            raise ValueError('\'%s\' is not a type, use one of %s.' % (type, ', '.join(sorted(self._rows))))
+        values = numpy.char.lower(numpy.char.strip(numpy.asarray(values).astype(str)))
+        positions = numpy.minimum(numpy.searchsorted(self._keys, values), len(self._keys) - 1)
+        return numpy.where(self._keys[positions] == values, rows[positions], -1)
+
+    def to_pandas(self):
+        """
+        Get the registry as a pandas DataFrame, with categorical columns for the categories.
+
+        :return: :class:`pandas.DataFrame`.
+        """
+        pandas = _import('pandas')
+        frame = {}
+        for column, values in self.columns.items():
+            if column in self.categories:
+                values = pandas.Categorical.from_codes(values, categories=list(self.categories[column]))
+            frame[column] = values
+        return pandas.DataFrame(frame)
+
+    def to_arrow(self):
+        """
+        Get the registry as an Arrow table, with dictionary encoded columns for the categories.
+
+        :return: :class:`pyarrow.Table`.
+        """
+        pyarrow = _import('pyarrow')
+        table = {}
+        for column, values in self.columns.items():
+            if column in self.categories:
+                indices = pyarrow.array(values, mask=values < 0)
+                values = pyarrow.DictionaryArray.from_arrays(
+                    indices, pyarrow.array(list(self.categories[column]), type=pyarrow.string()))
+            else:
+                values = pyarrow.array(values.tolist() if values.dtype == object else values)
+            table[column] = values
+        return pyarrow.table(table)
+
+
+def registry_columns(registry=None):
+    """
+    Get the :class:`RegistryColumns` of a registry, building them on first use.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: :class:`RegistryColumns`.
+    :raise ImportError: if NumPy is not installed.
+    """
+    registry = registry or data.current()
+    return registry.derived('columns', lambda: RegistryColumns(registry.get('registry'), registry.get('index')))
+
+
+def lookup(values, type=None, registry=None):
+    """
+    Get the registry rows of an array of (sub)tag strings, see :meth:`RegistryColumns.lookup`.
+
+    :param values: array-like of strings (or bytes), case-insensitive.
+    :param str type: type of the rows.
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: int64 array with the registry row of each value, -1 if the value is not in the registry.
+    """
+    return registry_columns(registry).lookup(values, type)
@@ -1,18 +1,154 @@
 import os
-import json
-from io import open
+import threading
 
-__all__ = ['get']
+from language_tags.data.registry import BACKENDS, Registry, compiled_file, data_dir, mapped_file
+
+__all__ = ['get', 'derived', 'preload', 'set_backend', 'current', 'reload', 'on_swap', 'Registry']
 
 parent_dir = os.path.dirname(__file__)
-data_dir = 'json/'
 
-cache = {}
+# The registry used by default, replaced as a whole by reload() and set_backend().
+_current = Registry(os.path.join(parent_dir, data_dir), os.environ.get('LANGUAGE_TAGS_BACKEND', 'memory'))
+
+# Functions called after the registry is swapped, for example to clear caches of tags.
+_swap_callbacks = []
+
+# Serializes reloads, readers never wait for it.
+_reload_lock = threading.Lock()
+
+
+def __getattr__(name):
+    # The backend and the caches of the current registry, kept for backwards compatibility.
+    if name in ('backend', 'cache', 'derived_cache'):
+        return getattr(_current, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def module_getattr(module_name):
+    """
+    Get a module level ``__getattr__`` (PEP 562) of the index and the registry of the current registry. The
+    registry is loaded lazily, so the modules that used to load it on import keep their module level 'index' and
+    'registry' this way.
+
+    :param str module_name: name of the module, for the message of the AttributeError.
+    :return: function of an attribute name.
+    """
+    def __getattr__(name):
+        if name in ('index', 'registry'):
+            return get(name)
+        raise AttributeError("module %r has no attribute %r" % (module_name, name))
+    return __getattr__
+
+
+def current():
+    """
+    Get the current registry, the one used when no registry is given.
+
+    :return: :class:`language_tags.data.registry.Registry`.
+    """
+    return _current
 
 
 def get(name):
-    if name not in cache:
-        with open(os.path.join(parent_dir, data_dir, "%s.json" % name), encoding='utf-8') as f:
-            cache[name] = json.load(f)
+    """
+    Get a data file of the current registry, loading it on first use.
+
+    The index and the registry are loaded from the compiled artifact (see :mod:`language_tags.data.compile`) when
+    it is up to date with the JSON files, otherwise from the JSON files. With the 'mapped' backend the registry is
+    a :class:`language_tags.data.mapped.MappedRegistry`.
+
+    :param str name: name of the data file without extension (for example: 'registry', 'index' or 'meta').
+    :return: the parsed data.
+    """
+    return _current.get(name)
+
+
+def derived(name, build):
+    """
+    Get a structure derived from the data files of the current registry (for example an index), building it on
+    first use.
+
+    :param str name: name of the structure.
+    :param build: function without arguments building the structure.
+    :return: the structure.
+    """
+    return _current.derived(name, build)
+
+
+def preload(names=('index', 'registry')):
+    """
+    Load data files up front instead of on the first lookup.
+
+    Nothing is read from disk when :mod:`language_tags` is imported. Long running processes that want to pay the
+    loading cost at startup (for example before forking workers) can call this function.
+
+    :param names: names of the data files to load. Defaults to the index and the registry.
+    """
+    _current.preload(names)
+
+
+def _swap(registry):
+    global _current
+    # Assigning the module global is atomic, readers see either the old or the new registry.
+    _current = registry
+    for callback in list(_swap_callbacks):
+        callback()
+
+
+def set_backend(name):
+    """
+    Set how the registry records are stored. The data loaded so far is discarded.
+
+    The backend can also be set with the ``LANGUAGE_TAGS_BACKEND`` environment variable.
+
+    :param str name: 'memory' (default) to keep the records as dicts or 'mapped' to read them from a read-only
+        memory-mapped file shared by all processes through the OS page cache.
+    :raise ValueError: if the backend does not exist.
+    """
+    if name not in BACKENDS:
+        raise ValueError('\'%s\' is not a backend, use one of %s.' % (name, ', '.join(BACKENDS)))
+    with _reload_lock:
+        _swap(Registry(_current.json_dir, name, _current, _current.artifact_dir))
+
+
+def reload(json_dir=None, backend=None, names=('index', 'registry', 'meta'), artifact_dir=None):
+    """
+    Load a (new version of the) registry and make it the current registry, for example in a long running server
+    after the data files were updated.
+
+    The new registry is loaded completely before it replaces the current one, so lookups during the reload use
+    the old registry and never see a partially loaded one. Tags and subtags created before the swap keep using the
+    registry they were created with. Caches of tags (see :func:`language_tags.tags.tags.enable_cache`) are cleared.
+    Records that did not change are shared with the current registry.
+
+    :param str json_dir: directory containing the JSON data files, defaults to the directory of the current
+        registry.
+    :param str backend: 'memory' or 'mapped', defaults to the backend of the current registry.
+    :param names: names of the data files loaded before the swap.
+    :param str artifact_dir: trusted directory containing the compiled artifacts, used when they are up to date
+        (see :class:`language_tags.data.registry.Registry`). Defaults to the one of the current registry when no
+        JSON directory is given.
+    :return: the new :class:`language_tags.data.registry.Registry`.
+    :raise ValueError: if the backend does not exist.
+    :raise OSError: if a data file cannot be read, the current registry is kept.
+    """
+    backend = backend or _current.backend
+    if backend not in BACKENDS:
+        raise ValueError('\'%s\' is not a backend, use one of %s.' % (backend, ', '.join(BACKENDS)))
+    with _reload_lock:
+        if json_dir is None:
+            json_dir, artifact_dir = _current.json_dir, artifact_dir or _current.artifact_dir
+        registry = Registry(json_dir, backend, _current, artifact_dir)
+        registry.preload(names)
+        _swap(registry)
+    return registry
+
+
+def on_swap(callback):
+    """
+    Register a function that is called after the current registry is replaced by :func:`reload` or
+    :func:`set_backend`.
 
-    return cache[name]
+    :param callback: function without arguments.
+    """
+    _swap_callbacks.append(callback)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Compile the JSON registry files into binary artifacts: a pickle that loads faster than the JSON and a file for the
+memory-mapped backend (see :mod:`language_tags.data.mapped`). Also compiles the likely subtags table (see
+:func:`compile_likely`).
+
+The JSON files remain the source of truth. Run this module after updating them, optionally with the path of the
+CLDR ``likelySubtags.json`` file::
+
+    python -m language_tags.data.compile [likelySubtags.json]
+"""
+import gc
+import hashlib
+import json
+import os
+import pickle
+import sys
+from io import open
+
+__all__ = ['compile_registry', 'compile_mapped', 'compile_likely', 'load_compiled', 'fingerprint']
+
+# Increase when the layout of the compiled artifact changes.
+FORMAT = 2
+
+# The data files included in the compiled artifact.
+SOURCES = ('index', 'registry')
+
+
+def _intern(value):
+    # Interned strings are stored once in the pickle memo and shared in memory after loading.
+    if isinstance(value, str):
+        return sys.intern(value)
+    if isinstance(value, list):
+        return [_intern(item) for item in value]
+    if isinstance(value, dict):
+        return {_intern(key): _intern(item) for key, item in value.items()}
+    return value
+
+
+def _source_path(json_dir, name):
+    return os.path.join(json_dir, '%s.json' % name)
+
+
+def _file_date(json_dir):
+    with open(_source_path(json_dir, 'meta'), encoding='utf-8') as f:
+        return json.load(f)['File-Date']
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def fingerprint(json_dir):
+    """
+    Get the fingerprint of the JSON data files, used to detect stale artifacts.
+
+    :param str json_dir: directory containing the JSON data files.
+    :return: dict with the format, the ``File-Date`` and the SHA-1 digest of the content of each source.
+    """
+    return {
+        'format': FORMAT,
+        'File-Date': _file_date(json_dir),
+        'sha1': {name: _digest(_source_path(json_dir, name)) for name in SOURCES}
+    }
+
+
+def _load_source(json_dir, name, sources):
+    if sources is not None and name in sources:
+        return sources[name]
+    with open(_source_path(json_dir, name), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compile_registry(json_dir, target, sources=None):
+    """
+    Compile the JSON data files into a binary artifact.
+
+    :param str json_dir: directory containing the JSON data files.
+    :param str target: path of the compiled artifact.
+    :param dict sources: the parsed data of the sources by name, read from the JSON files when not given.
+    """
+    # The fingerprint is pickled separately so a stale artifact is detected without loading the data, and so is
+    # each source so a source can be loaded without the ones after it.
+    with open(target, 'wb') as f:
+        pickle.dump(fingerprint(json_dir), f, protocol=4)
+        for name in SOURCES:
+            pickle.dump(_intern(_load_source(json_dir, name, sources)), f, protocol=4)
+
+
+def compile_mapped(json_dir, target, sources=None):
+    """
+    Compile the registry JSON file into a file for the memory-mapped backend.
+
+    :param str json_dir: directory containing the JSON data files.
+    :param str target: path of the compiled file.
+    :param dict sources: the parsed data of the sources by name, read from the JSON files when not given.
+    """
+    from language_tags.data.mapped import build_mapped
+    build_mapped(_load_source(json_dir, 'registry', sources), fingerprint(json_dir), target)
+
+
+def compile_likely(json_dir, cldr_file=None, sources=None):
+    """
+    Compile the likely subtags table ``likely-subtags.json``: a JSON object of lowercase tags (such as 'zh-hant'
+    or 'und-tw') to their lowercase maximized tag (such as 'zh-hant-tw').
+
+    The table is taken from the CLDR likely subtags (``supplemental/likelySubtags.json`` of the ``cldr-core``
+    package). Languages of the registry that are not in it and have a ``Suppress-Script`` are added with that
+    script, without a region.
+
+    :param str json_dir: directory containing the JSON data files.
+    :param str cldr_file: path of the CLDR ``likelySubtags.json`` file. Without it the entries of the existing
+        table are kept.
+    :param dict sources: the parsed data of the sources by name, read from the JSON files when not given.
+    """
+    target = _source_path(json_dir, 'likely-subtags')
+    likely = {}
+    if cldr_file is not None:
+        with open(cldr_file, encoding='utf-8') as f:
+            cldr = json.load(f)['supplemental']['likelySubtags']
+        likely.update((tag.lower().replace('_', '-'), maximized.lower().replace('_', '-'))
+                      for tag, maximized in cldr.items())
+    elif os.path.exists(target):
+        with open(target, encoding='utf-8') as f:
+            likely.update(json.load(f))
+    for record in _load_source(json_dir, 'registry', sources):
+        if record['Type'] == 'language' and 'Suppress-Script' in record:
+            subtag = record['Subtag'].lower()
+            likely.setdefault(subtag, '%s-%s' % (subtag, record['Suppress-Script'].lower()))
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(likely.items())), f, indent=0, separators=(',', ':'))
+        f.write('\n')
+
+
+def load_compiled(json_dir, target, names=SOURCES, expected=None):
+    """
+    Load the compiled artifact if it is up to date with the JSON data files.
+
+    The artifact is stale when it was compiled from JSON files with another ``File-Date`` or content, or with
+    another version of this module. The artifact is unpickled, only load artifacts from a trusted location.
+
+    :param str json_dir: directory containing the JSON data files.
+    :param str target: path of the compiled artifact.
+    :param names: the sources to load. Defaults to all sources.
+    :param dict expected: the fingerprint of the JSON data files (see :func:`fingerprint`), computed when not given.
+    :return: dict with the data of each requested source, None if the artifact is missing or stale.
+    """
+    if not os.path.exists(target):
+        return None
+    compiled = {}
+    gc_enabled = gc.isenabled()
+    # Loading creates lots of container objects, running the garbage collector in between only costs time.
+    gc.disable()
+    try:
+        with open(target, 'rb') as f:
+            if pickle.load(f) != (expected or fingerprint(json_dir)):
+                return None
+            for name in SOURCES:
+                if not set(names) - set(compiled):
+                    break
+                value = pickle.load(f)
+                if name in names:
+                    compiled[name] = value
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return compiled
+
+
+if __name__ == '__main__':
+    from language_tags import data
+    json_dir = os.path.join(data.parent_dir, data.data_dir)
+    compile_registry(json_dir, os.path.join(data.parent_dir, data.compiled_file))
+    compile_mapped(json_dir, os.path.join(data.parent_dir, data.mapped_file))
+    compile_likely(json_dir, sys.argv[1] if len(sys.argv) > 1 else None)
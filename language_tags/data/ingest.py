@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Build the data files from the text file of the IANA language subtag registry, in the record-jar format of RFC 5646
+section 3.1, without npm::
+
+    python -m language_tags.data.ingest language-subtag-registry [likelySubtags.json]
+
+The file is read in one pass: each record is parsed, added to the registry and to the index, the type and the scope
+maps as it is read. The JSON files are written in the layout of the ``language-subtag-registry`` npm package
+(indented with tabs, keys in JavaScript order), so they are byte-identical to the files that package ships. The
+compiled artifacts and the likely subtags table are built from the parsed data (see
+:mod:`language_tags.data.compile`).
+"""
+import json
+import os
+import re
+import sys
+from io import open
+
+from language_tags.data.compile import compile_likely, compile_mapped, compile_registry
+
+__all__ = ['read_records', 'build', 'ingest']
+
+# Fields that can occur more than once in a record, their values are lists.
+LIST_FIELDS = ('Description', 'Comments', 'Prefix')
+
+# Characters outside ASCII are written as hexadecimal character references, for example '&#xE9;'.
+_REFERENCE = re.compile(r'&#x([0-9A-Fa-f]+);')
+
+
+def _unescape(value):
+    return _REFERENCE.sub(lambda match: chr(int(match.group(1), 16)), value) if '&#x' in value else value
+
+
+def _record(fields):
+    return {name: [_unescape(value) for value in values] if name in LIST_FIELDS else _unescape(values[0])
+            for name, values in fields.items()}
+
+
+def read_records(lines):
+    """
+    Parse the records of a registry file. Records are separated by '%%' lines, a field is a 'Name: body' line and
+    lines starting with whitespace continue the body of the previous field. A folded body is unfolded with a single
+    space and character references such as '&#xE9;' are decoded.
+
+    :param lines: iterable of the lines of the file, for example an open text file.
+    :return: generator of dicts of field name to string value (list of strings for the fields of
+        :data:`LIST_FIELDS`), in order of the file. The first record holds the ``File-Date``.
+    :raise ValueError: if a line is not a field, a continuation line or a separator.
+    """
+    fields = {}
+    values = None
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip()
+        if line == '%%':
+            if fields:
+                yield _record(fields)
+            fields = {}
+            values = None
+        elif line[:1] in (' ', '\t'):
+            if values is None:
+                raise ValueError('Line %d continues no field.' % number)
+            values[-1] += ' ' + line.lstrip()
+        elif line:
+            name, separator, body = line.partition(':')
+            if not separator:
+                raise ValueError('Line %d is not a field: %r.' % (number, line))
+            values = fields.setdefault(name.strip(), [])
+            values.append(body.strip())
+    if fields:
+        yield _record(fields)
+
+
+def _js_order(mapping):
+    # JavaScript objects keep their keys in insertion order, except keys that are array indices (canonical
+    # non-negative integers), which come first in numerical order. The npm package writes its maps that way.
+    indices = sorted((key for key in mapping if key.isdigit() and (key == '0' or key[0] != '0')), key=int)
+    if not indices:
+        return mapping
+    ordered = {key: mapping[key] for key in indices}
+    ordered.update((key, value) for key, value in mapping.items() if key not in ordered)
+    return ordered
+
+
+def build(records):
+    """
+    Build the data files from the records of a registry file.
+
+    :param records: iterable of records, see :func:`read_records`.
+    :return: dict of the data of each JSON file by name without extension: 'meta', 'registry', 'index', a map of
+        lowercase (sub)tag to registry position for each type (for example 'language') and for each scope (for
+        example 'macrolanguage').
+    :raise ValueError: if the first record has no ``File-Date``.
+    """
+    records = iter(records)
+    meta = next(records, {})
+    if 'File-Date' not in meta:
+        raise ValueError('The registry does not start with a File-Date.')
+    registry = []
+    index = {}
+    maps = {}
+    for position, record in enumerate(records):
+        registry.append(record)
+        code = (record['Subtag'] if 'Subtag' in record else record['Tag']).lower()
+        index.setdefault(code, {})[record['Type']] = position
+        maps.setdefault(record['Type'], {})[code] = position
+        if 'Scope' in record:
+            maps.setdefault(record['Scope'], {})[code] = position
+
+    files = {'meta': meta, 'registry': registry, 'index': _js_order(index)}
+    files.update((name, _js_order(positions)) for name, positions in maps.items())
+    return files
+
+
+def _write(json_dir, name, value):
+    with open(os.path.join(json_dir, '%s.json' % name), 'w', encoding='utf-8', newline='\n') as f:
+        f.write(json.dumps(value, indent='\t', ensure_ascii=False))
+        f.write('\n')
+
+
+def ingest(source, json_dir=None, cldr_file=None):
+    """
+    Build the JSON data files, the compiled artifacts and the likely subtags table from a registry file.
+
+    :param str source: path of the registry file, for example a local mirror of
+        https://www.iana.org/assignments/language-subtag-registry/language-subtag-registry.
+    :param str json_dir: directory of the JSON data files, defaults to the bundled data. The compiled artifacts are
+        written to its parent directory.
+    :param str cldr_file: path of the CLDR ``likelySubtags.json`` file, see
+        :func:`language_tags.data.compile.compile_likely`.
+    :return: dict of the data of each JSON file by name, see :func:`build`.
+    :raise ValueError: if the registry file is malformed, nothing is written then.
+    """
+    from language_tags import data
+    json_dir = json_dir or os.path.join(data.parent_dir, data.data_dir)
+    with open(source, encoding='utf-8') as f:
+        files = build(read_records(f))
+
+    os.makedirs(json_dir, exist_ok=True)
+    for name, value in files.items():
+        _write(json_dir, name, value)
+    parent_dir = os.path.dirname(os.path.normpath(json_dir))
+    compile_registry(json_dir, os.path.join(parent_dir, data.compiled_file), files)
+    compile_mapped(json_dir, os.path.join(parent_dir, data.mapped_file), files)
+    compile_likely(json_dir, cldr_file, files)
+    return files
+
+
+if __name__ == '__main__':
+    ingest(sys.argv[1], cldr_file=sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+A read-only, memory-mapped representation of the registry records.
+
+All records live in a single file that is mapped into memory. Processes mapping the same file share its pages
+through the OS page cache, and a record field is only decoded when it is read.
+
+Layout of the file (all integers little-endian):
+
+* header: magic ``LTRM``, format (uint16), length of the fingerprint (uint32) and the fingerprint as JSON
+* keys: number of keys (uint16), then per key its length (uint8), its ASCII name and a flag (uint8) set to 1 when
+  the field holds a list of values
+* offsets: number of records (uint32), then the start of each record and the end of the last record (uint32)
+* records: per field the key number (uint8) and the number of values (uint8), then per value its length (uint16)
+  and the UTF-8 encoded value
+"""
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping, Sequence
+from io import open
+
+__all__ = ['build_mapped', 'open_mapped', 'MappedRegistry', 'MappedRecord']
+
+MAGIC = b'LTRM'
+
+# Increase when the layout of the file changes.
+FORMAT = 1
+
+_header = struct.Struct('<4sHI')
+_uint8 = struct.Struct('<B')
+_uint16 = struct.Struct('<H')
+_uint32 = struct.Struct('<I')
+_field = struct.Struct('<BB')
+
+
+def build_mapped(registry, fingerprint, target):
+    """
+    Write the registry records to a file that can be memory-mapped.
+
+    :param list registry: the registry records.
+    :param dict fingerprint: JSON serializable fingerprint of the sources, checked when the file is opened.
+    :param str target: path of the file.
+    """
+    keys = []
+    list_keys = set()
+    for record in registry:
+        for key, value in record.items():
+            if key not in keys:
+                keys.append(key)
+            if isinstance(value, list):
+                list_keys.add(key)
+
+    records = []
+    for record in registry:
+        fields = []
+        for key, value in record.items():
+            values = value if isinstance(value, list) else [value]
+            fields.append(_field.pack(keys.index(key), len(values)))
+            for item in values:
+                encoded = item.encode('utf-8')
+                fields.append(_uint16.pack(len(encoded)) + encoded)
+        records.append(b''.join(fields))
+
+    fingerprint = json.dumps(fingerprint, sort_keys=True).encode('utf-8')
+    with open(target, 'wb') as f:
+        f.write(_header.pack(MAGIC, FORMAT, len(fingerprint)))
+        f.write(fingerprint)
+        f.write(_uint16.pack(len(keys)))
+        for key in keys:
+            encoded = key.encode('ascii')
+            f.write(_uint8.pack(len(encoded)) + encoded + _uint8.pack(key in list_keys))
+        f.write(_uint32.pack(len(records)))
+        offset = 0
+        for record in records:
+            f.write(_uint32.pack(offset))
+            offset += len(record)
+        f.write(_uint32.pack(offset))
+        for record in records:
+            f.write(record)
+
+
+def open_mapped(target, fingerprint):
+    """
+    Open a memory-mapped registry file.
+
+    :param str target: path of the file.
+    :param dict fingerprint: the expected fingerprint of the sources.
+    :return: :class:`MappedRegistry`, None if the file is missing or was built from other sources.
+    """
+    if not os.path.exists(target):
+        return None
+    with open(target, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file
+            return None
+    try:
+        magic, format, length = _header.unpack_from(buffer, 0)
+        if magic != MAGIC or format != FORMAT:
+            return None
+        start = _header.size
+        if json.loads(buffer[start:start + length].decode('utf-8')) != fingerprint:
+            return None
+    except (struct.error, ValueError):
+        return None
+    return MappedRegistry(buffer, start + length)
+
+
+class MappedRegistry(Sequence):
+    """
+    The registry records backed by a memory-mapped file. Records are returned as :class:`MappedRecord` objects.
+    """
+
+    def __init__(self, buffer, offset):
+        self._buffer = buffer
+        keys = []
+        list_keys = []
+        count, = _uint16.unpack_from(buffer, offset)
+        offset += _uint16.size
+        for _ in range(count):
+            length, = _uint8.unpack_from(buffer, offset)
+            offset += _uint8.size
+            keys.append(buffer[offset:offset + length].decode('ascii'))
+            offset += length
+            list_keys.append(bool(_uint8.unpack_from(buffer, offset)[0]))
+            offset += _uint8.size
+        self._keys = tuple(keys)
+        self._list_keys = tuple(list_keys)
+        self._key_ids = {key: i for i, key in enumerate(keys)}
+        self._length, = _uint32.unpack_from(buffer, offset)
+        self._offsets = offset + _uint32.size
+        self._records = self._offsets + (self._length + 1) * _uint32.size
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._length))]
+        if i < 0:
+            i += self._length
+        if not 0 <= i < self._length:
+            raise IndexError('registry index out of range')
+        start, end = struct.unpack_from('<II', self._buffer, self._offsets + i * _uint32.size)
+        return MappedRecord(self, self._records + start, self._records + end)
+
+
+class MappedRecord(Mapping):
+    """
+    A registry record backed by a memory-mapped file. Fields are decoded when they are read.
+    """
+
+    __slots__ = ('_registry', '_start', '_end')
+
+    def __init__(self, registry, start, end):
+        self._registry = registry
+        self._start = start
+        self._end = end
+
+    def _fields(self):
+        # Yield the key number, number of values and start of the values of each field.
+        buffer = self._registry._buffer
+        offset = self._start
+        while offset < self._end:
+            key_id, count = _field.unpack_from(buffer, offset)
+            offset += _field.size
+            yield key_id, count, offset
+            for _ in range(count):
+                offset += _uint16.size + _uint16.unpack_from(buffer, offset)[0]
+
+    def __getitem__(self, key):
+        registry = self._registry
+        key_id = registry._key_ids.get(key)
+        if key_id is not None:
+            buffer = registry._buffer
+            for field_key_id, count, offset in self._fields():
+                if field_key_id == key_id:
+                    values = []
+                    for _ in range(count):
+                        length, = _uint16.unpack_from(buffer, offset)
+                        offset += _uint16.size
+                        values.append(buffer[offset:offset + length].decode('utf-8'))
+                        offset += length
+                    return values if registry._list_keys[key_id] else values[0]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        key_id = self._registry._key_ids.get(key)
+        return any(field_key_id == key_id for field_key_id, _, _ in self._fields())
+
+    def __iter__(self):
+        keys = self._registry._keys
+        return (keys[key_id] for key_id, _, _ in self._fields())
+
+    def __len__(self):
+        return sum(1 for _ in self._fields())
+
+    def __repr__(self):
+        return repr(dict(self))
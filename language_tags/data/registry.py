@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+A version of the registry: the data files of one directory and everything derived from them.
+"""
+import os
+import weakref
+from io import open
+from itertools import count
+
+__all__ = ['Registry', 'BACKENDS']
+
+# 'memory' keeps the registry records as dicts, 'mapped' reads them from a memory-mapped file.
+BACKENDS = ('memory', 'mapped')
+
+compiled_file = 'registry.pickle'
+mapped_file = 'registry.mmap'
+data_dir = 'json/'
+
+# The directory of the bundled data: the JSON directory and the compiled artifacts.
+_bundled_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Numbers of the registry objects, in order of creation.
+_versions = count(1)
+
+
+class Registry:
+    def __init__(self, json_dir, backend='memory', base=None, artifact_dir=None):
+        """
+        The data files of a directory, loaded lazily, with the structures derived from them (indexes, the shared
+        :class:`language_tags.Subtag.Subtag` objects). A registry is not changed once loaded: a new version of the
+        data is a new registry (see :func:`language_tags.data.reload`).
+
+        The index and the registry are loaded from the compiled artifacts (see :mod:`language_tags.data.compile`)
+        when they are up to date with the JSON files, otherwise from the JSON files. Loading the compiled artifact
+        unpickles it, so it is only read from the bundled data or from a directory given explicitly.
+
+        Several registries can be used side by side, for example to validate tags against two versions of the data.
+        Records of this registry that are equal to the records of the base registry are shared with it instead of
+        being kept twice, so a new version only takes the memory of the records that changed.
+
+        :param str json_dir: directory containing the JSON data files.
+        :param str backend: 'memory' or 'mapped', see :func:`language_tags.data.set_backend`.
+        :param base: a registry sharing its unchanged records, for example the previous version of the data. It is
+            not kept alive by this registry.
+        :param str artifact_dir: trusted directory containing the compiled artifacts of the JSON data files (for
+            example the parent directory of the JSON directory written by :func:`language_tags.data.ingest.ingest`).
+            Defaults to the directory of the bundled artifacts for the bundled JSON files, no artifacts are used for
+            other JSON directories.
+        """
+        self.json_dir = json_dir
+        self.backend = backend
+        if artifact_dir is None and os.path.abspath(json_dir) == os.path.join(_bundled_dir, os.path.normpath(data_dir)):
+            artifact_dir = _bundled_dir
+        self.artifact_dir = artifact_dir
+        # The fingerprint of the JSON data files, computed when an artifact is checked first.
+        self._fingerprint = None
+        self._base = weakref.ref(base) if base is not None else None
+        # The data files ('registry', 'index') of which the records are shared with the base already.
+        self._shared = set()
+        # Unique in the process, caches of tags are keyed by it.
+        self.version = next(_versions)
+        self.cache = {}
+        # Structures derived from the data files, for example indexes.
+        self.derived_cache = {}
+        # The shared Subtag objects by (subtag, type), both lowercase.
+        self.subtags = {}
+
+    def __repr__(self):
+        return '<Registry %d %s>' % (self.version, self.json_dir)
+
+    def _artifact(self, name):
+        return os.path.join(self.artifact_dir, name)
+
+    def _sources_fingerprint(self):
+        # Hashing the JSON files takes milliseconds, both artifacts are checked against the same fingerprint.
+        if self._fingerprint is None:
+            from language_tags.data.compile import fingerprint
+            self._fingerprint = fingerprint(self.json_dir)
+        return self._fingerprint
+
+    def get(self, name):
+        """
+        Get a data file of the registry, loading it on first use.
+
+        :param str name: name of the data file without extension (for example: 'registry', 'index' or 'meta').
+        :return: the parsed data.
+        """
+        cache = self.cache
+        if name not in cache:
+            self._load(name)
+
+        return cache[name]
+
+    def _load(self, name):
+        from language_tags.data.compile import SOURCES, load_compiled
+        cache = self.cache
+        json_dir = self.json_dir
+        if name == 'registry' and self.backend == 'mapped' and self.artifact_dir is not None:
+            from language_tags.data.mapped import open_mapped
+            registry = open_mapped(self._artifact(mapped_file), self._sources_fingerprint())
+            if registry is not None:
+                cache[name] = registry
+        if name not in cache and name in SOURCES and self.artifact_dir is not None:
+            names = [source for source in SOURCES
+                     if source not in cache and (source == name or self.backend != 'mapped')]
+            compiled = load_compiled(json_dir, self._artifact(compiled_file), names, self._sources_fingerprint())
+            cache.update(compiled or {})
+        if name not in cache:
+            import json
+            with open(os.path.join(json_dir, "%s.json" % name), encoding='utf-8') as f:
+                cache[name] = json.load(f)
+        if name in ('registry', 'index') and self._base is not None:
+            self._share()
+
+    def _share(self):
+        # Replace the records and index entries equal to those of the base registry by the ones of the base. Each
+        # data file is shared once, when both registries have loaded it.
+        base = self._base()
+        if base is None or base is self:
+            return
+        for name in ('registry', 'index'):
+            value = self.cache.get(name)
+            base_value = base.cache.get(name)
+            if name in self._shared or value is None or base_value is None:
+                continue
+            self._shared.add(name)
+            if value is base_value:
+                continue
+            if name == 'registry' and isinstance(value, list) and isinstance(base_value, list):
+                shared = {(record['Type'], record.get('Subtag') or record['Tag']): record for record in base_value}
+                for i, record in enumerate(value):
+                    base_record = shared.get((record['Type'], record.get('Subtag') or record['Tag']))
+                    if base_record is not None and base_record == record:
+                        value[i] = base_record
+            elif name == 'index':
+                for code, types in value.items():
+                    base_types = base_value.get(code)
+                    if base_types is not None and base_types == types:
+                        value[code] = base_types
+
+    def derived(self, name, build):
+        """
+        Get a structure derived from the data files (for example an index), building it on first use.
+
+        :param str name: name of the structure.
+        :param build: function without arguments building the structure.
+        :return: the structure.
+        """
+        if name not in self.derived_cache:
+            self.derived_cache[name] = build()
+
+        return self.derived_cache[name]
+
+    def preload(self, names=('index', 'registry')):
+        """
+        Load data files up front instead of on the first lookup.
+
+        :param names: names of the data files to load. Defaults to the index and the registry.
+        """
+        for name in names:
+            self.get(name)
+
+    @property
+    def file_date(self):
+        """
+        Get the file date of the data.
+
+        :return: date as string (for example: '2014-03-27').
+        """
+        return self.get('meta')['File-Date']
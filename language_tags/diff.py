@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+Compare two versions of the registry, for example the bundled data and an update, and find the stored tags that
+the update affects::
+
+    from language_tags import Registry, data
+    from language_tags.diff import diff
+
+    changes = diff(data.current(), Registry('/srv/language-tags/json'))
+    for change in changes.deprecated:
+        print(change.type, change.code, change.new['Deprecated'])
+    for tag, old_errors, new_errors, old_canonical, new_canonical in changes.recheck(stored_tags):
+        ...
+
+The registries are joined on their indexes (code and type to registry position), so comparing them takes one
+lookup per record. Records shared by both registries (see :class:`language_tags.data.registry.Registry`) are not
+compared field by field.
+"""
+from collections import namedtuple
+
+from language_tags.canonical import canonical_map
+from language_tags.lru import LRUCache
+from language_tags.tags import tags
+
+__all__ = ['Change', 'Recheck', 'RegistryDiff', 'diff']
+
+# A record of a type and code (the subtag or the tag as in the registry) that differs between the registries.
+# The old record is None for added records, the new record None for removed records.
+Change = namedtuple('Change', ['type', 'code', 'old', 'new'])
+
+# A tag of which the error codes or the canonical form differ between the registries.
+Recheck = namedtuple('Recheck', ['tag', 'old_errors', 'new_errors', 'old_canonical', 'new_canonical'])
+
+
+def _record(record):
+    # Mapped records are compared and reported as dicts.
+    return record if isinstance(record, dict) else dict(record)
+
+
+def _code(record):
+    return record['Subtag'] if 'Subtag' in record else record['Tag']
+
+
+def _join(index, other_index):
+    # The positions of the records of the index and the positions of the same type and code in the other index.
+    for code, types in index.items():
+        other_types = other_index.get(code)
+        for type, position in types.items():
+            other_position = other_types.get(type) if other_types is not None else None
+            yield position, other_position
+
+
+class RegistryDiff:
+    def __init__(self, old, new):
+        """
+        The differences between two registries. Each list of changes is in registry order.
+
+        * ``added``: records of the new registry that are not in the old one
+        * ``removed``: records of the old registry that are not in the new one
+        * ``deprecated``: records that are deprecated in the new registry and were not in the old one
+        * ``preferred_value``: records of which the ``Preferred-Value`` is added, changed or removed
+        * ``modified``: all records that are in both registries and differ, including the deprecated ones and the
+          ones with another preferred value
+
+        :param old: the old :class:`language_tags.data.registry.Registry`.
+        :param new: the new :class:`language_tags.data.registry.Registry`.
+        """
+        self.old = old
+        self.new = new
+        self.added = []
+        self.removed = []
+        self.deprecated = []
+        self.preferred_value = []
+        self.modified = []
+
+        old_index, old_records = old.get('index'), old.get('registry')
+        new_index, new_records = new.get('index'), new.get('registry')
+        added = []
+        modified = []
+        for position, old_position in _join(new_index, old_index):
+            if old_position is None:
+                added.append(position)
+                continue
+            new_record = new_records[position]
+            old_record = old_records[old_position]
+            if new_record is not old_record:
+                new_record, old_record = _record(new_record), _record(old_record)
+                if new_record != old_record:
+                    modified.append((position, old_record, new_record))
+        removed = [old_position for old_position, position in _join(old_index, new_index) if position is None]
+
+        for position in sorted(added):
+            record = _record(new_records[position])
+            self.added.append(Change(record['Type'], _code(record), None, record))
+        for position in sorted(removed):
+            record = _record(old_records[position])
+            self.removed.append(Change(record['Type'], _code(record), record, None))
+        for _, old_record, new_record in sorted(modified, key=lambda item: item[0]):
+            change = Change(new_record['Type'], _code(new_record), old_record, new_record)
+            self.modified.append(change)
+            if 'Deprecated' in new_record and 'Deprecated' not in old_record:
+                self.deprecated.append(change)
+            if new_record.get('Preferred-Value') != old_record.get('Preferred-Value'):
+                self.preferred_value.append(change)
+
+        # The lowercase codes of all changes, tags that contain none of them are not affected.
+        self.codes = frozenset(change.code.lower() for change in self.added + self.removed + self.modified)
+
+    def __bool__(self):
+        return bool(self.codes)
+
+    def __repr__(self):
+        return '<RegistryDiff %s..%s: %d added, %d removed, %d deprecated, %d preferred value, %d modified>' % (
+            self.old.file_date, self.new.file_date, len(self.added), len(self.removed), len(self.deprecated),
+            len(self.preferred_value), len(self.modified))
+
+    def affects(self, tag):
+        """
+        Check if a tag contains a subtag (or is a grandfathered or redundant tag) that changed. The errors and the
+        canonical form of other tags are the same with both registries.
+
+        :param str tag: lowercase (hyphen-separated) tag without surrounding whitespace.
+        :return: bool -- True if the tag may be affected.
+        """
+        codes = self.codes
+        return tag in codes or not codes.isdisjoint(tag.split('-'))
+
+    def _recheck(self, tag):
+        old_errors = tags.error_codes(tag, self.old)
+        new_errors = tags.error_codes(tag, self.new)
+        old_canonical = canonical_map(self.old).canonicalize(tag)
+        new_canonical = canonical_map(self.new).canonicalize(tag)
+        if old_errors == new_errors and old_canonical == new_canonical:
+            return None
+        return old_errors, new_errors, old_canonical, new_canonical
+
+    def recheck(self, values, cache_size=4096):
+        """
+        Re-validate the tags of a collection that are affected by the changes (see :meth:`affects`) with both
+        registries. Other tags are skipped without being validated.
+
+        :param values: iterable of string (hyphen-separated) tags, for example the lines of a file.
+        :param int cache_size: number of distinct affected tags of which the result is cached.
+        :return: generator of :class:`Recheck` tuples for the tags of which the error codes (see
+            :func:`language_tags.Tag.Tag.error`) or the canonical form differ, in the order of the input.
+        """
+        cache = LRUCache(cache_size)
+        for value in values:
+            tag = str(value).strip().lower()
+            if self.affects(tag):
+                result = cache.get(tag, self._recheck)
+                if result is not None:
+                    yield Recheck(value, *result)
+
+    def to_dict(self):
+        """
+        Get the differences as a dict that can be serialized as JSON.
+
+        :return: dict with the file dates of the registries and a list of changes (dicts with the type, the code
+            and the old and new record) for each kind of change.
+        """
+        changes = {'old': self.old.file_date, 'new': self.new.file_date}
+        for name in ('added', 'removed', 'deprecated', 'preferred_value', 'modified'):
+            changes[name] = [change._asdict() for change in getattr(self, name)]
+        return changes
+
+
+def diff(old, new):
+    """
+    Compare two registries.
+
+    :param old: the old :class:`language_tags.data.registry.Registry`.
+    :param new: the new :class:`language_tags.data.registry.Registry`.
+    :return: :class:`RegistryDiff`.
+    """
+    return RegistryDiff(old, new)
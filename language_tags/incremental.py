@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental validation of large collections of tags. The errors of each distinct tag are stored in a SQLite
+database together with a reverse index from each code (subtag) to the tags containing it. When the registry is
+updated, only the tags containing a code that changed (see :mod:`language_tags.diff`) are validated again and
+their errors are updated in place::
+
+    from language_tags import Registry, data
+    from language_tags.incremental import ValidationStore
+
+    with ValidationStore('tags.db') as store:
+        store.add(stored_tags)
+        ...
+    # After an update of the data, with the registry the results were computed with:
+    with ValidationStore('tags.db', Registry('/srv/language-tags/old/json')) as store:
+        for tag, old_errors, new_errors in store.update(data.current()):
+            ...
+
+The reverse index is compact: codes are numbered and each pair of code number and tag number is stored once, in a
+table clustered by code.
+"""
+import sqlite3
+from collections import namedtuple
+from itertools import islice
+
+from language_tags import data
+from language_tags.diff import diff
+from language_tags.tags import tags
+
+__all__ = ['Update', 'ValidationStore']
+
+# A tag of which the error codes changed with an update of the registry.
+Update = namedtuple('Update', ['tag', 'old_errors', 'new_errors'])
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS tags (id INTEGER PRIMARY KEY, tag TEXT NOT NULL UNIQUE, errors TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS codes (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE);
+CREATE TABLE IF NOT EXISTS postings (code INTEGER NOT NULL, tag INTEGER NOT NULL, PRIMARY KEY (code, tag))
+    WITHOUT ROWID;
+'''
+
+# Number of rows read or written per statement.
+_BATCH = 500
+
+
+def _encode(errors):
+    return ','.join(str(code) for code in errors)
+
+
+def _decode(errors):
+    return tuple(int(code) for code in errors.split(',')) if errors else ()
+
+
+def _batches(values, size=_BATCH):
+    values = iter(values)
+    while True:
+        batch = list(islice(values, size))
+        if not batch:
+            return
+        yield batch
+
+
+class ValidationStore:
+    def __init__(self, path, registry=None):
+        """
+        The error codes of a set of distinct tags, validated with a registry and persisted in a SQLite database.
+
+        A store is used by one thread at the time.
+
+        :param str path: path of the database file, created if it does not exist (or ':memory:').
+        :param registry: the :class:`language_tags.data.registry.Registry` the stored errors are valid for,
+            defaults to the current registry.
+        :raise ValueError: if the stored errors were computed with a registry of another ``File-Date``.
+        """
+        self.registry = registry or data.current()
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(_SCHEMA)
+        # Code to its number, loaded on first use.
+        self._code_ids = None
+        row = self._connection.execute("SELECT value FROM meta WHERE name = 'File-Date'").fetchone()
+        if row is None:
+            with self._connection:
+                self._connection.execute("INSERT INTO meta VALUES ('File-Date', ?)", (self.registry.file_date,))
+        elif row[0] != self.registry.file_date:
+            self._connection.close()
+            raise ValueError('The errors are stored for the registry of %s, not %s.'
+                             % (row[0], self.registry.file_date))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return self._connection.execute('SELECT COUNT(*) FROM tags').fetchone()[0]
+
+    def __contains__(self, tag):
+        return self.errors(tag) is not None
+
+    def close(self):
+        """
+        Close the database.
+        """
+        self._connection.close()
+
+    @property
+    def file_date(self):
+        """
+        Get the file date of the registry the stored errors are valid for.
+
+        :return: date as string (for example: '2014-03-27').
+        """
+        return self.registry.file_date
+
+    def _validate(self, tag, registry):
+        return tags.error_codes(tag, registry)
+
+    def _code_id(self, code):
+        code_ids = self._code_ids
+        if code_ids is None:
+            code_ids = self._code_ids = dict(self._connection.execute('SELECT code, id FROM codes'))
+        if code not in code_ids:
+            code_ids[code] = self._connection.execute('INSERT INTO codes (code) VALUES (?)', (code,)).lastrowid
+        return code_ids[code]
+
+    def add(self, values):
+        """
+        Validate and store the tags of a collection that are not stored yet. Each distinct tag is validated once.
+
+        :param values: iterable of string (hyphen-separated) tags, for example the lines of a file.
+        :return: int -- the number of tags added.
+        """
+        connection = self._connection
+        added = 0
+        for batch in _batches(values):
+            keys = list(dict.fromkeys(str(value).strip().lower() for value in batch))
+            stored = {tag for tag, in connection.execute(
+                'SELECT tag FROM tags WHERE tag IN (%s)' % ','.join('?' * len(keys)), keys)}
+            try:
+                postings = []
+                for tag in keys:
+                    if tag in stored:
+                        continue
+                    tag_id = connection.execute('INSERT INTO tags (tag, errors) VALUES (?, ?)',
+                                                (tag, _encode(self._validate(tag, self.registry)))).lastrowid
+                    postings.extend((self._code_id(code), tag_id) for code in set(tag.split('-')))
+                    added += 1
+                connection.executemany('INSERT INTO postings VALUES (?, ?)', postings)
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                self._code_ids = None
+                raise
+        return added
+
+    def errors(self, tag):
+        """
+        Get the stored error codes of a tag.
+
+        :param str tag: (hyphen-separated) tag.
+        :return: tuple of error codes (see :func:`language_tags.Tag.Tag.error`), empty if the tag is valid. None if
+            the tag is not stored.
+        """
+        row = self._connection.execute('SELECT errors FROM tags WHERE tag = ?',
+                                       (str(tag).strip().lower(),)).fetchone()
+        return _decode(row[0]) if row is not None else None
+
+    def results(self, invalid=False):
+        """
+        Get the stored tags with their error codes, in the order they were added.
+
+        :param bool invalid: if True only the invalid tags.
+        :return: generator of (lowercase tag, tuple of error codes) pairs.
+        """
+        query = 'SELECT tag, errors FROM tags%s ORDER BY id' % (" WHERE errors != ''" if invalid else '')
+        for tag, errors in self._connection.execute(query):
+            yield tag, _decode(errors)
+
+    def _affected(self, codes):
+        # The numbers of the tags containing a code or equal to a code (grandfathered and redundant tags).
+        connection = self._connection
+        tag_ids = set()
+        for batch in _batches(codes):
+            placeholders = ','.join('?' * len(batch))
+            tag_ids.update(tag_id for tag_id, in connection.execute(
+                'SELECT postings.tag FROM codes JOIN postings ON postings.code = codes.id '
+                'WHERE codes.code IN (%s)' % placeholders, batch))
+            tag_ids.update(tag_id for tag_id, in connection.execute(
+                'SELECT id FROM tags WHERE tag IN (%s)' % placeholders, batch))
+        return tag_ids
+
+    def update(self, registry):
+        """
+        Update the stored errors to a new version of the registry. Only the tags containing a code that differs
+        between the registries are validated again. The errors are updated in one transaction: when the update
+        fails, the store keeps the errors of the previous registry.
+
+        :param registry: the new :class:`language_tags.data.registry.Registry`.
+        :return: list of :class:`Update` tuples (lowercase tag, old and new error codes) of the tags of which the
+            errors changed.
+        """
+        connection = self._connection
+        updates = []
+        tag_ids = sorted(self._affected(diff(self.registry, registry).codes))
+        try:
+            for batch in _batches(tag_ids):
+                rows = connection.execute('SELECT id, tag, errors FROM tags WHERE id IN (%s)'
+                                          % ','.join('?' * len(batch)), batch).fetchall()
+                changed = []
+                for tag_id, tag, errors in rows:
+                    old_errors = _decode(errors)
+                    new_errors = self._validate(tag, registry)
+                    if new_errors != old_errors:
+                        changed.append((_encode(new_errors), tag_id))
+                        updates.append(Update(tag, old_errors, new_errors))
+                connection.executemany('UPDATE tags SET errors = ? WHERE id = ?', changed)
+            connection.execute("UPDATE meta SET value = ? WHERE name = 'File-Date'", (registry.file_date,))
+            connection.commit()
+        except BaseException:
+            connection.rollback()
+            raise
+        self.registry = registry
+        return updates
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+Indexes over fields of the registry records. Each index is built on first use and discarded with the registry.
+"""
+from bisect import bisect_left, bisect_right
+
+from language_tags import data
+from language_tags.Subtag import Subtag
+
+__all__ = ['macrolanguage_members', 'prefixes', 'FieldIndex', 'field_index', 'bitset', 'positions']
+
+# The fields of the registry records indexed by value (lowercase) in a :class:`FieldIndex`.
+INDEXED_FIELDS = ('Type', 'Scope', 'Preferred-Value', 'Suppress-Script', 'Macrolanguage')
+
+
+def bitset(positions, size):
+    """
+    Get the bitset of registry positions.
+
+    :param positions: iterable of positions.
+    :param int size: number of registry records.
+    :return: int with the bit of each position set.
+    """
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def positions(bits):
+    """
+    Get the registry positions of a bitset.
+
+    :param int bits: the bitset.
+    :return: generator of ascending positions.
+    """
+    for i, byte in enumerate(bits.to_bytes((bits.bit_length() + 7) // 8, 'little')):
+        if byte:
+            for bit in range(8):
+                if byte >> bit & 1:
+                    yield i * 8 + bit
+
+
+def _build_macrolanguage_members(registry):
+    members = {}
+    for record in registry.get('registry'):
+        if 'Macrolanguage' in record:
+            members.setdefault(record['Macrolanguage'].lower(), []).append(
+                Subtag(record['Subtag'], record['Type'], registry))
+    return {macrolanguage: tuple(subtags) for macrolanguage, subtags in members.items()}
+
+
+def macrolanguage_members(registry=None):
+    """
+    Get the members of each macrolanguage.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: dict of lowercase macrolanguage subtag to a tuple of the :class:`language_tags.Subtag.Subtag`
+        objects of its members (languages and extlangs), in registry order.
+    """
+    registry = registry or data.current()
+    return registry.derived('macrolanguage-members', lambda: _build_macrolanguage_members(registry))
+
+
+def _build_prefixes(registry):
+    prefixes = {}
+    for record in registry.get('registry'):
+        if 'Prefix' in record:
+            prefixes[(record['Subtag'].lower(), record['Type'])] = tuple(
+                frozenset(prefix.lower().split('-')) for prefix in record['Prefix'])
+    return prefixes
+
+
+def prefixes(registry=None):
+    """
+    Get the prefixes of the extlangs and variants (RFC 5646 sections 2.2.2 and 2.2.5).
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: dict of (lowercase subtag, type) to a tuple of prefixes, each a frozenset of lowercase codes.
+    """
+    registry = registry or data.current()
+    return registry.derived('prefixes', lambda: _build_prefixes(registry))
+
+
+class FieldIndex:
+    def __init__(self, registry):
+        """
+        Bitsets of the registry positions by field value and by field presence, and the positions sorted by the
+        date they were added. Combining criteria intersects bitsets instead of scanning the registry.
+
+        :param registry: the registry records.
+        """
+        size = len(registry)
+        values = {field: {} for field in INDEXED_FIELDS}
+        present = {}
+        added = []
+        for position, record in enumerate(registry):
+            for field, value in record.items():
+                present.setdefault(field, []).append(position)
+                if field in values:
+                    values[field].setdefault(value.lower(), []).append(position)
+            added.append((record['Added'], position))
+        added.sort()
+
+        self.size = size
+        self.all = (1 << size) - 1
+        self.values = {field: {value: bitset(value_positions, size) for value, value_positions in field_values.items()}
+                       for field, field_values in values.items()}
+        self.present = {field: bitset(field_positions, size) for field, field_positions in present.items()}
+        self.added_dates = [date for date, _ in added]
+        self.added_positions = [position for _, position in added]
+
+    def value(self, field, value):
+        """
+        Get the bitset of the records with a value of a field.
+
+        :param str field: one of :data:`INDEXED_FIELDS`.
+        :param value: the value (case-insensitive), True for the records with the field or False for the records
+            without it.
+        :return: int -- bitset.
+        """
+        if value is True:
+            return self.present.get(field, 0)
+        if value is False:
+            return self.all & ~self.present.get(field, 0)
+        return self.values[field].get(str(value).lower(), 0)
+
+    def added(self, after=None, before=None):
+        """
+        Get the bitset of the records added in a period.
+
+        :param str after: only records added after this date (for example '2020-01-01').
+        :param str before: only records added before this date.
+        :return: int -- bitset.
+        """
+        start = bisect_right(self.added_dates, after) if after is not None else 0
+        end = bisect_left(self.added_dates, before) if before is not None else self.size
+        return bitset(self.added_positions[start:end], self.size)
+
+
+def field_index(registry=None):
+    """
+    Get the :class:`FieldIndex` of a registry, building it on first use.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: :class:`FieldIndex`.
+    """
+    registry = registry or data.current()
+    return registry.derived('fields', lambda: FieldIndex(registry.get('registry')))
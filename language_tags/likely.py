@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Add and remove likely subtags (Unicode Technical Standard #35, "Likely Subtags"), for example 'zh-Hant' becomes
+'zh-Hant-TW' and back.
+
+The table ``likely-subtags.json`` is compiled from the CLDR likely subtags by
+:func:`language_tags.data.compile.compile_likely` (see ``update_data_files.sh``). Results are cached, so maximizing
+or minimizing the same tags again is a dictionary lookup.
+"""
+from language_tags import data
+from language_tags.lru import LRUCache
+from language_tags.syntax import format_codes, split_codes
+
+__all__ = ['LikelySubtags', 'likely_subtags']
+
+
+class LikelySubtags:
+    def __init__(self, table, grandfathered=(), cache_size=4096):
+        """
+        The likely subtags of tags.
+
+        :param dict table: lowercase tag (for example 'zh-hant' or 'und-tw') to its lowercase maximized tag.
+        :param grandfathered: the lowercase grandfathered tags, which are kept as they are.
+        :param int cache_size: number of distinct tags of which the results are cached.
+        """
+        self.table = table
+        self.grandfathered = frozenset(grandfathered)
+        self._maximized = LRUCache(cache_size)
+        self._minimized = LRUCache(cache_size)
+
+    def _likely(self, language, script, region):
+        # The language, script and region of the first matching entry, the missing ones are filled in.
+        languages = (language,) if language == 'und' else (language, 'und')
+        for lookup_language in languages:
+            keys = []
+            if script and region:
+                keys.append('%s-%s-%s' % (lookup_language, script, region))
+            if region:
+                keys.append('%s-%s' % (lookup_language, region))
+            if script:
+                keys.append('%s-%s' % (lookup_language, script))
+            if lookup_language == language:
+                keys.append(lookup_language)
+            for key in keys:
+                if key in self.table:
+                    likely_language, _, likely_script, likely_region, _, _, _ = split_codes(
+                        self.table[key].split('-'))
+                    return (likely_language if language == 'und' else language,
+                            script or likely_script, region or likely_region)
+        return language, script, region
+
+    def _split(self, tag):
+        # The codes of a tag split by their syntax, None for tags without a language.
+        codes = tag.split('-')
+        if not tag or len(codes[0]) == 1 or tag in self.grandfathered:
+            return None
+        return split_codes(codes)
+
+    def _join(self, language, extlangs, script, region, variants, extensions, privateuse):
+        codes = [language]
+        codes.extend(extlangs)
+        if script:
+            codes.append(script)
+        if region:
+            codes.append(region)
+        codes.extend(variants)
+        for extension in extensions:
+            codes.extend(extension)
+        codes.extend(privateuse)
+        return format_codes(codes)
+
+    def _maximize(self, tag):
+        parts = self._split(tag)
+        if parts is None:
+            return format_codes(tag.split('-'))
+        language, extlangs, script, region, variants, extensions, privateuse = parts
+        language, script, region = self._likely(language, script, region)
+        return self._join(language, extlangs, script, region, variants, extensions, privateuse)
+
+    def _minimize(self, tag):
+        parts = self._split(tag)
+        if parts is None:
+            return format_codes(tag.split('-'))
+        language, extlangs, script, region, variants, extensions, privateuse = parts
+        maximized = self._likely(language, script, region)
+        language = maximized[0]
+        # The shortest tag with the same maximized form, the language alone is tried first, then with the region.
+        for trial in ((language, None, None), (language, None, maximized[2]), (language, maximized[1], None)):
+            if self._likely(*trial) == maximized:
+                break
+        else:
+            trial = maximized
+        return self._join(trial[0], extlangs, trial[1], trial[2], variants, extensions, privateuse)
+
+    def maximize(self, tag):
+        """
+        Add the likely script and region (and the language of 'und') to a tag. Tags without an entry are kept.
+
+        :param str tag: lowercase (hyphen-separated) tag without surrounding whitespace.
+        :return: formatted maximized tag string.
+        """
+        return self._maximized.get(tag, self._maximize)
+
+    def minimize(self, tag):
+        """
+        Remove the script and region of a tag that are added again by :meth:`maximize`.
+
+        :param str tag: lowercase (hyphen-separated) tag without surrounding whitespace.
+        :return: formatted minimized tag string.
+        """
+        return self._minimized.get(tag, self._minimize)
+
+
+def likely_subtags(registry=None):
+    """
+    Get the :class:`LikelySubtags` of the table of a registry, loading it on first use.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: :class:`LikelySubtags`.
+    """
+    registry = registry or data.current()
+    return registry.derived('likely-subtags', lambda: LikelySubtags(
+        registry.get('likely-subtags'),
+        (tag for tag, types in registry.get('index').items() if 'grandfathered' in types)))
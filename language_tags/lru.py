@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import threading
+from collections import OrderedDict, namedtuple
+
+__all__ = ['LRUCache', 'CacheInfo']
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class LRUCache:
+    def __init__(self, maxsize):
+        """
+        A thread-safe, size-bounded cache that evicts the least recently used values first.
+
+        :param int maxsize: maximum number of values in the cache.
+        :raise ValueError: if maxsize is not a positive number.
+        """
+        if maxsize < 1:
+            raise ValueError('The maximum size of the cache must be at least 1.')
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, create):
+        """
+        Get the value of a key, creating and caching it if it is not cached.
+
+        :param key: hashable key.
+        :param create: function creating the value given the key. It is called without holding the lock.
+        :return: the cached or created value.
+        """
+        with self._lock:
+            if key in self._values:
+                self._values.move_to_end(key)
+                self._hits += 1
+                return self._values[key]
+            self._misses += 1
+
+        value = create(key)
+
+        with self._lock:
+            # Another thread may have created the value in the meantime, keep the first one.
+            value = self._values.setdefault(key, value)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def info(self):
+        """
+        Get the statistics of the cache.
+
+        :return: :class:`CacheInfo` with the number of hits, misses and evictions, the maximum and current size.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._values))
+
+    def clear(self):
+        """
+        Remove all values from the cache and reset its statistics.
+        """
+        with self._lock:
+            self._values.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self):
+        return len(self._values)
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Content negotiation: parse ``Accept-Language`` headers (RFC 7231 section 5.3.5) and match language ranges against
+the available tags of an application with the basic filtering, extended filtering and lookup schemes of RFC 4647::
+
+    locales = Locales(['en', 'en-GB', 'nl-BE', 'fr'])
+    locales.lookup('nl-NL,nl;q=0.9,en;q=0.5', default='en')  # 'nl-BE' is not a lookup match, so 'en'
+    locales.filter('nl, en;q=0.5')  # ['nl-BE', 'en', 'en-GB']
+
+The available tags are compiled once into dictionaries, so matching a request is a few dictionary lookups.
+"""
+import re
+
+from language_tags.lru import LRUCache
+
+__all__ = ['parse_accept_language', 'Locales']
+
+# A basic or extended language range (RFC 4647 section 2), lowercase.
+_RANGE = re.compile(r'(?:\*|[a-z]{1,8})(?:-(?:\*|[a-z0-9]{1,8}))*')
+
+# Parsed headers by header string.
+_header_cache = LRUCache(1024)
+
+
+def _parse(header):
+    ranges = []
+    for item in header.split(','):
+        parameters = item.split(';')
+        language_range = parameters[0].strip().lower()
+        if not _RANGE.fullmatch(language_range):
+            continue
+        quality = 1.0
+        for parameter in parameters[1:]:
+            name, _, value = parameter.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = -1.0
+        if 0 <= quality <= 1:
+            ranges.append((language_range, quality))
+    # The sort is stable, ranges with the same quality keep the order of the header.
+    ranges.sort(key=lambda item: -item[1])
+    return tuple(ranges)
+
+
+def parse_accept_language(header):
+    """
+    Parse an ``Accept-Language`` header, for example 'nl-BE, nl;q=0.9, en;q=0.5, *;q=0.1'. Malformed ranges and
+    quality values are skipped. Recently parsed headers are cached.
+
+    :param str header: the value of the header.
+    :return: tuple of (lowercase language range, float quality) pairs, by descending quality.
+    """
+    return _header_cache.get(header, _parse)
+
+
+def _extended_match(range_subtags, tag_subtags):
+    # Extended filtering (RFC 4647 section 3.3.2).
+    if range_subtags[0] != '*' and range_subtags[0] != tag_subtags[0]:
+        return False
+    i = j = 1
+    while i < len(range_subtags):
+        if range_subtags[i] == '*':
+            i += 1
+        elif j >= len(tag_subtags):
+            return False
+        elif range_subtags[i] == tag_subtags[j]:
+            i += 1
+            j += 1
+        elif len(tag_subtags[j]) == 1:
+            return False
+        else:
+            j += 1
+    return True
+
+
+class Locales:
+    def __init__(self, available):
+        """
+        The tags an application has content for, compiled for matching language ranges.
+
+        :param available: iterable of string (hyphen-separated) tags, in order of preference. Matching is
+            case-insensitive, the matched tags are returned as given.
+        """
+        self.tags = []
+        # Lowercase tag to its position.
+        self.positions = {}
+        # Lowercase prefix of each tag (RFC 4647 section 3.3.1) to the positions of the tags.
+        self.prefixes = {}
+        # First subtag to the positions and subtags of the tags.
+        self.languages = {}
+        for tag in available:
+            key = str(tag).strip().lower()
+            if key in self.positions:
+                continue
+            position = len(self.tags)
+            self.tags.append(tag)
+            self.positions[key] = position
+            subtags = key.split('-')
+            for i in range(1, len(subtags) + 1):
+                self.prefixes.setdefault('-'.join(subtags[:i]), []).append(position)
+            self.languages.setdefault(subtags[0], []).append((position, subtags))
+
+    def _ranges(self, ranges):
+        # The (range, quality) pairs of a header or of an iterable of ranges in order of preference.
+        if isinstance(ranges, str):
+            return parse_accept_language(ranges)
+        return tuple((str(language_range).strip().lower(), 1.0) for language_range in ranges)
+
+    def _filter(self, ranges, match):
+        ranges = self._ranges(ranges)
+        excluded = set()
+        for language_range, quality in ranges:
+            if quality == 0:
+                excluded.update(match(language_range))
+        results = []
+        seen = set(excluded)
+        for language_range, quality in ranges:
+            if quality > 0:
+                for position in match(language_range):
+                    if position not in seen:
+                        seen.add(position)
+                        results.append(self.tags[position])
+        return results
+
+    def _basic(self, language_range):
+        if language_range == '*':
+            return range(len(self.tags))
+        return self.prefixes.get(language_range, ())
+
+    def _extended(self, language_range):
+        range_subtags = language_range.split('-')
+        if range_subtags[0] == '*':
+            candidates = (candidate for candidates in self.languages.values() for candidate in candidates)
+            candidates = sorted(candidates, key=lambda candidate: candidate[0])
+        else:
+            candidates = self.languages.get(range_subtags[0], ())
+        return [position for position, subtags in candidates if _extended_match(range_subtags, subtags)]
+
+    def filter(self, ranges):
+        """
+        Get the available tags matching the language ranges with basic filtering (RFC 4647 section 3.3.1): a tag
+        matches a range when it equals the range or starts with the range followed by '-'. The range '*' matches
+        every tag. Tags matching a range with quality 0 are excluded.
+
+        :param ranges: ``Accept-Language`` header string or iterable of string language ranges in order of
+            preference.
+        :return: list of the matching available tags, by range preference and then available order.
+        """
+        return self._filter(ranges, self._basic)
+
+    def extended_filter(self, ranges):
+        """
+        Get the available tags matching the language ranges with extended filtering (RFC 4647 section 3.3.2):
+        a '*' subtag of a range matches any number of subtags and other subtags may be skipped, so 'de-*-DE' and
+        'de-DE' both match 'de-Latn-DE'. Tags matching a range with quality 0 are excluded.
+
+        :param ranges: ``Accept-Language`` header string or iterable of string language ranges in order of
+            preference.
+        :return: list of the matching available tags, by range preference and then available order.
+        """
+        return self._filter(ranges, self._extended)
+
+    def lookup(self, ranges, default=None):
+        """
+        Get the best available tag for the language ranges with the lookup scheme (RFC 4647 section 3.4): for each
+        range in order of preference, the range and then ever shorter prefixes of it are looked up, for example
+        'zh-Hant-CN-x-private', 'zh-Hant-CN', 'zh-Hant' and 'zh'. Ranges with quality 0 and the range '*' are skipped.
+
+        :param ranges: ``Accept-Language`` header string or iterable of string language ranges in order of
+            preference.
+        :param default: returned when no tag matches.
+        :return: the matching available tag or the default.
+        """
+        positions = self.positions
+        for language_range, quality in self._ranges(ranges):
+            if quality == 0 or language_range == '*':
+                continue
+            subtags = language_range.split('-')
+            while subtags:
+                key = '-'.join(subtags)
+                if key in positions:
+                    return self.tags[positions[key]]
+                del subtags[-1]
+                # Remove a singleton left at the end as well.
+                if subtags and len(subtags[-1]) == 1:
+                    del subtags[-1]
+        return default
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Validate large collections of tags with a pool of processes.
+
+The input is split in chunks that are validated by the worker processes. Only a bounded number of chunks is in
+flight at any time, so inputs of any size are processed as a stream. Each worker loads the registry once, when it
+starts. Workers started with 'fork' share the pages of a registry loaded by the parent process, so load it first
+with :func:`language_tags.data.preload` (or use the 'mapped' backend, see :func:`language_tags.data.set_backend`).
+"""
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+from language_tags import data
+from language_tags.lru import LRUCache
+from language_tags.tags import tags
+
+__all__ = ['validate_parallel']
+
+# Cache of the error codes by normalized tag in a worker process.
+_worker_cache = None
+
+
+def _initialize(backend, json_dir, cache_size):
+    global _worker_cache
+    # Use the registry of the parent process, it may have been reloaded or use another backend.
+    registry = data.current()
+    if registry.backend != backend or registry.json_dir != json_dir:
+        data.reload(json_dir, backend)
+    data.preload()
+    _worker_cache = LRUCache(cache_size)
+
+
+def _validate_chunk(chunk):
+    cache = _worker_cache
+    return [cache.get(str(value).strip().lower(), tags.error_codes) for value in chunk]
+
+
+def _chunks(values, chunksize):
+    values = iter(values)
+    chunk = list(islice(values, chunksize))
+    while chunk:
+        yield chunk
+        chunk = list(islice(values, chunksize))
+
+
+def validate_parallel(values, processes=None, chunksize=1000, ordered=True, cache_size=4096):
+    """
+    Validate a stream of tags with a pool of processes.
+
+    :param values: iterable of string tags. Values must be picklable.
+    :param int processes: number of worker processes, defaults to the number of CPUs.
+    :param int chunksize: number of tags sent to a worker at once. Larger chunks reduce the inter-process
+        communication overhead.
+    :param bool ordered: if True the results are in the order of the input, otherwise in the order in which the
+        chunks are done.
+    :param int cache_size: number of distinct tags of which each worker caches the error codes.
+    :return: generator of (tag, tuple of error codes) pairs.
+    """
+    processes = processes or os.cpu_count() or 1
+    # Keep every worker busy while the results of other chunks are consumed.
+    window = processes * 2
+    # Forked workers inherit the loaded registry instead of loading it again.
+    data.preload()
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_initialize,
+                             initargs=(data.backend, data.current().json_dir, cache_size)) as executor:
+        # The chunks in flight, in order of submission or by future.
+        pending = deque() if ordered else {}
+
+        def done():
+            # Wait for finished chunks and yield their results.
+            if ordered:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+            else:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield from zip(pending.pop(future), future.result())
+
+        for chunk in _chunks(values, chunksize):
+            future = executor.submit(_validate_chunk, chunk)
+            if ordered:
+                pending.append((chunk, future))
+            else:
+                pending[future] = chunk
+            while len(pending) >= window:
+                yield from done()
+        while pending:
+            yield from done()
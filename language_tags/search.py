@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Indexes over the codes and descriptions of the registry records, used by :func:`language_tags.tags.tags.search`
+and :func:`language_tags.tags.tags.autocomplete`.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+
+from language_tags import data
+
+__all__ = ['SearchIndex', 'AutocompleteIndex', 'search_index', 'autocomplete_index']
+
+# The ways a query can match, in the default order of ranking.
+MATCHES = ('exact', 'prefix', 'substring')
+
+# Length of the substrings in the inverted index.
+GRAM = 3
+
+
+class SearchIndex:
+    def __init__(self, registry):
+        """
+        An inverted index from the substrings of length :data:`GRAM` of the case folded descriptions to the
+        positions of the registry records containing them. Substring queries look up the records containing all
+        substrings of the query and only check those.
+
+        :param registry: the registry records.
+        """
+        # Per registry position: the descriptions joined as searched, the lengths of the descriptions (to rank
+        # matches) and whether the record is a subtag (as opposed to a grandfathered or redundant tag).
+        self.descriptions = []
+        self.lowercase = []
+        self.lengths = []
+        self.subtags = []
+        grams = {}
+        for position, record in enumerate(registry):
+            description = ', '.join(record['Description'])
+            self.descriptions.append(description)
+            self.lowercase.append(description.lower())
+            self.lengths.append(tuple(len(item) for item in record['Description']))
+            self.subtags.append('Subtag' in record)
+            folded = description.casefold()
+            for gram in {folded[i:i + GRAM] for i in range(len(folded) - GRAM + 1)}:
+                grams.setdefault(gram, []).append(position)
+        # Positions fit in unsigned shorts, compact arrays take far less memory than lists or sets of ints.
+        typecode = 'H' if len(self.descriptions) < 2 ** 16 else 'I'
+        self.grams = {gram: array(typecode, positions) for gram, positions in grams.items()}
+
+    def candidates(self, query):
+        """
+        Get the positions of the records which descriptions may contain the query.
+
+        :param str query: the query.
+        :return: ascending positions. Records without the query can be included.
+        """
+        folded = query.casefold()
+        if len(folded) < GRAM:
+            return range(len(self.descriptions))
+        postings = []
+        for gram in {folded[i:i + GRAM] for i in range(len(folded) - GRAM + 1)}:
+            if gram not in self.grams:
+                return []
+            postings.append(self.grams[gram])
+        postings.sort(key=len)
+        positions = set(postings[0])
+        for posting in postings[1:]:
+            positions.intersection_update(posting)
+            if not positions:
+                break
+        return sorted(positions)
+
+    def distance(self, position, query):
+        """
+        Get the rank of a match: the smallest difference between the length of a description and the query.
+
+        :param int position: position of the registry record.
+        :param str query: the query.
+        :return: int -- the rank, lower is better.
+        """
+        return min(abs(length - len(query)) for length in self.lengths[position])
+
+
+class AutocompleteIndex:
+    def __init__(self, registry, search):
+        """
+        Sorted arrays of the lowercase codes (subtags, grandfathered and redundant tags) and descriptions of the
+        registry records, with the registry position of each. The codes and descriptions starting with a query are
+        a contiguous range of an array, found with a binary search.
+
+        :param registry: the registry records.
+        :param search: the :class:`SearchIndex` of the registry, used for substring matches.
+        """
+        codes = sorted((record['Subtag' if 'Subtag' in record else 'Tag'].lower(), position)
+                       for position, record in enumerate(registry))
+        descriptions = sorted((description.lower(), position)
+                              for position, record in enumerate(registry) for description in record['Description'])
+        typecode = 'H' if len(registry) < 2 ** 16 else 'I'
+        self.codes = [code for code, _ in codes]
+        self.code_positions = array(typecode, [position for _, position in codes])
+        self.descriptions = [description for description, _ in descriptions]
+        self.description_positions = array(typecode, [position for _, position in descriptions])
+        self.search = search
+
+    def matches(self, match, query):
+        """
+        Get the positions of the records matching a query, codes before descriptions.
+
+        :param str match: 'exact', 'prefix' (shortest codes and descriptions first) or 'substring' of the descriptions
+            (ranked like :func:`language_tags.tags.tags.search`).
+        :param str query: lowercase query.
+        :return: iterable of positions, a position can occur more than once.
+        :raise ValueError: if the match does not exist.
+        """
+        if match == 'exact':
+            return self._positions(query, prefix=False)
+        if match == 'prefix':
+            return self._positions(query, prefix=True)
+        if match == 'substring':
+            search = self.search
+            positions = [position for position in search.candidates(query) if query in search.lowercase[position]]
+            return sorted(positions, key=lambda position: search.distance(position, query))
+        raise ValueError('\'%s\' is not a match, use one of %s.' % (match, ', '.join(MATCHES)))
+
+    def _positions(self, query, prefix):
+        for keys, positions in ((self.codes, self.code_positions),
+                                (self.descriptions, self.description_positions)):
+            start = bisect_left(keys, query)
+            if prefix:
+                # Every string starting with the query sorts before the query followed by the highest character.
+                end = bisect_left(keys, query + '\U0010ffff')
+                # Rank shorter completions first, the sort is stable so equal lengths stay in alphabetical order.
+                for i in sorted(range(start, end), key=lambda i: len(keys[i])):
+                    yield positions[i]
+            else:
+                yield from positions[start:bisect_right(keys, query)]
+
+
+def search_index(registry=None):
+    """
+    Get the :class:`SearchIndex` of a registry, building it on first use.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: :class:`SearchIndex`.
+    """
+    registry = registry or data.current()
+    return registry.derived('search', lambda: SearchIndex(registry.get('registry')))
+
+
+def autocomplete_index(registry=None):
+    """
+    Get the :class:`AutocompleteIndex` of a registry, building it on first use.
+
+    :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+    :return: :class:`AutocompleteIndex`.
+    """
+    registry = registry or data.current()
+    return registry.derived('autocomplete', lambda: AutocompleteIndex(registry.get('registry'),
+                                                                      search_index(registry)))
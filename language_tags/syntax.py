@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+The syntax of tags (RFC 5646 section 2.1) as a compiled regular expression.
+
+Checking the syntax needs no registry lookups, so malformed tags are rejected before the registry is consulted.
+"""
+import re
+
+__all__ = ['WELL_FORMED', 'SUBTAG_CODES', 'well_formed', 'split_codes', 'format_codes']
+
+_LANGTAG = (
+    # language: 2-3 letters with up to three extlangs, or 4-8 letters
+    '(?:[a-z]{2,3}(?:-[a-z]{3}){0,3}|[a-z]{4,8})'
+    # script
+    '(?:-[a-z]{4})?'
+    # region
+    '(?:-(?:[a-z]{2}|[0-9]{3}))?'
+    # variants
+    '(?:-(?:[a-z0-9]{5,8}|[0-9][a-z0-9]{3}))*'
+    # extensions: a singleton other than 'x' with one or more subtags
+    '(?:-[0-9a-wyz](?:-[a-z0-9]{2,8})+)*'
+    # private use
+    '(?:-x(?:-[a-z0-9]{1,8})+)?'
+)
+
+_PRIVATEUSE = 'x(?:-[a-z0-9]{1,8})+'
+
+# The grandfathered tags that do not match the syntax of other tags (RFC 5646 section 2.2.8).
+_IRREGULAR = ('en-gb-oed', 'i-ami', 'i-bnn', 'i-default', 'i-enochian', 'i-hak', 'i-klingon', 'i-lux', 'i-mingo',
+              'i-navajo', 'i-pwn', 'i-tao', 'i-tay', 'i-tsu', 'sgn-be-fr', 'sgn-be-nl', 'sgn-ch-de')
+
+# Matches a well-formed lowercase tag, use with fullmatch.
+WELL_FORMED = re.compile('%s|%s|%s' % (_LANGTAG, _PRIVATEUSE, '|'.join(_IRREGULAR)))
+
+# Matches a lowercase tag of which every code could be a subtag: 2 to 8 letters or digits up to the first singleton,
+# any letters or digits after it. Tags that do not match are garbage, use with fullmatch.
+SUBTAG_CODES = re.compile('(?:[a-z0-9]{2,8}(?:-[a-z0-9]{2,8})*(?:-[a-z0-9](?:-[a-z0-9]+)*)?|[a-z0-9](?:-[a-z0-9]+)*)?')
+
+
+def well_formed(tag):
+    """
+    Check if a tag is well-formed: it matches the syntax of RFC 5646 section 2.1, whether or not its subtags are
+    in the registry.
+
+    :param str tag: lowercase (hyphen-separated) tag without surrounding whitespace.
+    :return: bool -- True if well-formed.
+    """
+    return WELL_FORMED.fullmatch(tag) is not None
+
+
+def split_codes(codes):
+    """
+    Split the lowercase codes of a tag that starts with a language by their syntax (RFC 5646 section 2.1), without
+    registry lookups. Codes that do not fit the syntax are kept as variants.
+
+    :param codes: list of lowercase codes.
+    :return: tuple of the language, the list of extlangs, the script (or None), the region (or None), the list of
+        variants, the list of extensions (each a list of the singleton and its subtags) and the list of private use
+        codes starting with 'x'. Malformed codes are kept, so the tags can be joined again.
+    """
+    count = len(codes)
+    i = 1
+    extlangs = []
+    while i < count and len(codes[i]) == 3 and codes[i].isalpha():
+        extlangs.append(codes[i])
+        i += 1
+    script = region = None
+    if i < count and len(codes[i]) == 4 and codes[i].isalpha():
+        script = codes[i]
+        i += 1
+    if i < count and (len(codes[i]) == 2 and codes[i].isalpha() or len(codes[i]) == 3 and codes[i].isdigit()):
+        region = codes[i]
+        i += 1
+    variants = []
+    while i < count and len(codes[i]) > 1:
+        variants.append(codes[i])
+        i += 1
+    extensions = []
+    privateuse = []
+    for j in range(i, count):
+        if codes[j] == 'x':
+            privateuse = codes[j:]
+            break
+        if len(codes[j]) == 1 or not extensions:
+            extensions.append([codes[j]])
+        else:
+            extensions[-1].append(codes[j])
+    return codes[0], extlangs, script, region, variants, extensions, privateuse
+
+
+def format_codes(codes):
+    """
+    Format lowercase codes according to the algorithm defined in RFC 5646 section 2.1.1, like
+    :attr:`language_tags.Tag.Tag.format`.
+
+    :param codes: list of lowercase codes.
+    :return: formatted tag string.
+    """
+    formatted = [codes[0]]
+    extension = False
+    for code in codes[1:]:
+        if extension or len(formatted[-1]) == 1:
+            extension = True
+        elif len(code) == 2:
+            code = code.upper()
+        elif len(code) == 4:
+            code = code.capitalize()
+        formatted.append(code)
+    return '-'.join(formatted)
@@ -1,44 +1,207 @@
 # -*- coding: utf-8 -*-
+import heapq
+from itertools import islice
+
 from language_tags.Subtag import Subtag
 from language_tags.Tag import Tag
 from language_tags import data
 
 
-index = data.get('index')
-registry = data.get('registry')
+# The module level 'index' and 'registry', kept for backwards compatibility.
+__getattr__ = data.module_getattr(__name__)
+
+
+# Cache of Tag objects by registry version and normalized tag string, None when caching is disabled.
+_tag_cache = None
+
+
+def _normalize(tag):
+    # Normalize a tag for use as a key, like Tag does. Byte strings (for example from NumPy 'S' arrays) are decoded.
+    if isinstance(tag, bytes):
+        tag = tag.decode('utf-8')
+    return str(tag).strip().lower()
+
+
+def _result(record, registry):
+    # The subtag or tag of a registry record.
+    return Subtag(record['Subtag'], record['Type'], registry) if 'Subtag' in record else Tag(record['Tag'], registry)
+
+
+def _batch(values, result, registry):
+    # Compute the result of each distinct tag once and align the results to the input.
+    results = {}
+    aligned = []
+    for value in values:
+        key = _normalize(value)
+        if key not in results:
+            results[key] = result(key, registry)
+        aligned.append(results[key])
+    return aligned
 
 
 class tags():
 
     @staticmethod
-    def tag(tag):
+    def tag(tag, registry=None):
         """
         Get a :class:`language_tags.Tag.Tag` of a string (hyphen-separated) tag.
 
+        When the cache is enabled (see :func:`tags.enable_cache`) the same :class:`language_tags.Tag.Tag` is returned
+        for equal tags of the same registry.
+
         :param str tag: (hyphen-separated) tag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: :class:`language_tags.Tag.Tag`.
         """
-        return Tag(tag)
+        registry = registry or data.current()
+        cache = _tag_cache
+        if cache is None:
+            return Tag(tag, registry)
+        return cache.get((registry.version, str(tag).strip().lower()), lambda key: Tag(key[1], registry))
 
     @staticmethod
-    def check(tag):
+    def enable_cache(maxsize=1024):
+        """
+        Cache the :class:`language_tags.Tag.Tag` objects, including their subtags and errors, of the most recently
+        used tags. The cache is used by :func:`tags.tag`, :func:`tags.check` and :func:`tags.description` and is
+        thread-safe. Enabling the cache again replaces it.
+
+        :param int maxsize: maximum number of cached tags.
+        :raise ValueError: if maxsize is not a positive number.
+        """
+        global _tag_cache
+        from language_tags.lru import LRUCache
+        _tag_cache = LRUCache(maxsize)
+
+    @staticmethod
+    def disable_cache():
+        """
+        Disable and remove the cache of tags.
+        """
+        global _tag_cache
+        _tag_cache = None
+
+    @staticmethod
+    def cache_info():
+        """
+        Get the statistics of the cache of tags.
+
+        :return: :class:`language_tags.lru.CacheInfo` with the number of hits, misses and evictions, the maximum
+            and current size. None if the cache is disabled.
+        """
+        cache = _tag_cache
+        return cache.info() if cache is not None else None
+
+    @staticmethod
+    def cache_clear():
+        """
+        Clear the cache of tags and its statistics. The cache is cleared when the registry is reloaded (see
+        :func:`language_tags.data.reload`).
+        """
+        cache = _tag_cache
+        if cache is not None:
+            cache.clear()
+
+    @staticmethod
+    def check(tag, registry=None):
         """
         Check if a string (hyphen-separated) tag is valid.
 
         :param str tag: (hyphen-separated) tag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: bool -- True if valid.
         """
-        return Tag(tag).valid
+        return tags.tag(tag, registry).valid
+
+    @staticmethod
+    def error_codes(tag, registry=None):
+        """
+        Get the error codes of a string (hyphen-separated) tag.
+
+        :param str tag: (hyphen-separated) tag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+        :return: tuple of error codes (see :func:`language_tags.Tag.Tag.error`), empty if the tag is valid.
+        """
+        return tuple(error.code for error in tags.tag(tag, registry).errors)
 
     @staticmethod
-    def types(subtag):
+    def well_formed(tag):
+        """
+        Check if a string (hyphen-separated) tag is well-formed: it matches the syntax of RFC 5646 section 2.1.
+        The registry is not used, so a well-formed tag can still be invalid (for example 'xx-YY').
+
+        :param str tag: (hyphen-separated) tag.
+        :return: bool -- True if well-formed.
+        """
+        from language_tags.syntax import well_formed
+        return well_formed(_normalize(tag))
+
+    @staticmethod
+    def check_many(values, registry=None):
+        """
+        Check if each string (hyphen-separated) tag of a collection is valid. Each distinct tag is validated once.
+
+        :param values: iterable of string (hyphen-separated) tags, for example a list, a generator or a NumPy array
+            of strings.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+        :return: list of bool -- True if valid, in the order of the input.
+        """
+        return _batch(values, tags.check, registry)
+
+    @staticmethod
+    def validate_batch(values, registry=None):
+        """
+        Get the error codes of each string (hyphen-separated) tag of a collection. Each distinct tag is validated
+        once.
+
+        :param values: iterable of string (hyphen-separated) tags, for example a list, a generator or a NumPy array
+            of strings.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+        :return: list of tuples of error codes (see :func:`language_tags.Tag.Tag.error`), in the order of the input.
+            The tuple of a valid tag is empty.
+        """
+        return _batch(values, tags.error_codes, registry)
+
+    @staticmethod
+    def canonicalize(tag, extlang=False, registry=None):
+        """
+        Get the canonical form of a string (hyphen-separated) tag or of each tag of a collection (see RFC 5646
+        section 4.5): grandfathered, redundant and deprecated (sub)tags are replaced by their preferred value, a
+        script that is the suppress-script of the language is removed and extensions are ordered by singleton.
+        For example 'iw-Hebr-IL' becomes 'he-IL' and 'zh-yue' becomes 'yue'.
+
+        :param tag: string (hyphen-separated) tag or iterable of string tags, for example a list or a NumPy array
+            of strings.
+        :param extlang: If set on True tags are converted to extlang form, for example 'zh-yue' instead of 'yue'.
+        :type extlang: bool, optional
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+        :return: formatted canonical tag string, or list of formatted canonical tag strings in the order of the
+            input.
+        """
+        from language_tags.canonical import canonical_map
+        canonicalize = canonical_map(registry).canonicalize
+        if isinstance(tag, (str, bytes)):
+            return canonicalize(_normalize(tag), extlang)
+        results = {}
+        aligned = []
+        for value in tag:
+            key = _normalize(value)
+            if key not in results:
+                results[key] = canonicalize(key, extlang)
+            aligned.append(results[key])
+        return aligned
+
+    @staticmethod
+    def types(subtag, registry=None):
         """
         Get the types of a subtag string (excludes redundant and grandfathered).
 
 
         :param str subtag: subtag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: list of types. The return list can be empty.
         """
+        index = (registry or data.current()).get('index')
         if subtag in index:
             types = index[subtag]
             return [type for type in types.keys() if type != 'redundant' or type != 'grandfathered']
@@ -46,38 +209,41 @@ class tags():
             return []
 
     @staticmethod
-    def subtags(subtags):
+    def subtags(subtags, registry=None):
         """
         Get a list of existing :class:`language_tags.Subtag.Subtag` objects given the input subtag(s).
 
         :param subtags: string subtag or list of string subtags.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: a list of existing :class:`language_tags.Subtag.Subtag` objects. The return list can be empty.
         """
+        registry = registry or data.current()
         result = []
 
         if not isinstance(subtags, list):
             subtags = [subtags]
 
         for subtag in subtags:
-            for type in tags.types(subtag):
-                result.append(Subtag(subtag, type))
+            for type in tags.types(subtag, registry):
+                result.append(Subtag(subtag, type, registry))
 
         return result
 
     @staticmethod
-    def filter(subtags):
+    def filter(subtags, registry=None):
         """
         Get a list of non-existing string subtag(s) given the input string subtag(s).
 
         :param subtags: string subtag or a list of string subtags.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: list of non-existing string subtags. The return list can be empty.
         """
         if not isinstance(subtags, list):
             subtags = [subtags]
-        return [subtag for subtag in subtags if len(tags.types(subtag)) == 0]
+        return [subtag for subtag in subtags if len(tags.types(subtag, registry)) == 0]
 
     @staticmethod
-    def search(description, all=False):
+    def search(description, all=False, limit=None, registry=None):
         """
         Gets a list of :class:`language_tags.Subtag.Subtag` objects where the description matches.
 
@@ -88,38 +254,89 @@ class tags():
         :param all: If set on True grandfathered and redundant tags will be included in the return
             list.
         :type all: bool, optional
+        :param limit: maximum number of results, the best matches are returned.
+        :type limit: int, optional
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: list of :class:`language_tags.Subtag.Subtag` objects each including the description.
             The return list can be empty.
         """
+        registry = registry or data.current()
+        from language_tags.search import search_index
+        index = search_index(registry)
 
         # If the input query is all lowercase, make a case-insensitive match.
         if isinstance(description, str):
-            list_to_string = lambda l: ', '.join(l).lower() if description.lower() == description else ', '.join(l)
+            descriptions = index.lowercase if description.lower() == description else index.descriptions
+            positions = [position for position in index.candidates(description)
+                         if (all or index.subtags[position]) and description in descriptions[position]]
 
-            def test(record):
-                return description in list_to_string(record['Description'])
+            # Sort by matched description string length. This is a quick way to push precise matches towards the top.
+            # Both sorts are stable, so matches with the same rank keep the order of the registry.
+            rank = lambda position: index.distance(position, description)
+            positions = sorted(positions, key=rank) if limit is None else heapq.nsmallest(limit, positions, key=rank)
 
         elif hasattr(description.search, '__call__'):
-            def test(record):
-                return description.search(', '.join(record['Description'])) is not None
+            positions = (position for position in range(len(index.descriptions))
+                         if (all or index.subtags[position]) and description.search(index.descriptions[position]))
+            positions = islice(positions, limit)
 
-        records = filter(lambda r: False if ('Subtag' not in r and not all) else test(r), registry)
-        records = list(records)
-        # Sort by matched description string length. This is a quick way to push precise matches towards the top.
-        results = sorted(records, key=lambda r: min([abs(len(r_description) - len(description))
-                                                    for r_description in r['Description']])) \
-            if isinstance(description, str) else records
-        return [Subtag(r['Subtag'], r['Type']) if 'Subtag' in r else Tag(['Tag']) for r in results]
+        records = registry.get('registry')
+        return [_result(records[position], registry) for position in positions]
 
     @staticmethod
-    def description(tag):
+    def autocomplete(query, limit=10, match=('exact', 'prefix', 'substring'), deprecated=True, all=True,
+                     registry=None):
+        """
+        Gets a list of :class:`language_tags.Subtag.Subtag` (and :class:`language_tags.Tag.Tag`) objects of which
+        the code or a description matches the beginning of a query, for example 'zh-Ha' or 'Port'.
+        The comparison is case-insensitive.
+
+        :param str query: the (partial) code or description.
+        :param limit: maximum number of results.
+        :type limit: int, optional
+        :param match: the ways the query matches, in order of ranking: 'exact' (code or description equals the
+            query), 'prefix' (code or description starts with the query) and 'substring' (a description contains
+            the query). Within a match codes rank before descriptions.
+        :type match: list or tuple, optional
+        :param deprecated: If set on False deprecated subtags and tags are excluded.
+        :type deprecated: bool, optional
+        :param all: If set on False grandfathered and redundant tags are excluded.
+        :type all: bool, optional
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+        :return: list of :class:`language_tags.Subtag.Subtag` and :class:`language_tags.Tag.Tag` objects, each
+            included once. The return list can be empty.
+        :raise ValueError: if a match does not exist.
+        """
+        query = str(query).strip().lower()
+        results = []
+        if not query or limit == 0:
+            return results
+        registry = registry or data.current()
+        from language_tags.search import autocomplete_index
+        index = autocomplete_index(registry)
+        records = registry.get('registry')
+        seen = set()
+        for position in (position for way in match for position in index.matches(way, query)):
+            if position in seen:
+                continue
+            seen.add(position)
+            record = records[position]
+            if (all or 'Subtag' in record) and (deprecated or 'Deprecated' not in record):
+                results.append(_result(record, registry))
+                if len(results) == limit:
+                    break
+        return results
+
+    @staticmethod
+    def description(tag, registry=None):
         """
         Gets a list of descriptions given the tag.
 
         :param str tag: (hyphen-separated) tag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: list of string descriptions. The return list can be empty.
         """
-        tag_object = Tag(tag)
+        tag_object = tags.tag(tag, registry)
         results = []
         results.extend(tag_object.descriptions)
         subtags = tag_object.subtags
@@ -129,70 +346,117 @@ class tags():
         return results
 
     @staticmethod
-    def languages(macrolanguage):
+    def languages(macrolanguage, registry=None):
         """
         Get a list of :class:`language_tags.Subtag.Subtag` objects given the string macrolanguage.
 
         :param string macrolanguage: subtag macrolanguage.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: a list of the macrolanguage :class:`language_tags.Subtag.Subtag` objects.
         :raise Exception: if the macrolanguage does not exists.
         """
-        results = []
-
         macrolanguage = macrolanguage.lower()
-        macrolanguage_data = data.get('macrolanguage')
+        registry = registry or data.current()
+        macrolanguage_data = registry.get('macrolanguage')
         if macrolanguage not in macrolanguage_data:
             raise Exception('\'' + macrolanguage + '\' is not a macrolanguage.')
-        for registry_item in registry:
-            record = registry_item
-            if 'Macrolanguage' in record:
-                if record['Macrolanguage'] == macrolanguage:
-                    results.append(Subtag(record['Subtag'], record['Type']))
 
-        return results
+        from language_tags.indexes import macrolanguage_members
+        return list(macrolanguage_members(registry).get(macrolanguage, ()))
+
+    @staticmethod
+    def query(type=None, scope=None, deprecated=None, preferred_value=None, suppress_script=None,
+              macrolanguage=None, added_after=None, added_before=None, registry=None):
+        """
+        Get the subtags and tags of the registry matching all given criteria, for example
+        ``query(type='region', deprecated=True)`` or ``query(scope='collection', added_after='2020-01-01')``.
+
+        :param str type: type of the record: 'language', 'extlang', 'script', 'region', 'variant', 'grandfathered'
+            or 'redundant'.
+        :param str scope: scope of the record: 'macrolanguage', 'collection', 'special' or 'private-use'.
+        :param bool deprecated: True for deprecated records only, False for records that are not deprecated.
+        :param preferred_value: a preferred value or True for records with a preferred value, False for records
+            without.
+        :type preferred_value: str or bool
+        :param suppress_script: a suppress-script or True for records with a suppress-script, False for records
+            without.
+        :type suppress_script: str or bool
+        :param macrolanguage: a macrolanguage or True for records with a macrolanguage, False for records without.
+        :type macrolanguage: str or bool
+        :param added_after: only records added after this date, a string such as '2020-01-01' or a date.
+        :param added_before: only records added before this date, a string such as '2020-01-01' or a date.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
+        :return: list of :class:`language_tags.Subtag.Subtag` and :class:`language_tags.Tag.Tag` objects in
+            registry order. The return list can be empty.
+        """
+        registry = registry or data.current()
+        from language_tags.indexes import field_index, positions
+        index = field_index(registry)
+        bits = index.all
+        for field, value in (('Type', type), ('Scope', scope), ('Preferred-Value', preferred_value),
+                             ('Suppress-Script', suppress_script), ('Macrolanguage', macrolanguage)):
+            if value is not None:
+                bits &= index.value(field, value)
+        if deprecated is not None:
+            bits &= index.value('Deprecated', bool(deprecated))
+        if added_after is not None or added_before is not None:
+            bits &= index.added(str(added_after) if added_after is not None else None,
+                                str(added_before) if added_before is not None else None)
+
+        records = registry.get('registry')
+        return [_result(records[position], registry) for position in positions(bits)]
 
     @staticmethod
-    def type(subtag, type):
+    def type(subtag, type, registry=None):
         """
         Get a :class:`language_tags.Subtag.Subtag` by subtag and type. Can be None if not exists.
 
         :param str subtag: subtag.
         :param str type: type of the subtag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: :class:`language_tags.Subtag.Subtag` if exists, otherwise None.
         """
+        registry = registry or data.current()
         subtag = subtag.lower()
+        index = registry.get('index')
         if subtag in index:
             types = index[subtag]
             if type in types:
-                return Subtag(subtag, type)
+                return Subtag(subtag, type, registry)
         return None
 
     @staticmethod
-    def language(subtag):
+    def language(subtag, registry=None):
         """
         Get a language :class:`language_tags.Subtag.Subtag` of the subtag string.
 
         :param str subtag: subtag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: language :class:`language_tags.Subtag.Subtag` if exists, otherwise None.
         """
-        return tags.type(subtag, 'language')
+        return tags.type(subtag, 'language', registry)
 
     @staticmethod
-    def region(subtag):
+    def region(subtag, registry=None):
         """
         Get a region :class:`language_tags.Subtag.Subtag` of the subtag string.
 
         :param str subtag: subtag.
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: region :class:`language_tags.Subtag.Subtag` if exists, otherwise None.
         """
-        return tags.type(subtag, 'region')
+        return tags.type(subtag, 'region', registry)
 
     @staticmethod
-    def date():
+    def date(registry=None):
         """
         Get the file date of the underlying data as a string.
 
+        :param registry: the :class:`language_tags.data.registry.Registry`, defaults to the current registry.
         :return: date as string (for example: '2014-03-27').
         """
-        meta = data.get('meta')
-        return meta['File-Date']
+        return (registry or data.current()).file_date
+
+
+# Tags cached for a previous version of the registry are never used again.
+data.on_swap(tags.cache_clear)
@@ -38,5 +38,13 @@ setup(
     platforms='any',
     packages=packages,
     include_package_data=True,
-    install_requires=requires
+    install_requires=requires,
+    extras_require={
+        'columnar': ['numpy', 'pandas', 'pyarrow'],
+    },
+    entry_points={
+        'console_scripts': [
+            'language-tags = language_tags.cli:main',
+        ],
+    }
 )
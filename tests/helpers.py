@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers shared by the tests.
+"""
+import io
+import json
+import os
+import shutil
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import mock
+
+from language_tags import cli, data
+from language_tags.data.ingest import build
+
+
+def new_version(directory, edits, added=(), file_date='2100-01-01'):
+    """
+    Write the JSON data files of a new version of the bundled registry.
+
+    :param str directory: directory in which the JSON directory 'json' is created.
+    :param dict edits: (code, type) of a bundled record to the fields changed in the new version, None to remove
+        the record. For example ``{('nl', 'language'): {'Deprecated': '2100-01-01'}, ('fonipa', 'variant'): None}``.
+    :param added: records added at the end of the registry.
+    :param str file_date: the ``File-Date`` of the new version.
+    :return: str -- the JSON directory.
+    """
+    index = data.get('index')
+    records = [dict(record) for record in data.get('registry')]
+    removed = set()
+    for (code, type), fields in edits.items():
+        position = index[code][type]
+        if fields is None:
+            removed.add(position)
+        else:
+            records[position].update(fields)
+    records = [record for position, record in enumerate(records) if position not in removed] + list(added)
+
+    json_dir = os.path.join(directory, 'json')
+    os.makedirs(json_dir)
+    shutil.copy(os.path.join(data.parent_dir, data.data_dir, 'likely-subtags.json'), json_dir)
+    for name, value in build([{'File-Date': file_date}] + records).items():
+        with open(os.path.join(json_dir, '%s.json' % name), 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+    return json_dir
+
+
+def run_cli(*argv, stdin=''):
+    """
+    Run the command line interface with a standard input and capture its output.
+
+    :return: (exit status, standard output) tuple.
+    """
+    output = io.StringIO()
+    with mock.patch('sys.stdin', io.StringIO(stdin)), redirect_stdout(output), redirect_stderr(io.StringIO()):
+        status = cli.main(list(argv))
+    return status, output.getvalue()
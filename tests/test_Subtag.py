@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
+import pickle
 import unittest
+from language_tags import tags
 from language_tags.Subtag import Subtag
 
 
@@ -113,4 +115,50 @@ class TestSubtag(unittest.TestCase):
         self.assertRaises(Exception, Subtag, 'nl', 'variant')
         with self.assertRaises(Exception) as context:
             Subtag('nl', 'variant')
-        self.assertIn('Non-existent subtag nl of type variant.', context.exception.message)
\ No newline at end of file
+        self.assertIn('Non-existent subtag nl of type variant.', context.exception.message)
+        with self.assertRaises(Subtag.Error) as context:
+            Subtag('nl', 'variant')
+        self.assertEqual(context.exception.code, Subtag.ERR_NONEXISTENT)
+
+    def test_macrolanguage(self):
+        self.assertEqual(Subtag('cmn', 'language').macrolanguage, Subtag('zh', 'language'))
+        self.assertEqual(Subtag('yue', 'extlang').macrolanguage, Subtag('zh', 'language'))
+        self.assertIsNone(Subtag('nl', 'language').macrolanguage)
+
+    def test_members(self):
+        members = Subtag('zh', 'language').members
+        self.assertIsInstance(members, tuple)
+        self.assertIn(Subtag('cmn', 'language'), members)
+        self.assertIn(Subtag('yue', 'extlang'), members)
+        self.assertIs(members, Subtag('zh', 'language').members)
+        self.assertEqual(Subtag('nl', 'language').members, ())
+        self.assertEqual(Subtag('CN', 'region').members, ())
+
+    def test_shared_instances(self):
+        subtag = Subtag('nl', 'language')
+        self.assertIs(subtag, Subtag('NL', 'language'))
+        self.assertIs(subtag, Subtag('nl', 'Language'))
+        self.assertIsNot(subtag, Subtag('nl', 'region'))
+        self.assertIs(tags.language('nl'), subtag)
+        self.assertIs(tags.tag('nl-BE').language, subtag)
+        self.assertIn(subtag, tags.subtags('nl'))
+
+    def test_immutable(self):
+        subtag = Subtag('nl', 'language')
+        with self.assertRaises(AttributeError):
+            subtag.type = 'region'
+        with self.assertRaises(AttributeError):
+            subtag.whatever = 1
+        with self.assertRaises(AttributeError):
+            del subtag._type
+        self.assertEqual(subtag.type, 'language')
+
+    def test_pickle(self):
+        subtag = Subtag('BE', 'region')
+        self.assertIs(pickle.loads(pickle.dumps(subtag)), subtag)
+
+    def test_data(self):
+        subtag = Subtag('BE', 'region')
+        self.assertEqual(subtag.data['subtag'], 'be')
+        self.assertEqual(subtag.data['type'], 'region')
+        self.assertEqual(subtag.data['record']['Description'], ['Belgium'])
@@ -232,7 +232,7 @@ class TestTag(unittest.TestCase):
         self.assertEqual(err.message, 'Extra script subtag \'Cyrl\' found.')
 
     def test_errors_multiple_extlang_subtags(self):
-        tag = Tag('en-asp-bog')
+        tag = Tag('sgn-asp-bog')
         errs = tag.errors
         self.assertEqual(len(errs), 1)
         err = errs[0]
@@ -257,7 +257,73 @@ class TestTag(unittest.TestCase):
         self.assertEqual(len(errs), 1)
         err = errs[0]
         self.assertEqual(err.code, tag.ERR_TOO_LONG)
-        self.assertEqual(err.message, 'The private-use subtag \'morethaneightchars\' is too long.')
+        self.assertEqual(err.message, 'The extension or private-use subtag \'morethaneightchars\' is too long.')
+
+        errs = Tag('en-a-morethaneightchars').errors
+        self.assertEqual([err.code for err in errs], [tag.ERR_TOO_LONG])
+        self.assertEqual(errs[0].message, 'The extension or private-use subtag \'morethaneightchars\' is too long.')
+
+    def test_errors_prefix(self):
+        tag = Tag('en-1996')
+        errs = tag.errors
+        self.assertEqual(len(errs), 1)
+        err = errs[0]
+        self.assertEqual(err.code, tag.ERR_PREFIX)
+        self.assertEqual(err.message, 'The variant subtag \'1996\' requires one of the prefixes \'de\'.')
+        self.assertEqual([err.code for err in Tag('fr-valencia').errors], [tag.ERR_PREFIX])
+        self.assertEqual([err.code for err in Tag('sl-biske').errors], [tag.ERR_PREFIX])
+        self.assertEqual([err.code for err in Tag('en-yue').errors], [tag.ERR_PREFIX])
+        self.assertTrue(Tag('de-CH-1996').valid)
+        self.assertTrue(Tag('ca-valencia').valid)
+        self.assertTrue(Tag('sl-IT-rozaj-biske-1994').valid)
+        self.assertTrue(Tag('sgn-ase').valid)
+
+    def test_errors_malformed(self):
+        tag = Tag('en-US!')
+        errs = tag.errors
+        self.assertEqual(len(errs), 1)
+        err = errs[0]
+        self.assertEqual(err.code, tag.ERR_MALFORMED)
+        self.assertEqual(err.message, 'The tag \'en-us!\' is not well-formed.')
+        for malformed in ('en--US', 'en-', '-en', 'français', 'en-verylongsubtag', 'en_US'):
+            self.assertEqual([err.code for err in Tag(malformed).errors], [tag.ERR_MALFORMED], malformed)
+        self.assertEqual([err.code for err in Tag('en-GB-GB').errors], [tag.ERR_EXTRA_REGION])
+        self.assertEqual([err.code for err in Tag('').errors], [tag.ERR_NO_LANGUAGE])
+
+    def test_errors_duplicate_singleton(self):
+        tag = Tag('de-u-co-phonebk-t-en-u-ca-gregory')
+        errs = tag.errors
+        self.assertEqual(len(errs), 1)
+        err = errs[0]
+        self.assertEqual(err.code, tag.ERR_DUPLICATE_SINGLETON)
+        self.assertEqual(err.message, 'Duplicate singleton \'u\' found.')
+        self.assertTrue(Tag('de-u-co-phonebk-x-u-foo').valid)
+
+    def test_errors_empty_extension(self):
+        tag = Tag('de-a-u-co-phonebk')
+        errs = tag.errors
+        self.assertEqual(len(errs), 1)
+        err = errs[0]
+        self.assertEqual(err.code, tag.ERR_EMPTY_EXTENSION)
+        self.assertEqual(err.message, 'The singleton \'a\' is not followed by a subtag.')
+        self.assertEqual([err.code for err in Tag('de-u').errors], [tag.ERR_EMPTY_EXTENSION])
+        self.assertEqual([err.code for err in Tag('de-x').errors], [tag.ERR_EMPTY_EXTENSION])
+
+    def test_extensions(self):
+        tag = Tag('sr-Latn-RS-u-ca-gregory-nu-latn-t-ja-x-Private-Use')
+        self.assertEqual(tag.extensions, [('u', ('ca', 'gregory', 'nu', 'latn')), ('t', ('ja',))])
+        self.assertEqual(tag.extensions[0].singleton, 'u')
+        self.assertEqual(tag.extensions[1].subtags, ('ja',))
+        self.assertEqual(tag.privateuse, ['private', 'use'])
+        self.assertEqual([subtag.format for subtag in tag.subtags], ['sr', 'Latn', 'RS'])
+        self.assertTrue(tag.valid)
+        tag = Tag('x-whatever')
+        self.assertEqual(tag.extensions, [])
+        self.assertEqual(tag.privateuse, ['whatever'])
+        tag = Tag('nl-BE')
+        self.assertEqual(tag.extensions, [])
+        self.assertEqual(tag.privateuse, [])
+        self.assertEqual(Tag('i-klingon').extensions, [])
 
     def test_errors_supress_script(self):
         tag = Tag('gsw-Latn')
@@ -450,3 +516,42 @@ class TestTag(unittest.TestCase):
         self.assertIsNotNone(tag.preferred)
         self.assertEqual(tag.preferred.format, 'cmn-Hant')
         self.assertIsNone(Tag('cmn-Hant').preferred)
+
+    def test_canonical(self):
+        tag = Tag('iw-Hebr-il').canonical
+        self.assertIsInstance(tag, Tag)
+        self.assertEqual(tag.format, 'he-IL')
+        self.assertEqual(Tag('zh-cmn-Hant').canonical.format, 'cmn-Hant')
+        self.assertEqual(Tag('i-klingon').canonical.format, 'tlh')
+        self.assertTrue(Tag('sgn-BE-FR').canonical.valid)
+
+    def test_parsed_once(self):
+        tag = Tag('sl-Cyrl-IT-rozaj-u-ca-gregory-x-foo')
+        subtags = tag.subtags
+        subtags.append(None)
+        self.assertEqual(len(tag.subtags), 4)
+        self.assertIs(tag.language, tag.subtags[0])
+        self.assertIs(tag.script, tag.subtags[1])
+        self.assertIs(tag.region, tag.subtags[2])
+        errors = tag.errors
+        errors.append(None)
+        self.assertEqual(tag.errors, [])
+        self.assertTrue(tag.valid)
+
+    def test_parsed_structure(self):
+        parsed = Tag('sl-Latn-IT-rozaj-biske-u-ca-gregory-t-de-x-foo-bar')._parsed
+        self.assertEqual(parsed.language.format, 'sl')
+        self.assertEqual(parsed.extlangs, ())
+        self.assertEqual(parsed.script.format, 'Latn')
+        self.assertEqual(parsed.region.format, 'IT')
+        self.assertEqual([variant.format for variant in parsed.variants], ['rozaj', 'biske'])
+        self.assertEqual(parsed.extensions, (('u', ('ca', 'gregory')), ('t', ('de',))))
+        self.assertEqual(parsed.privateuse, ('foo', 'bar'))
+        parsed = Tag('zh-yue-HK')._parsed
+        self.assertEqual([extlang.format for extlang in parsed.extlangs], ['yue'])
+        parsed = Tag('x-whatever')._parsed
+        self.assertEqual(parsed.subtags, ())
+        self.assertEqual(parsed.privateuse, ('whatever',))
+        parsed = Tag('i-klingon')._parsed
+        self.assertEqual(parsed.subtags, ())
+        self.assertIsNone(parsed.language)
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from language_tags import cli
+from language_tags.Tag import Tag
+
+from helpers import run_cli
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return path
+
+    def test_validate_stdin(self):
+        status, output = run_cli('validate', stdin='nl-BE\n\nen-GB-GB\n')
+        self.assertEqual(status, 1)
+        self.assertEqual(output, 'nl-BE\tvalid\t\nen-GB-GB\tinvalid\t%d\n' % Tag.ERR_EXTRA_REGION)
+
+    def test_validate_valid(self):
+        status, output = run_cli('validate', '-', stdin='nl-BE\nen\n')
+        self.assertEqual(status, 0)
+
+    def test_validate_files(self):
+        first = self.write('first.txt', 'nl-BE\n')
+        second = self.write('second.txt', 'en\n')
+        status, output = run_cli('validate', first, second)
+        self.assertEqual(status, 0)
+        self.assertEqual(output, 'nl-BE\tvalid\t\nen\tvalid\t\n')
+
+    def test_report(self):
+        path = self.write('tags.txt', 'nl-BE\nen-GB-GB\nxx\nnl-BE\nen-gb-gb\n')
+        status, output = run_cli('validate', '--report', path)
+        self.assertEqual(status, 1)
+        self.assertEqual(output, 'total\t5\nvalid\t2\ninvalid\t3\n'
+                                 'ERR_NO_LANGUAGE (2)\t1\nERR_UNKNOWN (3)\t1\nERR_EXTRA_REGION (5)\t2\n')
+
+    def test_csv(self):
+        path = self.write('records.csv', 'id,lang\n1,nl-BE\n2,"xx"\n3\n')
+        self.assertEqual(run_cli('validate', '--format', 'csv', '--column', 'lang', path)[1],
+                         'nl-BE\tvalid\t\nxx\tinvalid\t3,2\n')
+        self.assertEqual(run_cli('validate', '--format', 'csv', '--column', '1', path)[1],
+                         'nl-BE\tvalid\t\nxx\tinvalid\t3,2\n')
+        self.assertEqual(run_cli('validate', '--format', 'csv', path)[1],
+                         '1\tinvalid\t14,2\n2\tinvalid\t14,2\n3\tinvalid\t14,2\n')
+        self.assertEqual(run_cli('validate', '--format', 'csv', '--column', 'whatever', path)[0], 2)
+        self.assertEqual(run_cli('validate', '--format', 'csv', stdin='')[1], '')
+
+    def test_jsonl(self):
+        path = self.write('records.jsonl', '{"lang": "nl-BE"}\n\n{"id": 2}\n{"lang": "en"}\n')
+        self.assertEqual(run_cli('validate', '--format', 'jsonl', '--column', 'lang', path)[1],
+                         'nl-BE\tvalid\t\nen\tvalid\t\n')
+        self.assertEqual(run_cli('validate', '--format', 'jsonl', path)[0], 2)
+
+    def test_jsonl_malformed(self):
+        for content, message in (('{"lang": "nl"}\n"nl"\n', 'Line 2 is not a JSON object.'),
+                                 ('[1]\n', 'Line 1 is not a JSON object.'),
+                                 ('{"lang": "nl"}\n\n{"lang": \n', 'Line 3 is not valid JSON.')):
+            path = self.write('records.jsonl', content)
+            self.assertEqual(run_cli('validate', '--format', 'jsonl', '--column', 'lang', path)[0], 2)
+            with self.assertRaises(ValueError) as context:
+                list(cli.read_jsonl(io.StringIO(content), 'lang'))
+            self.assertEqual(str(context.exception), message)
+
+    def test_jobs(self):
+        path = self.write('tags.txt', 'nl-BE\nen-GB-GB\nxx\nnl-BE\n' * 10)
+        self.assertEqual(run_cli('validate', '--jobs', '2', '--chunksize', '3', path),
+                         run_cli('validate', path))
+        self.assertEqual(run_cli('validate', '--jobs', '2', '--report', path),
+                         run_cli('validate', '--report', path))
+
+    def test_missing_file(self):
+        self.assertEqual(run_cli('validate', os.path.join(self.directory, 'whatever.txt'))[0], 2)
+
+    def test_streaming(self):
+        values = iter(['nl-BE', 'xx'])
+        results = cli.validate(values)
+        self.assertEqual(next(results), ('nl-BE', ()))
+        self.assertEqual(next(values), 'xx')
+
+    def test_module(self):
+        output = subprocess.run([sys.executable, '-m', 'language_tags', 'validate'], input='nl-BE\n',
+                                stdout=subprocess.PIPE, universal_newlines=True)
+        self.assertEqual(output.returncode, 0)
+        self.assertEqual(output.stdout, 'nl-BE\tvalid\t\n')
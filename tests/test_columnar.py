@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from language_tags import data
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+class TestColumnar(unittest.TestCase):
+
+    def setUp(self):
+        from language_tags import columnar
+        self.columnar = columnar
+        self.columns = columnar.registry_columns()
+        self.registry = data.get('registry')
+
+    def test_columns(self):
+        columns = self.columns
+        self.assertEqual(len(columns), len(self.registry))
+        row = data.get('index')['nl']['language']
+        self.assertEqual(columns['code'][row], 'nl')
+        self.assertEqual(columns.categories['type'][columns['type'][row]], 'language')
+        self.assertEqual(columns['scope'][row], -1)
+        self.assertEqual(columns['added'][row], numpy.datetime64('2005-10-16'))
+        self.assertTrue(numpy.isnat(columns['deprecated'][row]))
+        self.assertEqual(columns['description'][row], 'Dutch, Flemish')
+        self.assertEqual(columns['type'].dtype, numpy.int16)
+
+    def test_shared(self):
+        self.assertIs(self.columnar.registry_columns(), self.columns)
+
+    def test_lookup(self):
+        index = data.get('index')
+        rows = self.columnar.lookup(['nl', 'BE', ' Latn ', 'xx', 'art-lojban', ''])
+        self.assertEqual(rows.tolist(), [index['nl']['language'], index['be']['language'], index['latn']['script'],
+                                         -1, index['art-lojban']['grandfathered'], -1])
+        self.assertEqual(self.columns.lookup(numpy.array([b'be', b'en']), 'region').tolist(),
+                         [index['be']['region'], -1])
+        self.assertEqual(self.columns.lookup([]).tolist(), [])
+        self.assertRaises(ValueError, self.columns.lookup, ['nl'], 'country')
+
+    @unittest.skipIf(pandas is None, 'pandas is not installed')
+    def test_to_pandas(self):
+        frame = self.columns.to_pandas()
+        self.assertEqual(len(frame), len(self.registry))
+        self.assertEqual(frame['type'].value_counts()['region'],
+                         sum(1 for record in self.registry if record['Type'] == 'region'))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_to_arrow(self):
+        table = self.columns.to_arrow()
+        self.assertEqual(table.num_rows, len(self.registry))
+        self.assertEqual(table.column('code')[0].as_py(), self.registry[0]['Subtag'])
+
+
+@unittest.skipIf(numpy is not None, 'NumPy is installed')
+class TestWithoutNumpy(unittest.TestCase):
+
+    def test_import_error(self):
+        from language_tags import columnar
+        self.assertRaises(ImportError, columnar.registry_columns)
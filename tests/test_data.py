@@ -0,0 +1,439 @@
+# -*- coding: utf-8 -*-
+import gc
+import json
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import unittest
+import weakref
+from unittest import mock
+
+from language_tags import Registry, data, tags
+from language_tags.Subtag import Subtag
+from language_tags.Tag import Tag
+from language_tags.data.compile import compile_likely, compile_mapped, compile_registry, fingerprint, load_compiled
+from language_tags.data.ingest import ingest, read_records
+from language_tags.data.mapped import open_mapped
+
+from helpers import new_version
+
+
+class TestData(unittest.TestCase):
+
+    def run_python(self, code):
+        return subprocess.check_output([sys.executable, '-c', code], universal_newlines=True).strip()
+
+    def test_import_is_lazy(self):
+        output = self.run_python(
+            'import language_tags.tags, language_tags.Tag, language_tags.Subtag\n'
+            'from language_tags import data\n'
+            'print(sorted(data.cache))'
+        )
+        self.assertEqual(output, '[]')
+
+    def test_import_defers_features(self):
+        output = self.run_python(
+            'import sys, language_tags\n'
+            'print(sorted(name for name in sys.modules if name.startswith("language_tags") or name == "json"))'
+        )
+        self.assertEqual(output, "['language_tags', 'language_tags.Subtag', 'language_tags.Tag', 'language_tags.data', "
+                                 "'language_tags.data.registry', 'language_tags.tags']")
+
+    def test_first_lookup_loads(self):
+        output = self.run_python(
+            'from language_tags import tags, data\n'
+            'tags.check("nl-BE")\n'
+            'print(sorted(data.cache))'
+        )
+        self.assertEqual(output, "['index', 'registry']")
+
+    def test_preload(self):
+        output = self.run_python(
+            'from language_tags import data\n'
+            'data.preload()\n'
+            'print(sorted(data.cache))'
+        )
+        self.assertEqual(output, "['index', 'registry']")
+
+    def test_module_attributes(self):
+        self.assertIs(sys.modules['language_tags.tags'].index, data.get('index'))
+        self.assertIs(sys.modules['language_tags.Tag'].registry, data.get('registry'))
+        with self.assertRaises(AttributeError):
+            sys.modules['language_tags.Subtag'].whatever
+
+
+class TestCompile(unittest.TestCase):
+
+    def setUp(self):
+        self.json_dir = tempfile.mkdtemp()
+        for name in ('index', 'registry', 'meta'):
+            shutil.copy(os.path.join(data.parent_dir, data.data_dir, '%s.json' % name), self.json_dir)
+        self.target = os.path.join(self.json_dir, 'registry.pickle')
+        self.mapped_target = os.path.join(self.json_dir, 'registry.mmap')
+
+    def tearDown(self):
+        shutil.rmtree(self.json_dir)
+
+    def test_shipped_artifact_is_up_to_date(self):
+        compiled = load_compiled(os.path.join(data.parent_dir, data.data_dir),
+                                 os.path.join(data.parent_dir, data.compiled_file))
+        self.assertIsNotNone(compiled)
+
+    def test_load_compiled_sources(self):
+        compile_registry(self.json_dir, self.target)
+        self.assertEqual(list(load_compiled(self.json_dir, self.target, ['index'])), ['index'])
+        self.assertEqual(list(load_compiled(self.json_dir, self.target, ['registry'])), ['registry'])
+
+    def test_compile(self):
+        compile_registry(self.json_dir, self.target)
+        compiled = load_compiled(self.json_dir, self.target)
+        for name in ('index', 'registry'):
+            with open(os.path.join(self.json_dir, '%s.json' % name), encoding='utf-8') as f:
+                self.assertEqual(compiled[name], json.load(f))
+
+    def test_missing(self):
+        self.assertIsNone(load_compiled(self.json_dir, self.target))
+
+    def test_compile_likely(self):
+        cldr_file = os.path.join(self.json_dir, 'likelySubtags.json')
+        with open(cldr_file, 'w', encoding='utf-8') as f:
+            json.dump({'supplemental': {'likelySubtags': {'nl': 'nl-Latn-NL', 'und-Hant': 'zh-Hant-TW'}}}, f)
+        compile_likely(self.json_dir, cldr_file)
+        target = os.path.join(self.json_dir, 'likely-subtags.json')
+        with open(target, encoding='utf-8') as f:
+            likely = json.load(f)
+        self.assertEqual(likely['nl'], 'nl-latn-nl')
+        self.assertEqual(likely['und-hant'], 'zh-hant-tw')
+        # Languages that are not in the CLDR table get their suppress-script.
+        self.assertEqual(likely['ru'], 'ru-cyrl')
+        # Without a CLDR file the existing entries are kept.
+        compile_likely(self.json_dir)
+        with open(target, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), likely)
+
+    def test_stale_file_date(self):
+        compile_registry(self.json_dir, self.target)
+        with open(os.path.join(self.json_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'File-Date': '2100-01-01'}, f)
+        self.assertIsNone(load_compiled(self.json_dir, self.target))
+
+    def test_stale_source(self):
+        compile_registry(self.json_dir, self.target)
+        with open(os.path.join(self.json_dir, 'index.json'), 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertIsNone(load_compiled(self.json_dir, self.target))
+
+    def test_stale_source_same_size(self):
+        compile_registry(self.json_dir, self.target)
+        compile_mapped(self.json_dir, self.mapped_target)
+        path = os.path.join(self.json_dir, 'registry.json')
+        with open(path, encoding='utf-8') as f:
+            source = f.read()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source.replace('"Afar"', '"Afaq"', 1))
+        self.assertEqual(os.path.getsize(path), len(source.encode('utf-8')))
+        self.assertIsNone(load_compiled(self.json_dir, self.target))
+        self.assertIsNone(open_mapped(self.mapped_target, fingerprint(self.json_dir)))
+
+    def test_corrupt(self):
+        with open(self.target, 'wb') as f:
+            f.write(b'garbage')
+        self.assertIsNone(load_compiled(self.json_dir, self.target))
+
+
+def record_jar(meta, registry):
+    # The registry in the format of the IANA file: escaped characters outside ASCII and folded long lines.
+    lines = ['File-Date: %s' % meta['File-Date']]
+    for record in registry:
+        lines.append('%%')
+        for name, value in record.items():
+            for item in value if isinstance(value, list) else [value]:
+                item = ''.join(c if ord(c) < 128 else '&#x%04X;' % ord(c) for c in item)
+                lines.extend(textwrap.wrap('%s: %s' % (name, item), 72, subsequent_indent='  ',
+                                           break_long_words=False, break_on_hyphens=False))
+    return '\n'.join(lines) + '\n'
+
+
+class TestIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.bundled_dir = os.path.join(data.parent_dir, data.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_read_records(self):
+        text = ('File-Date: 2022-06-28\r\n%%\r\nType: variant\r\nSubtag: 1694acad\r\nDescription: Early Modern\r\n'
+                '  French\r\nComments: Dictionnaire de l\'acad&#xE9;mie\r\n\tfran&#xE7;oise\r\nPrefix: fr\r\n%%\r\n'
+                'Type: language\r\nSubtag: nl\r\nDescription: Dutch\r\nDescription: Flemish\r\n')
+        self.assertEqual(list(read_records(text.splitlines(True))), [
+            {'File-Date': '2022-06-28'},
+            {'Type': 'variant', 'Subtag': '1694acad', 'Description': ['Early Modern French'],
+             'Comments': ['Dictionnaire de l\'acad\xe9mie fran\xe7oise'], 'Prefix': ['fr']},
+            {'Type': 'language', 'Subtag': 'nl', 'Description': ['Dutch', 'Flemish']}])
+        self.assertRaises(ValueError, list, read_records(['  continued']))
+        self.assertRaises(ValueError, list, read_records(['Type language']))
+
+    def test_ingest(self):
+        with open(os.path.join(self.bundled_dir, 'registry.json'), encoding='utf-8') as f:
+            registry = json.load(f)
+        with open(os.path.join(self.bundled_dir, 'meta.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        source = os.path.join(self.directory, 'language-subtag-registry')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write(record_jar(meta, registry))
+        json_dir = os.path.join(self.directory, 'json')
+        # Without a CLDR file the existing likely subtags table is kept.
+        os.mkdir(json_dir)
+        shutil.copy(os.path.join(self.bundled_dir, 'likely-subtags.json'), json_dir)
+        ingest(source, json_dir)
+
+        # The files are byte-identical to the files of the npm package.
+        self.assertEqual(sorted(os.listdir(json_dir)), sorted(os.listdir(self.bundled_dir)))
+        for name in os.listdir(self.bundled_dir):
+            with open(os.path.join(json_dir, name), 'rb') as f, \
+                    open(os.path.join(self.bundled_dir, name), 'rb') as bundled:
+                self.assertEqual(f.read(), bundled.read(), name)
+        compiled = load_compiled(json_dir, os.path.join(self.directory, data.compiled_file))
+        self.assertEqual(compiled['registry'], registry)
+        mapped = open_mapped(os.path.join(self.directory, data.mapped_file), fingerprint(json_dir))
+        self.assertEqual(len(mapped), len(registry))
+
+    def test_no_file_date(self):
+        source = os.path.join(self.directory, 'language-subtag-registry')
+        with open(source, 'w', encoding='utf-8') as f:
+            f.write('Type: language\nSubtag: nl\n')
+        self.assertRaises(ValueError, ingest, source, os.path.join(self.directory, 'json'))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'json')))
+
+
+class TestMapped(unittest.TestCase):
+
+    def setUp(self):
+        self.json_dir = tempfile.mkdtemp()
+        for name in ('index', 'registry', 'meta'):
+            shutil.copy(os.path.join(data.parent_dir, data.data_dir, '%s.json' % name), self.json_dir)
+        self.target = os.path.join(self.json_dir, 'registry.mmap')
+        with open(os.path.join(self.json_dir, 'registry.json'), encoding='utf-8') as f:
+            self.registry = json.load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.json_dir)
+
+    def test_shipped_file_is_up_to_date(self):
+        json_dir = os.path.join(data.parent_dir, data.data_dir)
+        self.assertIsNotNone(open_mapped(os.path.join(data.parent_dir, data.mapped_file), fingerprint(json_dir)))
+
+    def test_records(self):
+        compile_mapped(self.json_dir, self.target)
+        registry = open_mapped(self.target, fingerprint(self.json_dir))
+        self.assertEqual(len(registry), len(self.registry))
+        for record, expected in zip(registry, self.registry):
+            self.assertEqual(dict(record), expected)
+            self.assertEqual(list(record), list(expected))
+        self.assertEqual(registry[-1], self.registry[-1])
+        with self.assertRaises(IndexError):
+            registry[len(self.registry)]
+
+    def test_record_fields(self):
+        compile_mapped(self.json_dir, self.target)
+        registry = open_mapped(self.target, fingerprint(self.json_dir))
+        record = registry[data.get('index')['aae']['language']]
+        self.assertEqual(record['Subtag'], 'aae')
+        self.assertEqual(record['Description'], ['Arbëreshë Albanian'])
+        self.assertIn('Macrolanguage', record)
+        self.assertNotIn('Deprecated', record)
+        self.assertNotIn('Whatever', record)
+        self.assertIsNone(record.get('Deprecated'))
+        with self.assertRaises(KeyError):
+            record['Whatever']
+
+    def test_stale(self):
+        compile_mapped(self.json_dir, self.target)
+        with open(os.path.join(self.json_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump({'File-Date': '2100-01-01'}, f)
+        self.assertIsNone(open_mapped(self.target, fingerprint(self.json_dir)))
+
+    def test_missing(self):
+        self.assertIsNone(open_mapped(self.target, fingerprint(self.json_dir)))
+
+    def test_backend(self):
+        output = subprocess.check_output([sys.executable, '-c', (
+            'from language_tags import tags, data\n'
+            'data.set_backend("mapped")\n'
+            'print(tags.check("nl-BE"), tags.language("nl").description, type(data.get("registry")).__name__)'
+        )], universal_newlines=True).strip()
+        self.assertEqual(output, "True ['Dutch', 'Flemish'] MappedRegistry")
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, data.set_backend, 'whatever')
+
+
+# Calls made by unpickling a planted artifact.
+_unpickled = []
+
+
+def _unpickle():
+    _unpickled.append(True)
+
+
+class _Planted:
+    def __reduce__(self):
+        return _unpickle, ()
+
+
+def deprecate_nl():
+    # A new version of the registry in which 'nl' is deprecated.
+    return new_version(tempfile.mkdtemp(), {('nl', 'language'): {'Deprecated': '2100-01-01'}})
+
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.json_dir = deprecate_nl()
+        self.bundled = Registry(os.path.join(data.parent_dir, data.data_dir))
+        self.new = Registry(self.json_dir, base=self.bundled)
+
+    def tearDown(self):
+        tags.disable_cache()
+        shutil.rmtree(os.path.dirname(self.json_dir))
+
+    def test_side_by_side(self):
+        batch = ['nl-BE', 'en-GB', 'nl-BE', 'xx']
+        self.assertEqual(tags.check_many(batch, self.bundled), [True, True, True, False])
+        self.assertEqual(tags.check_many(batch, self.new), [False, True, False, False])
+        self.assertEqual(tags.validate_batch(['nl'], self.new), [(Tag.ERR_SUBTAG_DEPRECATED,)])
+        self.assertEqual(tags.date(self.new), '2100-01-01')
+        self.assertEqual(tags.date(self.bundled), tags.date())
+        self.assertIn(Subtag('nl', 'language', self.new), tags.query(deprecated=True, registry=self.new))
+        self.assertNotIn(Subtag('nl', 'language', self.bundled), tags.query(deprecated=True, registry=self.bundled))
+        self.assertEqual(Tag('nl-BE', self.new).language.deprecated, '2100-01-01')
+        self.assertIsNone(Tag('nl-BE', self.bundled).language.deprecated)
+        self.assertIs(tags.language('nl', self.new), Subtag('nl', 'language', self.new))
+        self.assertIsNot(tags.language('nl', self.new), tags.language('nl', self.bundled))
+
+    def test_cache(self):
+        tags.enable_cache()
+        self.assertTrue(tags.check('nl-BE', self.bundled))
+        self.assertFalse(tags.check('nl-BE', self.new))
+        self.assertIsNot(tags.tag('nl-BE', self.new), tags.tag('nl-BE', self.bundled))
+        self.assertEqual(tags.cache_info().currsize, 2)
+
+    def test_shared_records(self):
+        records = self.new.get('registry')
+        bundled_records = self.bundled.get('registry')
+        index = self.new.get('index')
+        nl = index['nl']['language']
+        self.assertIs(records[nl + 1], bundled_records[nl + 1])
+        self.assertIsNot(records[nl], bundled_records[nl])
+        self.assertIs(index['nl'], self.bundled.get('index')['nl'])
+
+    def test_shared_once(self):
+        self.bundled.preload()
+        records = self.new.get('registry')
+        self.new.get('index')
+        bundled_records = self.bundled.get('registry')
+        # Records are not compared again once shared.
+        self.bundled.cache['registry'] = [dict(record) for record in bundled_records]
+        self.new._share()
+        self.assertIs(records[0], bundled_records[0])
+        self.bundled.cache['registry'] = bundled_records
+
+    def test_base_not_kept_alive(self):
+        base = Registry(os.path.join(data.parent_dir, data.data_dir))
+        base.preload()
+        new = Registry(self.json_dir, base=base)
+        reference = weakref.ref(base)
+        del base
+        gc.collect()
+        self.assertIsNone(reference())
+        self.assertEqual(len(new.get('registry')), len(self.bundled.get('registry')))
+
+    def test_untrusted_artifacts(self):
+        # A pickle next to other JSON files is only loaded when its directory is given.
+        artifact_dir = os.path.dirname(self.json_dir)
+        with open(os.path.join(artifact_dir, data.compiled_file), 'wb') as f:
+            pickle.dump(_Planted(), f)
+        del _unpickled[:]
+        self.assertEqual(len(Registry(self.json_dir).get('registry')), len(self.bundled.get('registry')))
+        self.assertEqual(_unpickled, [])
+        self.assertEqual(len(Registry(self.json_dir, artifact_dir=artifact_dir).get('registry')),
+                         len(self.bundled.get('registry')))
+        self.assertEqual(_unpickled, [True])
+
+    def test_fingerprint_once(self):
+        registry = Registry(os.path.join(data.parent_dir, data.data_dir), 'mapped')
+        with mock.patch('language_tags.data.compile.fingerprint', wraps=fingerprint) as compute:
+            registry.preload()
+        self.assertEqual(type(registry.get('registry')).__name__, 'MappedRegistry')
+        self.assertEqual(compute.call_count, 1)
+
+
+class TestReload(unittest.TestCase):
+
+    def setUp(self):
+        self.original = data.current()
+        self.json_dir = deprecate_nl()
+
+    def tearDown(self):
+        data._swap(self.original)
+        tags.disable_cache()
+        shutil.rmtree(os.path.dirname(self.json_dir))
+
+    def test_reload(self):
+        tag = Tag('nl-BE')
+        subtag = Subtag('nl', 'language')
+        registry = data.reload(self.json_dir)
+        self.assertIs(data.current(), registry)
+        self.assertEqual(registry.file_date, '2100-01-01')
+        self.assertEqual(sorted(registry.cache), ['index', 'meta', 'registry'])
+        self.assertEqual(data.get('meta')['File-Date'], '2100-01-01')
+        self.assertFalse(tags.check('nl-BE'))
+        self.assertEqual(Subtag('nl', 'language').deprecated, '2100-01-01')
+        self.assertIsNot(Subtag('nl', 'language'), subtag)
+        # Tags and subtags created before the swap keep using their registry.
+        self.assertTrue(tag.valid)
+        self.assertIsNone(subtag.deprecated)
+        self.assertIs(tag.language, subtag)
+        self.assertGreater(registry.version, self.original.version)
+
+    def test_reload_clears_cache(self):
+        tags.enable_cache()
+        self.assertTrue(tags.check('nl-BE'))
+        data.reload(self.json_dir)
+        self.assertEqual(tags.cache_info().currsize, 0)
+        self.assertFalse(tags.check('nl-BE'))
+
+    def test_reload_failure(self):
+        self.assertRaises(OSError, data.reload, os.path.join(self.json_dir, 'whatever'))
+        self.assertIs(data.current(), self.original)
+        self.assertRaises(ValueError, data.reload, self.json_dir, 'whatever')
+
+    def test_concurrent_reload(self):
+        errors = []
+        done = threading.Event()
+
+        def validate():
+            while not done.is_set():
+                try:
+                    # Valid with the bundled registry, deprecated with the new one.
+                    self.assertIn([error.code for error in Tag('nl-BE').errors], ([], [Tag.ERR_SUBTAG_DEPRECATED]))
+                except Exception as e:
+                    errors.append(e)
+                    return
+
+        threads = [threading.Thread(target=validate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for json_dir in (self.json_dir, self.original.json_dir) * 3:
+            data.reload(json_dir)
+        done.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
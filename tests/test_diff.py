@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from language_tags import Registry, data
+from language_tags.Tag import Tag
+from language_tags.diff import Change, Recheck, diff
+
+from helpers import new_version, run_cli
+
+
+class TestDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        # A new version of the registry: a language is added, a variant removed, 'nl' deprecated and 'BE' gets a
+        # preferred value.
+        self.json_dir = new_version(self.directory, {
+            ('nl', 'language'): {'Deprecated': '2100-01-01'},
+            ('be', 'region'): {'Preferred-Value': 'NL', 'Comments': ['Merged']},
+            ('fonipa', 'variant'): None,
+        }, added=[{'Type': 'language', 'Subtag': 'xzq', 'Description': ['Test'], 'Added': '2100-01-01'}])
+        self.old = data.current()
+        self.new = Registry(self.json_dir, base=self.old)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_diff(self):
+        changes = diff(self.old, self.new)
+        self.assertTrue(changes)
+        self.assertEqual([(change.type, change.code, change.old) for change in changes.added],
+                         [('language', 'xzq', None)])
+        self.assertEqual([(change.type, change.code, change.new) for change in changes.removed],
+                         [('variant', 'fonipa', None)])
+        self.assertEqual([(change.type, change.code) for change in changes.deprecated], [('language', 'nl')])
+        self.assertEqual([(change.code, change.new['Preferred-Value']) for change in changes.preferred_value],
+                         [('BE', 'NL')])
+        self.assertEqual([change.code for change in changes.modified], ['nl', 'BE'])
+        self.assertIsInstance(changes.modified[0], Change)
+        self.assertEqual(changes.codes, {'xzq', 'fonipa', 'nl', 'be'})
+        self.assertFalse(diff(self.old, self.old))
+
+    def test_to_dict(self):
+        changes = diff(self.old, self.new).to_dict()
+        self.assertEqual(changes['old'], self.old.file_date)
+        self.assertEqual(changes['new'], '2100-01-01')
+        self.assertEqual(changes['deprecated'][0]['new']['Deprecated'], '2100-01-01')
+        json.dumps(changes)
+
+    def test_recheck(self):
+        changes = diff(self.old, self.new)
+        self.assertTrue(changes.affects('nl-be'))
+        self.assertFalse(changes.affects('en-gb'))
+        values = ['nl', 'en-GB', 'fr-BE', 'de-fonipa', 'en-GB', 'NL', 'xzq']
+        with mock.patch.object(changes, '_recheck', wraps=changes._recheck) as recheck:
+            results = list(changes.recheck(values))
+        # Unaffected tags are not validated, affected tags once.
+        self.assertEqual(sorted(call.args[0] for call in recheck.call_args_list), ['de-fonipa', 'fr-be', 'nl', 'xzq'])
+        self.assertEqual(results, [
+            Recheck('nl', (), (Tag.ERR_SUBTAG_DEPRECATED,), 'nl', 'nl'),
+            Recheck('fr-BE', (), (), 'fr-BE', 'fr-NL'),
+            Recheck('de-fonipa', (), (Tag.ERR_UNKNOWN,), 'de-fonipa', 'de-fonipa'),
+            Recheck('NL', (), (Tag.ERR_SUBTAG_DEPRECATED,), 'nl', 'nl'),
+            Recheck('xzq', (Tag.ERR_UNKNOWN, Tag.ERR_NO_LANGUAGE), (), 'xzq', 'xzq')])
+
+    def test_cli(self):
+        status, output = run_cli('diff', self.json_dir)
+        self.assertEqual(status, 1)
+        self.assertEqual(output, 'added\tlanguage\txzq\nremoved\tvariant\tfonipa\n'
+                                 'deprecated\tlanguage\tnl\t2100-01-01\npreferred-value\tregion\tBE\t\tNL\n'
+                                 'modified\tlanguage\tnl\tDeprecated\n'
+                                 'modified\tregion\tBE\tComments,Preferred-Value\n')
+        status, output = run_cli('diff', self.json_dir, '--json')
+        self.assertEqual(json.loads(output)['added'][0]['code'], 'xzq')
+        self.assertEqual(run_cli('diff', self.json_dir, '--old', self.json_dir), (0, ''))
+        self.assertEqual(run_cli('diff', os.path.join(self.directory, 'whatever'))[0], 2)
+
+    def test_cli_recheck(self):
+        status, output = run_cli('diff', self.json_dir, '--recheck', stdin='en-GB\nfr-BE\nde-fonipa\n')
+        self.assertEqual(status, 1)
+        self.assertEqual(output, 'fr-BE\t\t\tfr-BE\tfr-NL\nde-fonipa\t\t%d\tde-fonipa\tde-fonipa\n' % Tag.ERR_UNKNOWN)
+        self.assertEqual(run_cli('diff', self.json_dir, '--recheck', stdin='en-GB\n'), (0, ''))
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from language_tags import Registry, data
+from language_tags.Tag import Tag
+from language_tags.incremental import Update, ValidationStore
+
+from helpers import new_version
+
+
+class TestValidationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'tags.db')
+        # A new version of the registry in which 'nl' is deprecated and 'fonipa' removed.
+        json_dir = new_version(self.directory, {('nl', 'language'): {'Deprecated': '2100-01-01'},
+                                                ('fonipa', 'variant'): None})
+        self.new = Registry(json_dir, base=data.current())
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_add(self):
+        with ValidationStore(self.path) as store:
+            self.assertEqual(store.add(['nl-BE', 'en-GB-GB', 'NL-be', 'de-fonipa']), 3)
+            self.assertEqual(store.add(['nl-BE', 'fr']), 1)
+            self.assertEqual(len(store), 4)
+            self.assertIn('NL-BE', store)
+            self.assertNotIn('en', store)
+            self.assertEqual(store.errors('nl-BE'), ())
+            self.assertEqual(store.errors('en-GB-GB'), (Tag.ERR_EXTRA_REGION,))
+            self.assertIsNone(store.errors('en'))
+            self.assertEqual(list(store.results(invalid=True)), [('en-gb-gb', (Tag.ERR_EXTRA_REGION,))])
+            self.assertEqual([tag for tag, _ in store.results()], ['nl-be', 'en-gb-gb', 'de-fonipa', 'fr'])
+            self.assertEqual(store.file_date, data.current().file_date)
+
+    def test_reverse_index(self):
+        with ValidationStore(self.path) as store:
+            store.add(['nl-BE', 'nl', 'en-GB'])
+        connection = sqlite3.connect(self.path)
+        rows = connection.execute('SELECT codes.code, tags.tag FROM postings JOIN codes ON codes.id = postings.code '
+                                  'JOIN tags ON tags.id = postings.tag ORDER BY codes.code, tags.tag').fetchall()
+        connection.close()
+        self.assertEqual(rows, [('be', 'nl-be'), ('en', 'en-gb'), ('gb', 'en-gb'), ('nl', 'nl'), ('nl', 'nl-be')])
+
+    def test_update(self):
+        with ValidationStore(self.path) as store:
+            store.add(['nl-BE', 'en-GB', 'de-fonipa', 'fr', 'xx'])
+            with mock.patch.object(store, '_validate', wraps=store._validate) as validate:
+                updates = store.update(self.new)
+            # Only the tags containing a changed subtag are validated again.
+            self.assertEqual(sorted(call.args[0] for call in validate.call_args_list), ['de-fonipa', 'nl-be'])
+            self.assertEqual(updates, [Update('nl-be', (), (Tag.ERR_SUBTAG_DEPRECATED,)),
+                                       Update('de-fonipa', (), (Tag.ERR_UNKNOWN,))])
+            self.assertEqual(store.errors('nl-BE'), (Tag.ERR_SUBTAG_DEPRECATED,))
+            self.assertEqual(store.errors('en-GB'), ())
+            self.assertIs(store.registry, self.new)
+            self.assertEqual(store.update(self.new), [])
+
+        # The store is persisted for the new registry.
+        self.assertRaises(ValueError, ValidationStore, self.path)
+        with ValidationStore(self.path, self.new) as store:
+            self.assertEqual(store.file_date, '2100-01-01')
+            self.assertEqual(store.errors('de-fonipa'), (Tag.ERR_UNKNOWN,))
+            store.add(['nl'])
+            self.assertEqual(store.errors('nl'), (Tag.ERR_SUBTAG_DEPRECATED,))
+
+    def test_update_failure(self):
+        with ValidationStore(self.path) as store:
+            store.add(['nl-BE', 'de-fonipa'])
+            with mock.patch.object(store, '_validate', side_effect=[(), RuntimeError()]):
+                self.assertRaises(RuntimeError, store.update, self.new)
+            self.assertEqual(store.errors('nl-BE'), ())
+            self.assertIs(store.registry, data.current())
+        with ValidationStore(self.path) as store:
+            self.assertEqual(store.errors('nl-BE'), ())
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from language_tags.Tag import Tag
+from language_tags.likely import LikelySubtags, likely_subtags
+
+# A part of the CLDR likely subtags.
+TABLE = {
+    'und': 'en-latn-us',
+    'en': 'en-latn-us',
+    'sr': 'sr-cyrl-rs',
+    'sr-me': 'sr-latn-me',
+    'zh': 'zh-hans-cn',
+    'zh-hant': 'zh-hant-tw',
+    'zh-hk': 'zh-hant-hk',
+    'zh-tw': 'zh-hant-tw',
+    'und-hant': 'zh-hant-tw',
+    'und-tw': 'zh-hant-tw',
+}
+
+
+class TestLikelySubtags(unittest.TestCase):
+
+    def setUp(self):
+        self.likely = LikelySubtags(TABLE)
+
+    def test_maximize(self):
+        maximize = self.likely.maximize
+        self.assertEqual(maximize('zh-hant'), 'zh-Hant-TW')
+        self.assertEqual(maximize('zh'), 'zh-Hans-CN')
+        self.assertEqual(maximize('zh-hk'), 'zh-Hant-HK')
+        self.assertEqual(maximize('und-tw'), 'zh-Hant-TW')
+        self.assertEqual(maximize('und-hant'), 'zh-Hant-TW')
+        self.assertEqual(maximize('und'), 'en-Latn-US')
+        self.assertEqual(maximize('en-gb'), 'en-Latn-GB')
+        self.assertEqual(maximize('sr-me'), 'sr-Latn-ME')
+        self.assertEqual(maximize('en-u-ca-gregory-x-foo'), 'en-Latn-US-u-ca-gregory-x-foo')
+
+    def test_maximize_unknown(self):
+        self.assertEqual(self.likely.maximize('xx-yy'), 'xx-YY')
+        self.assertEqual(self.likely.maximize('x-foo'), 'x-foo')
+        self.assertEqual(self.likely.maximize('i-klingon'), 'i-klingon')
+        self.assertEqual(self.likely.maximize(''), '')
+
+    def test_minimize(self):
+        minimize = self.likely.minimize
+        self.assertEqual(minimize('zh-hant-tw'), 'zh-TW')
+        self.assertEqual(minimize('zh-hans-cn'), 'zh')
+        self.assertEqual(minimize('zh-hant'), 'zh-TW')
+        self.assertEqual(minimize('en-latn-us'), 'en')
+        self.assertEqual(minimize('sr-latn-me'), 'sr-ME')
+        self.assertEqual(minimize('sr-latn-rs'), 'sr-Latn')
+        self.assertEqual(minimize('en-latn-us-1994-x-foo'), 'en-1994-x-foo')
+        self.assertEqual(minimize('xx-yy'), 'xx-YY')
+
+    def test_malformed(self):
+        # Malformed codes are kept, a bare 'x' is not removed.
+        self.assertEqual(self.likely.maximize('en-'), 'en-Latn-US-')
+        self.assertEqual(self.likely.maximize('en--us'), 'en-Latn-US--US')
+        self.assertEqual(self.likely.maximize('en-x'), 'en-Latn-US-x')
+        self.assertEqual(self.likely.minimize('en-latn-us-'), 'en-')
+        self.assertEqual(self.likely.minimize('en-x'), 'en-x')
+        self.assertEqual(Tag('en-US-').maximize().format, likely_subtags().maximize('en-us-'))
+        self.assertEqual(Tag('en--us').minimize().format, likely_subtags().minimize('en--us'))
+
+    def test_cached(self):
+        self.likely.maximize('zh-hant')
+        self.likely.maximize('zh-hant')
+        self.assertEqual(self.likely._maximized.info().hits, 1)
+
+
+class TestTag(unittest.TestCase):
+
+    def test_bundled(self):
+        self.assertIs(likely_subtags(), likely_subtags())
+        self.assertEqual(Tag('nl').maximize().format, likely_subtags().maximize('nl'))
+        self.assertTrue(Tag('nl').maximize().format.startswith('nl-Latn'))
+        self.assertEqual(Tag('nl-Latn').minimize().format, 'nl')
+        self.assertIsInstance(Tag('ru').maximize(), Tag)
+
+    def test_bundled_cldr(self):
+        self.assertEqual(Tag('zh-Hant').maximize().format, 'zh-Hant-TW')
+        self.assertEqual(Tag('en').maximize().format, 'en-Latn-US')
+        self.assertEqual(Tag('und-TW').maximize().format, 'zh-Hant-TW')
+        self.assertEqual(Tag('zh-Hant-TW').minimize().format, 'zh-TW')
+        self.assertEqual(Tag('en-Latn-US').minimize().format, 'en')
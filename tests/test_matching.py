@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from language_tags.matching import Locales, parse_accept_language
+
+
+class TestAcceptLanguage(unittest.TestCase):
+
+    def test_parse(self):
+        self.assertEqual(parse_accept_language('nl-BE, nl;q=0.9, en;q=0.5, *;q=0.1'),
+                         (('nl-be', 1.0), ('nl', 0.9), ('en', 0.5), ('*', 0.1)))
+
+    def test_parse_order(self):
+        self.assertEqual(parse_accept_language('en;q=0.5,fr,de;q=0.5 ,nl'),
+                         (('fr', 1.0), ('nl', 1.0), ('en', 0.5), ('de', 0.5)))
+
+    def test_parse_malformed(self):
+        self.assertEqual(parse_accept_language('en;q=x, fr;q=2, de_DE, , nl;Q=0 , es;level=1'),
+                         (('es', 1.0), ('nl', 0.0)))
+        self.assertEqual(parse_accept_language(''), ())
+
+    def test_parse_cached(self):
+        self.assertIs(parse_accept_language('nl, en;q=0.5'), parse_accept_language('nl, en;q=0.5'))
+
+
+class TestLocales(unittest.TestCase):
+
+    def setUp(self):
+        self.locales = Locales(['en', 'en-GB', 'nl-BE', 'fr', 'de-Latn-DE', 'de-DE-x-goethe', 'zh-Hant', 'EN'])
+
+    def test_filter(self):
+        locales = self.locales
+        self.assertEqual(locales.filter('nl, en;q=0.5'), ['nl-BE', 'en', 'en-GB'])
+        self.assertEqual(locales.filter(['en-gb', 'en']), ['en-GB', 'en'])
+        self.assertEqual(locales.filter('de-DE'), ['de-DE-x-goethe'])
+        self.assertEqual(locales.filter('*'), locales.tags)
+        self.assertEqual(locales.filter('*, en;q=0'), ['nl-BE', 'fr', 'de-Latn-DE', 'de-DE-x-goethe', 'zh-Hant'])
+        self.assertEqual(locales.filter('es'), [])
+
+    def test_extended_filter(self):
+        locales = self.locales
+        self.assertEqual(locales.extended_filter('de-DE'), ['de-Latn-DE', 'de-DE-x-goethe'])
+        self.assertEqual(locales.extended_filter('de-*-DE'), ['de-Latn-DE', 'de-DE-x-goethe'])
+        self.assertEqual(locales.extended_filter('*-DE'), ['de-Latn-DE', 'de-DE-x-goethe'])
+        self.assertEqual(locales.extended_filter('de-goethe'), [])
+        self.assertEqual(locales.extended_filter('de-x-goethe'), ['de-DE-x-goethe'])
+        self.assertEqual(locales.extended_filter('zh-TW, fr;q=0.5'), ['fr'])
+
+    def test_lookup(self):
+        locales = self.locales
+        self.assertEqual(locales.lookup('zh-Hant-CN-x-private1-private2'), 'zh-Hant')
+        self.assertEqual(locales.lookup('nl-NL, nl;q=0.9, en-US;q=0.5'), 'en')
+        self.assertEqual(locales.lookup('nl-BE-x-a'), 'nl-BE')
+        self.assertEqual(locales.lookup(['en-gb-oed']), 'en-GB')
+        self.assertEqual(locales.lookup('*, es', default='fr'), 'fr')
+        self.assertEqual(locales.lookup('en;q=0, de-Latn-DE-1901;q=0.1'), 'de-Latn-DE')
+        self.assertIsNone(locales.lookup(''))
+
+    def test_duplicates(self):
+        self.assertEqual(self.locales.tags.count('EN'), 0)
+        self.assertEqual(self.locales.lookup('EN'), 'en')
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from language_tags import tags
+from language_tags.parallel import validate_parallel
+
+
+class TestParallel(unittest.TestCase):
+
+    values = ['nl-BE', 'xx', 'en-GB-GB', 'NL-be', 'i-klingon', 'zh-Hant-TW', 'en-x-private'] * 20
+
+    def test_ordered(self):
+        results = list(validate_parallel(self.values, processes=2, chunksize=3))
+        self.assertEqual([tag for tag, _ in results], self.values)
+        self.assertEqual([errors for _, errors in results], tags.validate_batch(self.values))
+
+    def test_unordered(self):
+        results = list(validate_parallel(iter(self.values), processes=2, chunksize=4, ordered=False))
+        self.assertEqual(sorted(results), sorted(zip(self.values, tags.validate_batch(self.values))))
+
+    def test_empty(self):
+        self.assertEqual(list(validate_parallel([], processes=2)), [])
@@ -1,8 +1,15 @@
 # -*- coding: utf-8 -*-
+import datetime
 import unittest
 import re
+import threading
 
-from language_tags import tags
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from language_tags import data, tags
 
 
 class TestSubtag(unittest.TestCase):
@@ -57,6 +64,66 @@ class TestSubtag(unittest.TestCase):
         subtags = tags.search('Lojban', all=True)
         self.assertEqual(len(subtags), 2)
 
+    def test_search_grandfathered(self):
+        results = tags.search('Lojban', all=True)
+        self.assertEqual([result.format for result in results], ['jbo', 'art-lojban'])
+        self.assertEqual(results[1].type, 'grandfathered')
+
+    def test_search_limit(self):
+        for query in ['Maltese', 'an', 'port', 'Port', 'a', 'zzz', re.compile(r'\d{4}')]:
+            self.assertEqual(tags.search(query, limit=5), tags.search(query)[:5])
+            self.assertEqual(tags.search(query, all=True, limit=3), tags.search(query, all=True)[:3])
+        self.assertEqual(tags.search('an', limit=0), [])
+
+    def test_search_same_as_scan(self):
+        def scan(description, all=False):
+            # The linear scan over the registry that tags.search replaces.
+            if description.lower() == description:
+                test = lambda record: description in ', '.join(record['Description']).lower()
+            else:
+                test = lambda record: description in ', '.join(record['Description'])
+            records = [record for record in data.get('registry') if ('Subtag' in record or all) and test(record)]
+            records.sort(key=lambda record: min(abs(len(item) - len(description)) for item in record['Description']))
+            return [(record.get('Subtag') or record.get('Tag'), record['Type']) for record in records]
+
+        for query in ['Maltese', 'maltese', 'MALTESE', 'an', 'Port', 'port', 'sign language', 'Sign', 'é', 'ë',
+                      'Arbëreshë', 'Nuclear Micronesian', ', ', '', 'x']:
+            for all in (False, True):
+                results = [(result.format.lower(), result.type) for result in tags.search(query, all=all)]
+                expected = [(subtag.lower(), type) for subtag, type in scan(query, all)]
+                self.assertEqual(results, expected, query)
+
+    def test_autocomplete(self):
+        results = tags.autocomplete('zh-Ha')
+        self.assertEqual([result.format for result in results[:3]], ['zh-Hans', 'zh-Hant', 'zh-hakka'])
+        self.assertEqual(len(results), 10)
+        self.assertEqual(len(tags.autocomplete('zh-Ha', limit=None)), 13)
+        self.assertEqual([str(result) for result in tags.autocomplete('ZH-ha ')], [str(result) for result in results])
+
+        results = tags.autocomplete('Port', limit=None)
+        self.assertEqual([result.format for result in results[:3]], ['PT', 'ptv', 'pt'])
+        self.assertIn(tags.language('pt'), results)
+        # Substring matches follow the prefix matches.
+        self.assertIn(tags.language('pt'), results[:results.index(tags.language('idb'))])
+
+        self.assertEqual(tags.autocomplete('nl')[0], tags.language('nl'))
+        self.assertEqual(tags.autocomplete('dutch')[0], tags.language('nl'))
+        self.assertEqual(tags.autocomplete('Gibberish'), [])
+        self.assertEqual(tags.autocomplete(''), [])
+        self.assertEqual(tags.autocomplete('nl', limit=0), [])
+
+    def test_autocomplete_options(self):
+        self.assertEqual(tags.autocomplete('dutch', match=['exact']), [tags.language('nl')])
+        self.assertNotIn(tags.language('odt'), tags.autocomplete('dutch', match=['exact', 'prefix'], limit=None))
+        self.assertIn(tags.language('odt'), tags.autocomplete('dutch', match=['substring'], limit=None))
+        self.assertRaises(ValueError, tags.autocomplete, 'dutch', match=['whatever'])
+
+        self.assertIn('zh-hakka', [str(result) for result in tags.autocomplete('zh-ha')])
+        self.assertNotIn('zh-hakka', [str(result) for result in tags.autocomplete('zh-ha', deprecated=False)])
+        self.assertIn(tags.region('BU'), tags.autocomplete('bu', limit=None))
+        self.assertNotIn(tags.region('BU'), tags.autocomplete('bu', limit=None, deprecated=False))
+        self.assertEqual(tags.autocomplete('zh-ha', all=False), [])
+
     def test_search_exact_match(self):
         subtags = tags.search('Dari')
         self.assertGreater(len(subtags), 0)
@@ -98,6 +165,104 @@ class TestSubtag(unittest.TestCase):
             tags.languages('en')
         self.assertIn('\'en\' is not a macrolanguage.', context.exception.args)
 
+    def test_languages_index(self):
+        for macrolanguage in data.get('macrolanguage'):
+            expected = [(record['Subtag'], record['Type']) for record in data.get('registry')
+                        if record.get('Macrolanguage') == macrolanguage]
+            results = [(subtag.data['record']['Subtag'], subtag.type) for subtag in tags.languages(macrolanguage)]
+            self.assertEqual(results, expected)
+        self.assertEqual(tags.languages('ZH'), tags.languages('zh'))
+        self.assertIs(tags.languages('zh')[0], tags.languages('zh')[0])
+
+    def test_query(self):
+        self.assertEqual([subtag.format for subtag in tags.query(type='region', deprecated=True)],
+                         ['AN', 'BU', 'CS', 'DD', 'FX', 'NT', 'SU', 'TP', 'YD', 'YU', 'ZR'])
+        self.assertEqual(tags.query(type='whatever'), [])
+        self.assertIs(tags.query(type='language', scope='macrolanguage')[0], tags.language('ak'))
+        self.assertEqual(tags.query(type='region', added_after=datetime.date(2100, 1, 1)), [])
+        self.assertEqual(len(tags.query()), len(data.get('registry')))
+
+    def test_query_same_as_scan(self):
+        def scan(criteria):
+            # The scan over the registry that the indexes of tags.query replace.
+            results = []
+            for record in data.get('registry'):
+                if all(test(record) for test in criteria):
+                    results.append((record.get('Subtag') or record.get('Tag'), record['Type']))
+            return results
+
+        queries = [
+            (dict(type='region', deprecated=True),
+             [lambda r: r['Type'] == 'region', lambda r: 'Deprecated' in r]),
+            (dict(scope='collection', deprecated=False),
+             [lambda r: r.get('Scope') == 'collection', lambda r: 'Deprecated' not in r]),
+            (dict(added_after='2020-01-01'),
+             [lambda r: r['Added'] > '2020-01-01']),
+            (dict(type='LANGUAGE', added_after='2009-07-29', added_before='2012-08-12'),
+             [lambda r: r['Type'] == 'language', lambda r: '2009-07-29' < r['Added'] < '2012-08-12']),
+            (dict(preferred_value=True, type='extlang'),
+             [lambda r: 'Preferred-Value' in r, lambda r: r['Type'] == 'extlang']),
+            (dict(preferred_value='MM'),
+             [lambda r: r.get('Preferred-Value') == 'MM']),
+            (dict(suppress_script='latn', macrolanguage=False),
+             [lambda r: r.get('Suppress-Script') == 'Latn', lambda r: 'Macrolanguage' not in r]),
+            (dict(suppress_script=False, type='language', scope='special'),
+             [lambda r: 'Suppress-Script' not in r, lambda r: r['Type'] == 'language',
+              lambda r: r.get('Scope') == 'special']),
+            (dict(macrolanguage='zh', type='extlang'),
+             [lambda r: r.get('Macrolanguage') == 'zh', lambda r: r['Type'] == 'extlang']),
+            (dict(type='grandfathered', deprecated=True),
+             [lambda r: r['Type'] == 'grandfathered', lambda r: 'Deprecated' in r]),
+        ]
+        for query, criteria in queries:
+            results = [(result.data['record'].get('Subtag') or result.data['record'].get('Tag'),
+                        result.data['record']['Type']) for result in tags.query(**query)]
+            self.assertEqual(results, scan(criteria), query)
+
+    def test_well_formed(self):
+        for tag in ('en', 'nl-BE', 'zh-yue-HK', 'sl-rozaj-biske-1994', 'de-CH-1901', 'en-US-u-ca-gregory-x-foo',
+                    'x-whatever', 'i-klingon', 'en-GB-oed', 'zh-min-nan', 'xx-YY', ' EN-us ', b'nl'):
+            self.assertTrue(tags.well_formed(tag), tag)
+        for tag in ('', 'e', 'en-', 'en--US', 'en-u', 'en-x', '123', 'toolongtag', 'en-x-morethaneightchars',
+                    'en-GB-GB', 'en-Latn-Latn', 'ab-abcde1234', 'é', 'en_US'):
+            self.assertFalse(tags.well_formed(tag), tag)
+
+    def test_canonicalize(self):
+        self.assertEqual(tags.canonicalize('iw-Hebr-IL'), 'he-IL')
+        self.assertEqual(tags.canonicalize('en-Latn-US'), 'en-US')
+        self.assertEqual(tags.canonicalize('zh-yue-HK'), 'yue-HK')
+        self.assertEqual(tags.canonicalize('zh-cmn-Hans-CN'), 'cmn-Hans-CN')
+        self.assertEqual(tags.canonicalize('de-DD'), 'de-DE')
+        self.assertEqual(tags.canonicalize('ja-Latn-hepburn-heploc'), 'ja-Latn-alalc97')
+        self.assertEqual(tags.canonicalize('art-lojban'), 'jbo')
+        self.assertEqual(tags.canonicalize('en-gb-oed'), 'en-GB-oxendict')
+        self.assertEqual(tags.canonicalize('i-default'), 'i-default')
+        self.assertEqual(tags.canonicalize('zh-min'), 'zh-min')
+        self.assertEqual(tags.canonicalize('en-b-ccc-a-bbb-x-a-ccc'), 'en-a-bbb-b-ccc-x-a-ccc')
+        self.assertEqual(tags.canonicalize(' x-Whatever '), 'x-whatever')
+        self.assertEqual(tags.canonicalize('nl-be'), 'nl-BE')
+        self.assertEqual(tags.canonicalize('xx-YY'), 'xx-YY')
+
+    def test_canonicalize_malformed(self):
+        # Malformed tags are kept malformed, not turned into valid tags.
+        self.assertEqual(tags.canonicalize('en-'), 'en-')
+        self.assertEqual(tags.canonicalize('en--us'), 'en--US')
+        self.assertEqual(tags.canonicalize('en-US-'), 'en-US-')
+        self.assertEqual(tags.canonicalize('en-x'), 'en-x')
+        self.assertEqual(tags.canonicalize('iw-x'), 'he-x')
+        self.assertEqual(tags.tag('en-US-').canonical.format, 'en-US-')
+
+    def test_canonicalize_extlang(self):
+        self.assertEqual(tags.canonicalize('yue-HK', extlang=True), 'zh-yue-HK')
+        self.assertEqual(tags.canonicalize('zh-yue', extlang=True), 'zh-yue')
+        self.assertEqual(tags.canonicalize('sgn-BE-FR', extlang=True), 'sgn-sfb')
+        self.assertEqual(tags.canonicalize('nl', extlang=True), 'nl')
+
+    def test_canonicalize_many(self):
+        self.assertEqual(tags.canonicalize(['iw', 'in', b'iw', 'nl-BE']), ['he', 'id', 'he', 'nl-BE'])
+        self.assertEqual(tags.canonicalize(tag for tag in ['mo']), ['ro'])
+        self.assertEqual(tags.canonicalize([]), [])
+
     def test_date(self):
         self.assertIsNotNone(re.compile(r'\d{4}\-\d{2}\-\d{2}').search(tags.date()))
 
@@ -136,3 +301,95 @@ class TestSubtag(unittest.TestCase):
         tag = tags.tag('i-klingon')
         self.assertIsNone(tag.language)
         self.assertEqual(len(tag.subtags), 0)
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        tags.enable_cache(maxsize=2)
+
+    def tearDown(self):
+        tags.disable_cache()
+
+    def test_cache(self):
+        tag = tags.tag('nl-BE')
+        self.assertIs(tags.tag(' NL-be '), tag)
+        self.assertTrue(tags.check('nl-be'))
+        self.assertIn('Belgium', tags.description('nl-BE'))
+        info = tags.cache_info()
+        self.assertEqual((info.hits, info.misses, info.evictions, info.maxsize, info.currsize), (3, 1, 0, 2, 1))
+
+    def test_eviction(self):
+        nl = tags.tag('nl')
+        tags.tag('en')
+        tags.tag('nl')
+        tags.tag('fr')
+        self.assertEqual(tags.cache_info().evictions, 1)
+        self.assertIs(tags.tag('nl'), nl)
+        tags.tag('en')
+        self.assertEqual(tags.cache_info().currsize, 2)
+        self.assertEqual(tags.cache_info().evictions, 2)
+
+    def test_clear(self):
+        tag = tags.tag('nl')
+        tags.cache_clear()
+        self.assertEqual(tags.cache_info(), (0, 0, 0, 2, 0))
+        self.assertIsNot(tags.tag('nl'), tag)
+
+    def test_disabled(self):
+        tags.disable_cache()
+        self.assertIsNone(tags.cache_info())
+        tags.cache_clear()
+        self.assertIsNot(tags.tag('nl'), tags.tag('nl'))
+        self.assertRaises(ValueError, tags.enable_cache, 0)
+
+    def test_threads(self):
+        tags.enable_cache(maxsize=10)
+        values = ['nl', 'nl-BE', 'en', 'en-GB', 'fr', 'xx'] * 50
+        results = []
+
+        def check():
+            results.append([tags.check(value) for value in values])
+
+        threads = [threading.Thread(target=check) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [[value != 'xx' for value in values]] * 4)
+        info = tags.cache_info()
+        self.assertEqual(info.hits + info.misses, len(values) * 4)
+        self.assertEqual(info.currsize, 6)
+
+
+class TestBatch(unittest.TestCase):
+
+    def test_check_many(self):
+        self.assertEqual(tags.check_many(['nl-BE', 'nl-BE-BE', ' NL-be', 'en']), [True, False, True, True])
+        self.assertEqual(tags.check_many(tag for tag in ['en', 'xx']), [True, False])
+        self.assertEqual(tags.check_many([b'nl-BE', b'whatever']), [True, False])
+        self.assertEqual(tags.check_many([]), [])
+
+    def test_validate_batch(self):
+        tag = tags.tag('nl-BE-BE')
+        results = tags.validate_batch(['nl-BE', 'nl-BE-BE', 'nl-be-be', 'i-klingon'])
+        self.assertEqual(results, [(), (tag.ERR_EXTRA_REGION,), (tag.ERR_EXTRA_REGION,), (tag.ERR_DEPRECATED,)])
+
+    def test_error_codes(self):
+        self.assertEqual(tags.error_codes('nl-BE'), ())
+        self.assertEqual(tags.error_codes('nl-BE-BE'), (tags.tag('nl').ERR_EXTRA_REGION,))
+        self.assertEqual(tags.error_codes('i-klingon', data.current()), (tags.tag('nl').ERR_DEPRECATED,))
+
+    @unittest.skipIf(numpy is None, 'NumPy is not installed')
+    def test_numpy(self):
+        self.assertEqual(tags.check_many(numpy.array(['nl-BE', 'xx', 'nl-BE'])), [True, False, True])
+        self.assertEqual(tags.check_many(numpy.array([b'nl-BE', b'xx'])), [True, False])
+
+    def test_deduplicate(self):
+        tags.enable_cache()
+        try:
+            tags.check_many(['nl-BE', 'NL-BE', 'nl-be', 'en', 'nl-BE'])
+            self.assertEqual(tags.cache_info().misses, 2)
+            self.assertEqual(tags.cache_info().hits, 0)
+        finally:
+            tags.disable_cache()
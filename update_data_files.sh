@@ -1,10 +1,28 @@
 #!/usr/bin/env bash
+#
+# Update the data files from the IANA language subtag registry.
+#
+# Usage: ./update_data_files.sh [language-subtag-registry] [likelySubtags.json]
+#
+# The registry file (record-jar text format) is downloaded from IANA unless the path of a local mirror is given.
+# The CLDR likely subtags are installed with npm from config in package.json unless the path of a local copy is given.
+set -e
 
-# Install language_subtag-registry with npm from config in package.json
-npm install
+registry="$1"
+if [ -z "$registry" ]; then
+    registry=$(mktemp)
+    trap 'rm -f "$registry"' EXIT
+    curl -fsSL -o "$registry" https://www.iana.org/assignments/language-subtag-registry/language-subtag-registry
+fi
 
-# Copy necessary data files into project
-cp -r node_modules/language-subtag-registry/data/json language_tags/data
+likely="$2"
+if [ -z "$likely" ]; then
+    npm install
+    likely=node_modules/cldr-core/supplemental/likelySubtags.json
+fi
+
+# Build the JSON files, the compiled artifacts and the likely subtags table in one pass over the registry file
+python -m language_tags.data.ingest "$registry" "$likely"
 
 # Delete installed node_modules folder
-rm -r node_modules
\ No newline at end of file
+rm -rf node_modules